@@ -1,18 +1,16 @@
 import os
+import sys
 import json
 import textwrap
 import time
 import urllib.parse
+import threading
+from contextlib import closing, contextmanager
+from functools import lru_cache
 
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-
-from neo4j import GraphDatabase
-
-from langchain_openai import ChatOpenAI
-from langchain_core.tools import tool
-from langgraph.prebuilt import create_react_agent
+# Library berat (pandas, requests, bs4, neo4j, langchain, langgraph) sengaja
+# di-import di dalam fungsi yang memakainya, supaya `import Keluarga_v2` tetap
+# cepat dan tiap mode hanya memuat apa yang benar-benar dipakai.
 
 
 # ==================================================
@@ -20,48 +18,824 @@ from langgraph.prebuilt import create_react_agent
 # ==================================================
 
 DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY", "sk-")
-DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+DEEPSEEK_BASE_URL = os.environ.get("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+WIKIPEDIA_BASE_URL = os.environ.get("WIKIPEDIA_BASE_URL", "https://id.wikipedia.org")
 
-if not DEEPSEEK_API_KEY or DEEPSEEK_API_KEY.startswith("sk-YOUR-DEEPSEEK-KEY"):
-    print("⚠️ Peringatan: DEEPSEEK_API_KEY belum diisi dengan benar.")
 
-llm = ChatOpenAI(
-    model="deepseek-chat",
-    api_key=DEEPSEEK_API_KEY,
-    base_url=DEEPSEEK_BASE_URL,
-    temperature=0.0,
-)
+@lru_cache(maxsize=None)
+def get_llm():
+    """
+    LLM DeepSeek dibuat saat pertama kali dibutuhkan, lalu di-cache.
+    """
+    from langchain_openai import ChatOpenAI
+
+    if not DEEPSEEK_API_KEY or DEEPSEEK_API_KEY.startswith("sk-YOUR-DEEPSEEK-KEY"):
+        print("⚠️ Peringatan: DEEPSEEK_API_KEY belum diisi dengan benar.")
+
+    return ChatOpenAI(
+        model="deepseek-chat",
+        api_key=DEEPSEEK_API_KEY,
+        base_url=DEEPSEEK_BASE_URL,
+        temperature=0.0,
+    )
+
+
+def _as_tool(func):
+    """
+    Bungkus fungsi biasa menjadi tool LangChain (nama & docstring dipakai
+    sebagai deskripsi tool). Dipanggil dari factory agent saja.
+    """
+    from langchain_core.tools import tool
+
+    return tool(func)
+
 
 NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "12345678")
 
-# driver global supaya bisa dipakai tool agent ke-2, 4, dan 5
-driver = None
+# Connection pool Neo4j (bisa di-override lewat env atau opsi CLI)
+NEO4J_MAX_POOL_SIZE = int(os.environ.get("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.environ.get("NEO4J_ACQUISITION_TIMEOUT", "60"))
+
+# Backend graf: "neo4j" (default) atau "sqlite" (file lokal, tanpa server; lihat bagian 17)
+GRAPH_BACKEND = os.environ.get("GRAPH_BACKEND", "neo4j")
+SQLITE_GRAPH_PATH = os.environ.get("SQLITE_GRAPH_PATH", "keluarga_graph.sqlite")
 
 CSV_ENRICHED_PATH = "anggota_dpr_enriched.csv"
 CSV_RAW_PATH = "anggota_dpr.csv"
 
+# Satu driver (satu connection pool) dipakai bersama oleh semua tahap & tool
+# agent 2, 4, dan 5. Jangan diakses langsung: pakai get_driver() / managed_driver().
+_driver = None
+_driver_lock = threading.Lock()
+_driver_options = {
+    "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+    "connection_acquisition_timeout": NEO4J_ACQUISITION_TIMEOUT,
+}
+
+
+def open_neo4j_driver(**pool_options):
+    """
+    Buka driver Neo4j (import neo4j ditunda sampai benar-benar dibutuhkan).
+    """
+    from neo4j import GraphDatabase
+
+    return GraphDatabase.driver(
+        NEO4J_URI,
+        auth=(NEO4J_USER, NEO4J_PASSWORD),
+        **pool_options,
+    )
+
+
+def configure_driver(**pool_options):
+    """
+    Atur opsi connection pool (max_connection_pool_size, connection_acquisition_timeout,
+    max_connection_lifetime, ...) untuk driver berikutnya yang dibuka get_driver().
+    """
+    _driver_options.update({k: v for k, v in pool_options.items() if v is not None})
+
+
+def configure_backend(backend: str = None, sqlite_path: str = None):
+    """
+    Pilih backend graf untuk driver berikutnya yang dibuka get_driver().
+    """
+    global GRAPH_BACKEND, SQLITE_GRAPH_PATH
+    if backend:
+        GRAPH_BACKEND = backend
+    if sqlite_path:
+        SQLITE_GRAPH_PATH = sqlite_path
+
+
+def set_driver(neo4j_driver):
+    """
+    Pasang driver yang sudah ada (mis. driver lain atau fake driver untuk
+    benchmark); driver Neo4j mentah dibungkus Neo4jGraph.
+    """
+    global _driver
+    with _driver_lock:
+        _driver = graph_backend(neo4j_driver)
+
+
+def get_driver():
+    """
+    Backend graf bersama (GraphBackend): Neo4jGraph, atau SqliteGraph jika
+    GRAPH_BACKEND="sqlite"; dibuka sekali saat pertama kali dibutuhkan.
+    """
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                if GRAPH_BACKEND == "sqlite":
+                    _driver = open_sqlite_graph(SQLITE_GRAPH_PATH)
+                else:
+                    _driver = Neo4jGraph(open_neo4j_driver(**_driver_options))
+    return _driver
+
+
+def close_driver():
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+
+
+@contextmanager
+def managed_driver(**pool_options):
+    """
+    Context manager siklus hidup driver: satu pool untuk semua tahap di dalam
+    blok `with`, lalu ditutup di akhir.
+    """
+    configure_driver(**pool_options)
+    try:
+        yield get_driver()
+    finally:
+        close_driver()
+
+
+# ==================================================
+# 2. METRIK RUN & PROFILING: LATENSI, TOKEN, RETRY, CACHE, CPU/MEMORI
+# ==================================================
+
+METRICS_PREFIX = "keluarga"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+METRIC_HELP = {
+    "wikipedia_fetch_seconds": "Durasi download halaman Wikipedia",
+    "wikipedia_fetch_retries_total": "Jumlah retry download Wikipedia",
+    "html_parse_seconds": "Durasi parsing HTML Wikipedia (BeautifulSoup)",
+    "agent_invoke_seconds": "Durasi satu pemanggilan agent (semua langkah ReAct)",
+    "agent_prompt_tokens_total": "Token prompt per agent",
+    "agent_completion_tokens_total": "Token completion per agent",
+    "agent_prompt_cache_hit_tokens_total": "Token prompt yang kena cache provider (DeepSeek)",
+    "neo4j_statement_seconds": "Durasi satu statement Cypher",
+    "neo4j_transaction_seconds": "Durasi satu transaksi tulis Neo4j (termasuk retry)",
+    "neo4j_transaction_retries_total": "Jumlah retry transaksi Neo4j",
+    "cache_requests_total": "Lookup cache lokal, per cache dan hasil (hit/miss)",
+    "stage_seconds": "Durasi satu tahap CLI / pipeline",
+    "graph_backend_seconds": "Durasi satu transaksi backend graf non-Neo4j (mis. SQLite)",
+    "kg_sync_persons_total": "Orang per status sinkronisasi KG (added/changed/deleted/unchanged)",
+    "derived_kinship_edges_total": "Relasi kekerabatan turunan per status (added/changed/deleted)",
+    "kinship_path_seconds": "Durasi satu pencarian jalur kekerabatan (BFS dua arah in-memory)",
+    "biography_search_seconds": "Durasi satu pencarian index biografi (BM25, SQLite FTS5)",
+    "work_queue_seconds": "Durasi satu transaksi antrean kerja ekstraksi (SQLite)",
+    "work_queue_tasks_total": "Task antrean ekstraksi per kejadian (leased/reclaimed/done/duplicate/error_*)",
+}
+
+
+class RunMetrics:
+    """
+    Registry metrik sederhana (thread-safe) untuk satu run:
+    histogram latensi + counter, diekspor ke Prometheus textfile dan laporan JSON.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}  # (name, labels) -> [bucket_counts, count, sum, max]
+        self._counters = {}  # (name, labels) -> value
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(self.buckets), 0, 0.0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+            hist[1] += 1
+            hist[2] += value
+            hist[3] = max(hist[3], value)
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def record_cache(self, cache, hit: bool):
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def record_llm_usage(self, agent, messages):
+        """
+        Jumlahkan usage_metadata semua AIMessage hasil satu invoke agent.
+        """
+        prompt = completion = cache_hit = 0
+        for msg in messages:
+            usage = getattr(msg, "usage_metadata", None)
+            if not usage:
+                continue
+            prompt += usage.get("input_tokens", 0) or 0
+            completion += usage.get("output_tokens", 0) or 0
+            details = usage.get("input_token_details") or {}
+            cache_hit += details.get("cache_read", 0) or 0
+        self.inc("agent_prompt_tokens_total", prompt, agent=agent)
+        self.inc("agent_completion_tokens_total", completion, agent=agent)
+        self.inc("agent_prompt_cache_hit_tokens_total", cache_hit, agent=agent)
+
+    def _quantile(self, hist, q):
+        # Estimasi kuantil dari bucket (interpolasi linear, seperti histogram_quantile)
+        bucket_counts, count = hist[0], hist[1]
+        if not count:
+            return 0.0
+        rank = q * count
+        lower, prev = 0.0, 0
+        for bound, cumulative in zip(self.buckets, bucket_counts):
+            if cumulative >= rank:
+                in_bucket = cumulative - prev
+                frac = (rank - prev) / in_bucket if in_bucket else 1.0
+                return min(lower + (bound - lower) * frac, hist[3])
+            lower, prev = bound, cumulative
+        return hist[3]
+
+    def report(self) -> dict:
+        with self._lock:
+            histograms = {k: [list(v[0]), v[1], v[2], v[3]] for k, v in self._histograms.items()}
+            counters = dict(self._counters)
+
+        hist_rows = []
+        for (name, labels), hist in sorted(histograms.items()):
+            count, total = hist[1], hist[2]
+            hist_rows.append({
+                "name": name,
+                "labels": dict(labels),
+                "count": count,
+                "sum_seconds": round(total, 6),
+                "mean_seconds": round(total / count, 6) if count else 0.0,
+                "p50_seconds": round(self._quantile(hist, 0.50), 6),
+                "p95_seconds": round(self._quantile(hist, 0.95), 6),
+                "max_seconds": round(hist[3], 6),
+            })
+
+        counter_rows = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(counters.items())
+        ]
+
+        # Ringkasan token & hit-rate cache per agent / per cache
+        llm = {}
+        caches = {}
+        for (name, labels), value in counters.items():
+            labels = dict(labels)
+            if name.startswith("agent_") and "agent" in labels:
+                field = name[len("agent_"):-len("_total")]
+                llm.setdefault(labels["agent"], {})[field] = value
+            elif name == "cache_requests_total":
+                caches.setdefault(labels["cache"], {"hit": 0, "miss": 0})[labels["result"]] += value
+        for usage in llm.values():
+            prompt = usage.get("prompt_tokens", 0)
+            usage["prompt_cache_hit_ratio"] = (
+                round(usage.get("prompt_cache_hit_tokens", 0) / prompt, 4) if prompt else 0.0
+            )
+        for stats in caches.values():
+            lookups = stats["hit"] + stats["miss"]
+            stats["hit_ratio"] = round(stats["hit"] / lookups, 4) if lookups else 0.0
+
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": round(time.time() - self.started_at, 3),
+            "histograms": hist_rows,
+            "counters": counter_rows,
+            "llm_usage": llm,
+            "caches": caches,
+        }
+
+    def to_prometheus(self) -> str:
+        def fmt_labels(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            escaped = []
+            for k, v in items:
+                v = str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+                escaped.append(f'{k}="{v}"')
+            return "{" + ",".join(escaped) + "}"
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            full = f"{METRICS_PREFIX}_{name}"
+            if full not in declared:
+                declared.add(full)
+                lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for (name, labels), (bucket_counts, count, total, _) in histograms:
+            full = declare(name, "histogram")
+            for bound, cumulative in zip(self.buckets, bucket_counts):
+                lines.append(f"{full}_bucket{fmt_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{full}_bucket{fmt_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{full}_sum{fmt_labels(labels)} {total}")
+            lines.append(f"{full}_count{fmt_labels(labels)} {count}")
+
+        for (name, labels), value in counters:
+            full = declare(name, "counter")
+            lines.append(f"{full}{fmt_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_textfile(self, path: str):
+        # Tulis atomik (tmp + rename) supaya node_exporter tidak membaca file setengah jadi
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def write_report_json(self, path: str, **extra):
+        report = self.report()
+        report.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def print_summary(self):
+        report = self.report()
+        if not report["histograms"] and not report["counters"]:
+            return
+        print("\n===== RINGKASAN METRIK RUN =====")
+        for h in report["histograms"]:
+            labels = ",".join(f"{k}={v}" for k, v in h["labels"].items())
+            print(
+                f"  ⏱️ {h['name']}{{{labels}}}: n={h['count']} total={h['sum_seconds']:.2f}s "
+                f"p50={h['p50_seconds'] * 1000:.1f}ms p95={h['p95_seconds'] * 1000:.1f}ms"
+            )
+        for agent, usage in report["llm_usage"].items():
+            print(
+                f"  🪙 {agent}: prompt={usage.get('prompt_tokens', 0)} "
+                f"completion={usage.get('completion_tokens', 0)} "
+                f"cache_hit={usage['prompt_cache_hit_ratio']:.0%}"
+            )
+        for cache, stats in report["caches"].items():
+            print(f"  🗃️ cache {cache}: hit={stats['hit']} miss={stats['miss']} ({stats['hit_ratio']:.0%})")
+        print("================================\n")
+
+
+METRICS = RunMetrics()
+
+
+class StageProfiler:
+    """
+    Profiling opt-in (cProfile + tracemalloc) per tahap CPU-bound.
+    Nonaktif secara default: stage() hanya no-op sampai enable() dipanggil.
+    cProfile hanya bisa aktif satu per proses, jadi jika tahap lain (thread lain
+    atau tahap bersarang) sedang diprofil, panggilan itu tidak diprofil; jumlahnya
+    dihitung per tahap ("skipped") dan ikut dilaporkan, supaya profil tahap
+    yang banyak tumpang-tindih (worker paralel) tidak terbaca sebagai lengkap.
+    """
+
+    ALLOC_SAMPLES_PER_STAGE = 3
+
+    def __init__(self):
+        self.out_dir = None
+        self._lock = threading.Lock()
+        self._profiles = {}  # stage -> cProfile.Profile (akumulatif)
+        self._calls = {}  # stage -> jumlah panggilan yang diprofil
+        self._skipped = {}  # stage -> jumlah panggilan yang dilewati (profiler sedang dipakai)
+        self._skipped_lock = threading.Lock()
+        self._peak_bytes = {}  # stage -> puncak alokasi satu panggilan
+        self._alloc_stats = {}  # stage -> {lokasi: (size_diff, count_diff)}
+
+    @property
+    def enabled(self):
+        return self.out_dir is not None
+
+    def enable(self, out_dir: str):
+        import tracemalloc
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        if not self._lock.acquire(blocking=False):
+            with self._skipped_lock:
+                self._skipped[name] = self._skipped.get(name, 0) + 1
+            yield
+            return
+
+        import cProfile
+        import tracemalloc
+
+        try:
+            calls = self._calls.get(name, 0)
+            take_snapshot = calls < self.ALLOC_SAMPLES_PER_STAGE
+            before = tracemalloc.take_snapshot() if take_snapshot else None
+            tracemalloc.reset_peak()
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._calls[name] = calls + 1
+                peak = tracemalloc.get_traced_memory()[1]
+                self._peak_bytes[name] = max(self._peak_bytes.get(name, 0), peak)
+                if take_snapshot:
+                    self._add_alloc_stats(name, tracemalloc.take_snapshot().compare_to(before, "lineno"))
+        finally:
+            self._lock.release()
+
+    def _add_alloc_stats(self, name, stat_diffs):
+        acc = self._alloc_stats.setdefault(name, {})
+        for stat in stat_diffs:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            size, count = acc.get(where, (0, 0))
+            acc[where] = (size + stat.size_diff, count + stat.count_diff)
+
+    def stage_names(self) -> list:
+        # Tahap yang diprofil + tahap yang semua panggilannya dilewati
+        return list(dict.fromkeys([*self._profiles, *self._skipped]))
+
+    def top_functions(self, name: str, limit: int = 5):
+        import pstats
+
+        if name not in self._profiles:
+            return []
+        stats = pstats.Stats(self._profiles[name]).sort_stats("tottime")
+        rows = []
+        for func in stats.fcn_list[:limit]:
+            _, ncalls, tottime, cumtime, _ = stats.stats[func]
+            filename, lineno, funcname = func
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{lineno}({funcname})",
+                "ncalls": ncalls,
+                "tottime_seconds": round(tottime, 6),
+                "cumtime_seconds": round(cumtime, 6),
+            })
+        return rows
+
+    def top_allocations(self, name: str, limit: int = 15):
+        acc = self._alloc_stats.get(name, {})
+        ranked = sorted(acc.items(), key=lambda kv: -kv[1][0])[:limit]
+        return [{"site": where, "size_bytes": size, "count": count} for where, (size, count) in ranked]
+
+    def write_files(self):
+        """
+        Tulis <stage>.pstats (buka dengan `python -m pstats` / snakeviz) dan
+        <stage>.alloc.txt (situs alokasi terbesar) ke folder profil.
+        """
+        if not self.enabled:
+            return []
+        written = []
+        for name, profile in self._profiles.items():
+            pstats_path = os.path.join(self.out_dir, f"{name}.pstats")
+            profile.dump_stats(pstats_path)
+            alloc_path = os.path.join(self.out_dir, f"{name}.alloc.txt")
+            with open(alloc_path, "w", encoding="utf-8") as f:
+                f.write(
+                    f"# stage={name} calls={self._calls.get(name, 0)} skipped={self._skipped.get(name, 0)} "
+                    f"peak_bytes={self._peak_bytes.get(name, 0)} "
+                    f"(alokasi dari {min(self._calls.get(name, 0), self.ALLOC_SAMPLES_PER_STAGE)} panggilan sampel)\n"
+                )
+                for row in self.top_allocations(name):
+                    f.write(f"{row['size_bytes']:>12} B  {row['count']:>8} blok  {row['site']}\n")
+            written.extend([pstats_path, alloc_path])
+        return written
+
+    def report(self) -> dict:
+        return {
+            name: {
+                "calls": self._calls.get(name, 0),
+                "skipped": self._skipped.get(name, 0),
+                "peak_bytes": self._peak_bytes.get(name, 0),
+                "top_functions": self.top_functions(name),
+                "top_allocations": self.top_allocations(name, limit=5),
+            }
+            for name in self.stage_names()
+        }
+
+    def print_summary(self, limit: int = 5):
+        if not self.enabled or not self.stage_names():
+            return
+        print("\n===== PROFIL TAHAP (fungsi terberat, tottime) =====")
+        for name in self.stage_names():
+            skipped = self._skipped.get(name, 0)
+            print(
+                f"  🔥 {name}: {self._calls.get(name, 0)} panggilan, "
+                f"puncak memori {self._peak_bytes.get(name, 0) / 1024:.0f} KiB"
+                + (f", ⚠️ {skipped} panggilan tidak diprofil (tahap lain sedang diprofil)" if skipped else "")
+            )
+            for row in self.top_functions(name, limit):
+                print(
+                    f"      {row['tottime_seconds']:8.3f}s  {row['ncalls']:>8}x  {row['function']}"
+                )
+        print(f"  📁 File .pstats & .alloc.txt: {self.out_dir}")
+        print("===================================================\n")
+
+
+PROFILER = StageProfiler()
+
+
+def invoke_agent(agent, payload):
+    """
+    agent.invoke() + catat latensi dan pemakaian token per agent.
+    """
+    name = getattr(agent, "name", None) or "agent"
+    with METRICS.timer("agent_invoke_seconds", agent=name):
+        state = agent.invoke(payload)
+    METRICS.record_llm_usage(name, state.get("messages", []))
+    return state
+
+
+def agent_output_text(state) -> str:
+    # Isi pesan terakhir agent sebagai teks (content bisa string atau list blok)
+    content = state["messages"][-1].content
+    if isinstance(content, list):
+        parts = []
+        for c in content:
+            if isinstance(c, dict) and c.get("type") == "text":
+                parts.append(c.get("text", ""))
+            else:
+                parts.append(str(c))
+        return "\n".join(parts)
+    return str(content)
+
+
+def parse_agent_json(result, agent: str = "agent") -> dict:
+    """
+    Output akhir agent (state dari invoke_agent) -> dict. Jika model menambah
+    teks di sekitar JSON, dipakai potongan dari "{" pertama sampai "}" terakhir.
+    """
+    content_str = agent_output_text(result).strip()
+    with PROFILER.stage("agent_json"):
+        try:
+            return json.loads(content_str)
+        except json.JSONDecodeError:
+            first_brace = content_str.find("{")
+            last_brace = content_str.rfind("}")
+            if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
+                return json.loads(content_str[first_brace:last_brace + 1])
+            raise RuntimeError(f"Output {agent} bukan JSON valid:\n" + content_str)
+
+
+def run_statement(runner, label: str, query: str, **params):
+    """
+    Jalankan satu statement Cypher (session/tx) sampai selesai dan catat latensinya.
+    """
+    with METRICS.timer("neo4j_statement_seconds", statement=label):
+        result = runner.run(query, **params)
+        consume = getattr(result, "consume", None)
+        return consume() if consume else result
+
+
+def execute_write(session, label: str, work, *args):
+    """
+    session.execute_write() + catat durasi transaksi dan jumlah retry.
+    """
+    attempts = [0]
+
+    def counted_work(tx):
+        attempts[0] += 1
+        if attempts[0] > 1:
+            METRICS.inc("neo4j_transaction_retries_total", transaction=label)
+        return work(tx, *args)
+
+    with METRICS.timer("neo4j_transaction_seconds", transaction=label):
+        return session.execute_write(counted_work)
+
 
 # ==================================================
-# 2. UTIL: BANGUN URL WIKIPEDIA & SCRAPE TEKS
+# 3. UTIL: BANGUN URL WIKIPEDIA & SCRAPE TEKS
 # ==================================================
 
 def build_wikipedia_url_from_name(name: str) -> str:
     title = name.replace(" ", "_")
     encoded_title = urllib.parse.quote(title)
-    return f"https://id.wikipedia.org/wiki/{encoded_title}"
+    return f"{WIKIPEDIA_BASE_URL}/wiki/{encoded_title}"
 
 
-def fetch_wikipedia_text_with_infobox(url: str) -> str:
+WIKIPEDIA_MAX_RETRIES = int(os.environ.get("WIKIPEDIA_MAX_RETRIES", "2"))
+_RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+# Cache disk teks biografi (satu file JSON per URL) -> dipakai ulang saat
+# ekstraksi diulang dan jadi sumber index biografi Agent 5 (bagian 22).
+# Opt-in: "" (default) = tanpa cache, selalu ambil dari Wikipedia.
+# Entri lebih tua dari BIOGRAPHY_CACHE_MAX_AGE detik (dari fetched_at) dianggap
+# miss dan diambil ulang; 0 = tidak kedaluwarsa.
+BIOGRAPHY_CACHE_DIR = os.environ.get("BIOGRAPHY_CACHE_DIR", "")
+BIOGRAPHY_CACHE_MAX_AGE = float(os.environ.get("BIOGRAPHY_CACHE_MAX_AGE", "0"))
+
+
+def configure_biography_cache(cache_dir: str = None, max_age: float = None):
+    global BIOGRAPHY_CACHE_DIR, BIOGRAPHY_CACHE_MAX_AGE
+    if cache_dir is not None:
+        BIOGRAPHY_CACHE_DIR = cache_dir
+    if max_age is not None:
+        BIOGRAPHY_CACHE_MAX_AGE = max(0.0, float(max_age))
+
+
+def biography_cache_path(url: str) -> str:
+    import hashlib
+
+    return os.path.join(BIOGRAPHY_CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+
+def wikipedia_title_from_url(url: str) -> str:
+    return urllib.parse.unquote(url.rsplit("/wiki/", 1)[-1]).replace("_", " ")
+
+
+def read_cached_biography(url: str):
+    if not BIOGRAPHY_CACHE_DIR:
+        return None
+    try:
+        with open(biography_cache_path(url), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        METRICS.record_cache("biography", hit=False)
+        return None
+    if BIOGRAPHY_CACHE_MAX_AGE > 0 and time.time() - entry.get("fetched_at", 0) / 1000 > BIOGRAPHY_CACHE_MAX_AGE:
+        # Kedaluwarsa: ambil ulang, entri ditimpa setelah fetch berhasil
+        METRICS.record_cache("biography", hit=False)
+        return None
+    METRICS.record_cache("biography", hit=True)
+    return entry["text"]
+
+
+def write_cached_biography(url: str, text: str):
+    if not BIOGRAPHY_CACHE_DIR:
+        return
+    os.makedirs(BIOGRAPHY_CACHE_DIR, exist_ok=True)
+    path = biography_cache_path(url)
+    entry = {
+        "url": url,
+        "title": wikipedia_title_from_url(url),
+        "fetched_at": int(time.time() * 1000),
+        "text": text,
+    }
+    # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# Parsing HTML (BeautifulSoup, CPU-bound) bisa dipisah dari download ke pool
+# proses: thread pengambil (worker ekstraksi / prefetch) hanya menunggu
+# jaringan lalu menyerahkan HTML mentah, parsing berjalan paralel di N proses
+# tanpa berebut GIL. 0 = parsing di thread pemanggil (perilaku lama).
+HTML_PARSE_WORKERS = int(os.environ.get("HTML_PARSE_WORKERS", "0"))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def configure_parse_pool(workers: int = None):
+    global HTML_PARSE_WORKERS
+    if workers is not None:
+        close_parse_pool()
+        HTML_PARSE_WORKERS = max(0, int(workers))
+
+
+def get_parse_pool():
+    """
+    ProcessPoolExecutor parser HTML bersama (None jika HTML_PARSE_WORKERS = 0);
+    dibuka sekali saat pertama kali dibutuhkan. Proses parser dibuat lewat
+    forkserver (spawn jika tidak tersedia), bukan fork: pool ini dibuka dari
+    thread download, dan fork dari proses multi-thread bisa mewarisi lock
+    (koneksi Neo4j/SQLite, logging) yang sedang dipegang thread lain.
+    """
+    global _parse_pool
+    if HTML_PARSE_WORKERS <= 0:
+        return None
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=HTML_PARSE_WORKERS, mp_context=multiprocessing.get_context(method)
+                )
+    return _parse_pool
+
+
+def close_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown()
+            _parse_pool = None
+
+
+def download_wikipedia_html(url: str) -> str:
+    import requests
+
     headers = {
         "User-Agent": "Mozilla/5.0 (compatible; RafyBot/1.0; +https://example.com/bot)"
     }
-    resp = requests.get(url, headers=headers, timeout=20)
+    # Retry singkat (backoff 1s, 2s, ...) untuk rate limit / error sementara
+    for attempt in range(WIKIPEDIA_MAX_RETRIES + 1):
+        try:
+            with METRICS.timer("wikipedia_fetch_seconds"):
+                resp = requests.get(url, headers=headers, timeout=20)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= WIKIPEDIA_MAX_RETRIES:
+                raise
+            METRICS.inc("wikipedia_fetch_retries_total", reason="network")
+            time.sleep(2 ** attempt)
+            continue
+        if resp.status_code in _RETRYABLE_STATUS and attempt < WIKIPEDIA_MAX_RETRIES:
+            METRICS.inc("wikipedia_fetch_retries_total", reason=str(resp.status_code))
+            time.sleep(2 ** attempt)
+            continue
+        break
     resp.raise_for_status()
+    return resp.text
+
+
+def parse_wikipedia_html(html: str) -> str:
+    # Fungsi level modul (bisa di-pickle) -> bisa dijalankan di proses parser
+    from bs4 import BeautifulSoup
+
+    return _extract_wikipedia_text(BeautifulSoup(html, "html.parser"))
+
+
+def _parse_wikipedia_html_timed(html: str):
+    # Di proses parser: durasi ikut dikembalikan, metrik dicatat di proses utama
+    started = time.perf_counter()
+    text = parse_wikipedia_html(html)
+    return text, time.perf_counter() - started
+
+
+def parse_wikipedia_html_pooled(html: str) -> str:
+    pool = get_parse_pool()
+    if pool is None:
+        with METRICS.timer("html_parse_seconds"), PROFILER.stage("html_parse"):
+            return parse_wikipedia_html(html)
+    # Menunggu future melepas GIL: thread lain tetap bisa download selama parsing
+    text, seconds = pool.submit(_parse_wikipedia_html_timed, html).result()
+    METRICS.observe("html_parse_seconds", seconds)
+    return text
+
+
+def fetch_wikipedia_text_with_infobox(url: str) -> str:
+    cached = read_cached_biography(url)
+    if cached is not None:
+        return cached
+
+    text = parse_wikipedia_html_pooled(download_wikipedia_html(url))
+    if text.strip():
+        write_cached_biography(url, text)
+    return text
+
+
+def fetch_wikipedia_texts(urls, concurrency: int = 4):
+    """
+    Ambil banyak URL sekaligus: `concurrency` thread download, parsing lewat
+    pool proses (jika HTML_PARSE_WORKERS > 0). Yield (url, teks, error) dengan
+    urutan sama seperti `urls`; error = exception atau None. Yang sedang
+    dikerjakan dibatasi 4 × concurrency URL, jadi `urls` boleh generator besar.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(url):
+        try:
+            return url, fetch_wikipedia_text_with_infobox(url), None
+        except Exception as e:
+            return url, "", e
+
+    concurrency = max(1, int(concurrency))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for url in urls:
+            pending.append(executor.submit(fetch, url))
+            if len(pending) >= 4 * concurrency:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
 
+def _extract_wikipedia_text(soup) -> str:
     # Infobox
     infobox_text = ""
     infobox = soup.find("table", class_="infobox")
@@ -98,10 +872,9 @@ def fetch_wikipedia_text_with_infobox(url: str) -> str:
 
 
 # ==================================================
-# 3. TOOL UNTUK AGENT 1: get_wikipedia_biography
+# 4. TOOL UNTUK AGENT 1: get_wikipedia_biography
 # ==================================================
 
-@tool
 def get_wikipedia_biography(name: str) -> str:
     """
     Tool Agent 1: ambil teks biografi Wikipedia (infobox + artikel).
@@ -115,7 +888,7 @@ def get_wikipedia_biography(name: str) -> str:
 
 
 # ==================================================
-# 4. AGENT 1: FAMILY EXTRACTION AGENT
+# 5. AGENT 1: FAMILY EXTRACTION AGENT
 # ==================================================
 
 SYSTEM_PROMPT_A1 = """
@@ -169,12 +942,17 @@ Jika tidak ditemukan informasi keluarga di teks, berikan:
 JANGAN menambahkan komentar lain di luar JSON.
 """.strip()
 
-family_agent = create_react_agent(
-    llm,
-    tools=[get_wikipedia_biography],
-    prompt=SYSTEM_PROMPT_A1,
-    name="family_extraction_agent",
-)
+
+@lru_cache(maxsize=None)
+def get_family_agent():
+    from langgraph.prebuilt import create_react_agent
+
+    return create_react_agent(
+        get_llm(),
+        tools=[_as_tool(get_wikipedia_biography)],
+        prompt=SYSTEM_PROMPT_A1,
+        name="family_extraction_agent",
+    )
 
 
 def run_family_agent(person_name: str) -> dict:
@@ -188,75 +966,65 @@ def run_family_agent(person_name: str) -> dict:
        di sistem prompt, TANPA teks tambahan di luar JSON.
     """)
 
-    state = family_agent.invoke(
-        {"messages": [{"role": "user", "content": user_prompt}]}
+    state = invoke_agent(
+        get_family_agent(),
+        {"messages": [{"role": "user", "content": user_prompt}]},
     )
-    messages = state["messages"]
-    last_msg = messages[-1]
-    content = last_msg.content
+    return parse_agent_json(state, agent="agent 1")
 
-    if isinstance(content, list):
-        parts = []
-        for c in content:
-            if isinstance(c, dict) and c.get("type") == "text":
-                parts.append(c.get("text", ""))
-            else:
-                parts.append(str(c))
-        content_str = "\n".join(parts)
-    else:
-        content_str = str(content)
 
-    content_str = content_str.strip()
+# ==================================================
+# 6. FUNGSI DASAR TULIS KE NEO4J
+# ==================================================
 
-    try:
-        data = json.loads(content_str)
-        return data
-    except json.JSONDecodeError:
-        first_brace = content_str.find("{")
-        last_brace = content_str.rfind("}")
-        if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-            json_sub = content_str[first_brace:last_brace + 1]
-            data = json.loads(json_sub)
-            return data
-        else:
-            raise RuntimeError("Output agent 1 bukan JSON valid:\n" + content_str)
+# relasi (lowercase) -> (tipe relasi Neo4j, arah relatif terhadap tokoh)
+FAMILY_RELATION_MAPPING = {
+    "suami": ("SPOUSE_OF", "undirected"),
+    "istri": ("SPOUSE_OF", "undirected"),
+    "pasangan": ("SPOUSE_OF", "undirected"),
+    "suami/istri": ("SPOUSE_OF", "undirected"),
 
+    "anak": ("PARENT_OF", "outgoing"),      # person -> child
+    "putra": ("PARENT_OF", "outgoing"),
+    "putri": ("PARENT_OF", "outgoing"),
 
-# ==================================================
-# 5. FUNGSI DASAR TULIS KE NEO4J
-# ==================================================
+    "ayah": ("PARENT_OF", "incoming"),      # parent -> person
+    "ibu": ("PARENT_OF", "incoming"),
+    "orang tua": ("PARENT_OF", "incoming"),
 
-def write_family_to_neo4j(neo4j_driver, person_name, families, source_url=None):
+    "saudara": ("SIBLING_OF", "undirected"),
+    "saudara kandung": ("SIBLING_OF", "undirected"),
+
+    "menantu": ("IN_LAW_OF", "undirected"),
+    "mertua": ("IN_LAW_OF", "undirected"),
+    "cucu": ("FAMILY_OF", "undirected"),
+}
+
+
+def family_relation_type(relation: str):
+    # Relasi yang tidak dikenal -> FAMILY_OF (tak berarah, disimpan tokoh -> kerabat)
+    return FAMILY_RELATION_MAPPING.get(relation, ("FAMILY_OF", "undirected"))
+
+
+def write_family_to_neo4j(graph, person_name, families, source_url=None):
     """
     Buat node Person dan relasi keluarga ke Neo4j.
     """
     if not families:
         return
+    graph.write_family(person_name, families, source_url)
+    get_kinship_index.cache_clear()
 
-    relation_mapping = {
-        "suami": ("SPOUSE_OF", "undirected"),
-        "istri": ("SPOUSE_OF", "undirected"),
-        "pasangan": ("SPOUSE_OF", "undirected"),
-        "suami/istri": ("SPOUSE_OF", "undirected"),
-
-        "anak": ("PARENT_OF", "outgoing"),      # person -> child
-        "putra": ("PARENT_OF", "outgoing"),
-        "putri": ("PARENT_OF", "outgoing"),
-
-        "ayah": ("PARENT_OF", "incoming"),      # parent -> person
-        "ibu": ("PARENT_OF", "incoming"),
-        "orang tua": ("PARENT_OF", "incoming"),
+    # Kakek/nenek, mertua, ipar di sekitar orang ini ikut diperbarui
+    if DERIVED_KINSHIP_ENABLED:
+        update_derived_kinship(graph, derived_kinship_touched(families, person_name))
 
-        "saudara": ("SIBLING_OF", "undirected"),
-        "saudara kandung": ("SIBLING_OF", "undirected"),
-
-        "menantu": ("IN_LAW_OF", "undirected"),
-        "mertua": ("IN_LAW_OF", "undirected"),
-        "cucu": ("FAMILY_OF", "undirected"),
-    }
 
+def _write_family_statements(neo4j_driver, person_name, families, source_url=None):
     with neo4j_driver.session() as session:
-        session.run(
+        run_statement(
+            session,
+            "family_person",
             """
             MERGE (p:Person {name: $name})
             ON CREATE SET p.created_at = timestamp()
@@ -273,9 +1041,11 @@ def write_family_to_neo4j(neo4j_driver, person_name, families, source_url=None):
             if not rel_name:
                 continue
 
-            rel_type, direction = relation_mapping.get(rel_raw, ("FAMILY_OF", "undirected"))
+            rel_type, direction = family_relation_type(rel_raw)
 
-            session.run(
+            run_statement(
+                session,
+                "family_relative",
                 """
                 MERGE (f:Person {name: $rel_name})
                 ON CREATE SET f.created_at = timestamp()
@@ -322,7 +1092,9 @@ def write_family_to_neo4j(neo4j_driver, person_name, families, source_url=None):
                     r.last_seen = $created_at
                 """
 
-            session.run(
+            run_statement(
+                session,
+                f"family_{rel_type.lower()}",
                 cypher_rel,
                 person_name=person_name,
                 rel_name=rel_name,
@@ -331,24 +1103,19 @@ def write_family_to_neo4j(neo4j_driver, person_name, families, source_url=None):
 
 
 # ==================================================
-# 6. TOOL UNTUK AGENT 2: store_family_in_neo4j
+# 7. TOOL UNTUK AGENT 2: store_family_in_neo4j
 # ==================================================
 
-@tool
 def store_family_in_neo4j(person: str, families: list, source_url: str = None) -> str:
     """
     Tool Agent 2: simpan satu orang & relasi keluarganya ke Neo4j.
     """
-    global driver
-    if driver is None:
-        raise RuntimeError("Neo4j driver belum diinisialisasi.")
-
-    write_family_to_neo4j(driver, person, families, source_url)
+    write_family_to_neo4j(get_driver(), person, families, source_url)
     return f"Stored {len(families)} relations for {person} in Neo4j"
 
 
 # ==================================================
-# 7. AGENT 2: KG BUILDER AGENT
+# 8. AGENT 2: KG BUILDER AGENT
 # ==================================================
 
 SYSTEM_PROMPT_A2 = """
@@ -377,12 +1144,17 @@ Setelah tool dipanggil:
 - Jangan tambah komentar atau teks lain di luar JSON.
 """.strip()
 
-kg_agent = create_react_agent(
-    llm,
-    tools=[store_family_in_neo4j],
-    prompt=SYSTEM_PROMPT_A2,
-    name="kg_builder_agent",
-)
+
+@lru_cache(maxsize=None)
+def get_kg_agent():
+    from langgraph.prebuilt import create_react_agent
+
+    return create_react_agent(
+        get_llm(),
+        tools=[_as_tool(store_family_in_neo4j)],
+        prompt=SYSTEM_PROMPT_A2,
+        name="kg_builder_agent",
+    )
 
 
 def run_kg_agent(result_json: dict) -> dict:
@@ -393,221 +1165,262 @@ def run_kg_agent(result_json: dict) -> dict:
         "Gunakan JSON ini persis seperti instruksi di sistem prompt."
     )
 
-    state = kg_agent.invoke(
-        {"messages": [{"role": "user", "content": user_prompt}]}
+    state = invoke_agent(
+        get_kg_agent(),
+        {"messages": [{"role": "user", "content": user_prompt}]},
     )
-    messages = state["messages"]
-    last_msg = messages[-1]
-    content = last_msg.content
+    return parse_agent_json(state, agent="agent 2")
 
-    if isinstance(content, list):
-        parts = []
-        for c in content:
-            if isinstance(c, dict) and c.get("type") == "text":
-                parts.append(c.get("text", ""))
-            else:
-                parts.append(str(c))
-        content_str = "\n".join(parts)
-    else:
-        content_str = str(content)
 
-    content_str = content_str.strip()
+# ==================================================
+# 9. PROSES CSV UNTUK AGENT 1 + 2
+# ==================================================
+
+def extract_families_for_person(idx, nama: str, delay: float = 1.0, raise_errors: bool = False):
+    """
+    Jalankan Agent 1 (ekstraksi) + Agent 2 (tulis Neo4j) untuk satu orang.
+    Return list families, atau None jika gagal / tidak ada keluarga.
+    raise_errors=True: kegagalan Agent 1 / format hasil dilempar ke pemanggil
+    (mis. antrean kerja, supaya bisa di-retry), bukan dianggap "tanpa keluarga".
+    """
+    print(f"=== [{idx}] Memproses: {nama} ===")
 
+    # Agent 1: ekstraksi keluarga
     try:
-        data = json.loads(content_str)
-        return data
-    except json.JSONDecodeError:
-        first_brace = content_str.find("{")
-        last_brace = content_str.rfind("}")
-        if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-            json_sub = content_str[first_brace:last_brace + 1]
-            data = json.loads(json_sub)
-            return data
-        else:
-            raise RuntimeError("Output agent 2 bukan JSON valid:\n" + content_str)
-
+        result = run_family_agent(nama)
+    except Exception as e:
+        print(f"  ❌ Error dari agent 1 (ekstraksi) untuk {nama}: {e}")
+        if raise_errors:
+            raise
+        return None
+
+    # Agent 2: simpan ke Neo4j
+    try:
+        result_kg = run_kg_agent(result)
+        print("  🟢 Relasi keluarga ditulis ke Neo4j via agent kedua.")
+    except Exception as e:
+        print(f"  ⚠️ Gagal tulis ke Neo4j via agent 2 untuk {nama}: {e}")
+        result_kg = result  # tetap pakai hasil ekstraksi untuk CSV
+
+    families = result_kg.get("families", [])
+    if not isinstance(families, list):
+        print(f"  ⚠️ Format 'families' tidak list untuk {nama}, dilewati.")
+        if raise_errors:
+            raise ValueError(f"Format 'families' tidak list untuk {nama}")
+        return None
 
-# ==================================================
-# 8. PROSES CSV UNTUK AGENT 1 + 2
-# ==================================================
+    if not families:
+        print(f"  ℹ️ Tidak ada keluarga ditemukan untuk {nama}")
+        return None
 
-def process_csv_with_agents_1_2(csv_path: str, max_rows: int = 10):
-    df = pd.read_csv(csv_path)
+    print(f"  ✅ Ditemukan {len(families)} relasi keluarga")
 
-    for col in ["Pasangan", "Keluarga"]:
-        if col not in df.columns:
-            df[col] = pd.Series([""] * len(df), dtype="string")
-        else:
-            df[col] = df[col].astype("string")
+    if delay:
+        time.sleep(delay)
+    return families
 
-    n = min(max_rows, len(df))
-    print(f"📄 Membaca {n} baris pertama dari: {csv_path}\n")
 
-    for idx, row in df.head(n).iterrows():
-        nama = str(row.get("Nama", "")).strip()
-        if not nama:
-            print(f"Baris {idx}: kolom 'Nama' kosong, dilewati.")
-            continue
+def merge_family_labels(existing_pasangan, existing_keluarga, families):
+    """
+    Gabungkan isi kolom Pasangan/Keluarga yang sudah ada dengan hasil ekstraksi.
+    Return (pasangan_str, keluarga_str) dengan format "Nama (rel, note); ...".
+    """
+    import pandas as pd
 
-        print(f"=== [{idx}] Memproses: {nama} ===")
+    if pd.isna(existing_pasangan):
+        existing_pasangan = ""
+    if pd.isna(existing_keluarga):
+        existing_keluarga = ""
 
-        # Agent 1: ekstraksi keluarga
-        try:
-            result = run_family_agent(nama)
-        except Exception as e:
-            print(f"  ❌ Error dari agent 1 (ekstraksi) untuk {nama}: {e}")
-            continue
+    pasangan_list = []
+    keluarga_list = []
 
-        # Agent 2: simpan ke Neo4j
-        try:
-            result_kg = run_kg_agent(result)
-            print("  🟢 Relasi keluarga ditulis ke Neo4j via agent kedua.")
-        except Exception as e:
-            print(f"  ⚠️ Gagal tulis ke Neo4j via agent 2 untuk {nama}: {e}")
-            result_kg = result  # tetap pakai hasil ekstraksi untuk CSV
+    if existing_pasangan.strip():
+        pasangan_list.append(existing_pasangan.strip())
+    if existing_keluarga.strip():
+        keluarga_list.append(existing_keluarga.strip())
 
-        families = result_kg.get("families", [])
-        if not isinstance(families, list):
-            print(f"  ⚠️ Format 'families' tidak list untuk {nama}, dilewati.")
-            continue
+    for fam in families:
+        rel = (fam.get("relation") or "").strip().lower()
+        obj_name = (fam.get("name") or "").strip()
+        note = (fam.get("note") or "").strip()
 
-        if not families:
-            print(f"  ℹ️ Tidak ada keluarga ditemukan untuk {nama}")
+        if not obj_name:
             continue
 
-        print(f"  ✅ Ditemukan {len(families)} relasi keluarga")
+        if note:
+            label = f"{obj_name} ({rel}, {note})"
+        else:
+            label = f"{obj_name} ({rel})"
 
-        existing_pasangan = row.get("Pasangan", "")
-        existing_keluarga = row.get("Keluarga", "")
+        if rel in ["suami", "istri", "pasangan", "suami/istri"]:
+            if label not in pasangan_list:
+                pasangan_list.append(label)
+        else:
+            if label not in keluarga_list:
+                keluarga_list.append(label)
 
-        if pd.isna(existing_pasangan):
-            existing_pasangan = ""
-        if pd.isna(existing_keluarga):
-            existing_keluarga = ""
+    return "; ".join(pasangan_list), "; ".join(keluarga_list)
 
-        pasangan_list = []
-        keluarga_list = []
 
-        if existing_pasangan.strip():
-            pasangan_list.append(existing_pasangan.strip())
-        if existing_keluarga.strip():
-            keluarga_list.append(existing_keluarga.strip())
+def _prepare_extract_frame(df):
+    # Kolom Pasangan/Keluarga dipastikan ada (string)
+    import pandas as pd
 
-        for fam in families:
-            rel = (fam.get("relation") or "").strip().lower()
-            obj_name = (fam.get("name") or "").strip()
-            note = (fam.get("note") or "").strip()
+    for col in ["Pasangan", "Keluarga"]:
+        if col not in df.columns:
+            df[col] = pd.Series([""] * len(df), dtype="string", index=df.index)
+        else:
+            df[col] = df[col].astype("string")
+    return df
 
-            if not obj_name:
-                continue
 
-            if note:
-                label = f"{obj_name} ({rel}, {note})"
-            else:
-                label = f"{obj_name} ({rel})"
+def read_extract_csv(csv_path: str):
+    # CSV input Agent 1 + 2 sekaligus
+    import pandas as pd
 
-            if rel in ["suami", "istri", "pasangan", "suami/istri"]:
-                if label not in pasangan_list:
-                    pasangan_list.append(label)
-            else:
-                if label not in keluarga_list:
-                    keluarga_list.append(label)
+    return _prepare_extract_frame(pd.read_csv(csv_path))
 
-        df.at[idx, "Pasangan"] = "; ".join(pasangan_list)
-        df.at[idx, "Keluarga"] = "; ".join(keluarga_list)
 
-        time.sleep(1)
+def iter_extract_chunks(csv_path: str, max_rows: int = None):
+    # CSV input Agent 1 + 2 per chunk (CSV_CHUNK_ROWS), satu chunk jika 0
+    for df in iter_enriched_chunks(csv_path, max_rows=max_rows):
+        yield _prepare_extract_frame(df)
 
-    out_csv = CSV_ENRICHED_PATH
-    df.to_csv(out_csv, index=False, encoding="utf-8-sig")
-    print(f"\n💾 File hasil CSV disimpan ke: {out_csv}")
 
+def write_csv_chunk(df, out_csv: str, first: bool):
+    # Chunk pertama menimpa file (dengan header + BOM), berikutnya di-append
+    if first:
+        df.to_csv(out_csv, index=False, encoding="utf-8-sig")
+    else:
+        df.to_csv(out_csv, index=False, header=False, mode="a", encoding="utf-8")
 
-# ==================================================
-# 9. TOOL UNTUK AGENT 3: RINGKASAN STRATEGIC MARRIAGE
-# ==================================================
 
-@tool
-def get_strategic_marriage_summary(csv_path: str, max_rows: int = 1000) -> str:
-    """
-    Tool Agent 3:
-    - Baca anggota_dpr_enriched.csv
-    - Bangun relasi (Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga)
-    - Deteksi calon "pernikahan politik" (cross-family, cross-party)
-    - Return JSON string ringkasan.
+def extract_jobs(df, n: int) -> list:
+    # [(index baris, nama)] untuk n baris pertama; baris tanpa nama dilewati
+    jobs = []
+    for idx, row in df.head(n).iterrows():
+        nama = str(row.get("Nama", "")).strip()
+        if not nama:
+            print(f"Baris {idx}: kolom 'Nama' kosong, dilewati.")
+            continue
+        jobs.append((idx, nama))
+    return jobs
+
+
+def apply_families_to_row(df, idx, families):
+    if not families:
+        return
+    pasangan, keluarga = merge_family_labels(
+        df.at[idx, "Pasangan"], df.at[idx, "Keluarga"], families
+    )
+    df.at[idx, "Pasangan"] = pasangan
+    df.at[idx, "Keluarga"] = keluarga
+
+
+def process_csv_with_agents_1_2(
+    csv_path: str,
+    max_rows: int = 10,
+    concurrency: int = 1,
+    out_csv: str = CSV_ENRICHED_PATH,
+    delay: float = 1.0,
+):
     """
-    df = pd.read_csv(csv_path)
-    if max_rows < len(df):
-        df = df.head(max_rows)
+    Agent 1 + 2 untuk tiap baris CSV, lalu tulis CSV enriched.
+    concurrency > 1 -> beberapa orang diproses paralel (thread), urutan hasil tetap.
+    CSV_CHUNK_ROWS > 0 -> CSV dibaca, diproses, dan ditulis per chunk
+    (baris di luar max_rows tetap disalin apa adanya).
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-    # Pastikan kolom-kolom kunci ada
-    for col in ["Nama", "Dapil", "Partai", "Jabatan", "Pendidikan", "Pasangan", "Keluarga"]:
-        if col not in df.columns:
-            df[col] = ""
+    def run_job(job):
+        idx, nama = job
+        return idx, extract_families_for_person(idx, nama, delay=delay)
 
-    # Map nama -> info
-    persons = {}
-    for _, row in df.iterrows():
-        nama = str(row["Nama"]).strip()
-        if not nama:
-            continue
-        keluarga_label = nama.split()[-1] if nama.split() else nama
-        persons[nama] = {
-            "nama": nama,
-            "dapil": str(row["Dapil"]).strip(),
-            "partai": str(row["Partai"]).strip(),
-            "jabatan": str(row["Jabatan"]).strip(),
-            "pendidikan": str(row["Pendidikan"]).strip(),
-            "keluarga_label": keluarga_label,
-        }
+    executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    first = True
+    try:
+        for df in iter_extract_chunks(csv_path):
+            start = df.index[0] if len(df) else 0
+            n = max(0, min(max_rows - start, len(df)))
+            if first and CSV_CHUNK_ROWS:
+                print(f"📄 Membaca bertahap per {CSV_CHUNK_ROWS} baris (maks. {max_rows} diproses) dari: {csv_path}\n")
+            elif first:
+                print(f"📄 Membaca {n} baris pertama dari: {csv_path}\n")
+            jobs = extract_jobs(df, n)
+            results = executor.map(run_job, jobs) if executor else map(run_job, jobs)
+            for idx, families in results:
+                apply_families_to_row(df, idx, families)
+            write_csv_chunk(df, out_csv, first)
+            first = False
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-    marriages = []
-    cross_party_counts = {}
-    cross_family_counts = {}
+    print(f"\n💾 File hasil CSV disimpan ke: {out_csv}")
 
-    for _, row in df.iterrows():
-        nama = str(row["Nama"]).strip()
-        if not nama:
-            continue
 
-        info = persons.get(nama, {})
-        person_family = info.get("keluarga_label", "")
-        person_party = info.get("partai", "")
-        person_dapil = info.get("dapil", "")
+# ==================================================
+# 10. TOOL UNTUK AGENT 3: RINGKASAN STRATEGIC MARRIAGE
+# ==================================================
 
-        pasangan_raw = str(row["Pasangan"]) if not pd.isna(row["Pasangan"]) else ""
-        if not pasangan_raw.strip():
-            continue
+STRATEGIC_COLUMNS = ["Nama", "Dapil", "Partai", "Jabatan", "Pendidikan", "Pasangan", "Keluarga"]
 
-        pasangan_entries = [e.strip() for e in pasangan_raw.split(";") if e.strip()]
-        for entry in pasangan_entries:
-            # Format: "Nama Pasangan (relation, note)" atau "Nama Pasangan"
-            spouse_name = entry
-            relation_label = ""
-            if "(" in entry:
-                name_part, rel_part = entry.split("(", 1)
-                spouse_name = name_part.strip()
-                rel_part = rel_part.rstrip(")")
-                relation_label = rel_part.split(",")[0].strip()
-
-            spouse_info = persons.get(spouse_name, None)
-            spouse_party = spouse_info.get("partai", "") if spouse_info else ""
-            spouse_dapil = spouse_info.get("dapil", "") if spouse_info else ""
-            spouse_family = (
-                spouse_info.get("keluarga_label")
-                if spouse_info
-                else (spouse_name.split()[-1] if spouse_name.split() else spouse_name)
-            )
+
+class StrategicMarriageAggregator:
+    """
+    Agregat "strategic marriage" yang bisa diisi baris demi baris (mis. dari
+    pipeline streaming). Info pasangan di-resolve saat summary() dipanggil,
+    karena pasangan bisa saja muncul di baris yang datang belakangan.
+    """
+
+    def __init__(self):
+        # Hanya yang dibutuhkan untuk me-resolve pasangan; teks per baris
+        # (Jabatan, Pendidikan, Keluarga) tidak disimpan.
+        self.persons = {}  # nama -> (partai, dapil, label keluarga)
+        self.marriage_entries = []  # (nama, spouse_name, relation_label)
+
+    @staticmethod
+    def family_label(nama: str) -> str:
+        return nama.split()[-1] if nama.split() else nama
+
+    def add_row(self, row):
+        nama = str(row.get("Nama", "")).strip()
+        if not nama:
+            return
+
+        self.persons[nama] = (
+            str(row.get("Partai", "")).strip(),
+            str(row.get("Dapil", "")).strip(),
+            self.family_label(nama),
+        )
+
+        # String CSV "Nama Pasangan (relation, note); ..." atau list struct Parquet
+        for rel in relation_entries(row.get("Pasangan", "")):
+            self.marriage_entries.append((nama, rel["name"], rel["relation"]))
+
+    def summary(self) -> dict:
+        persons = self.persons
+        marriages = []
+        cross_party_counts = {}
+        cross_family_counts = {}
+        person_to_families = {}
+
+        for nama, spouse_name, relation_label in self.marriage_entries:
+            person_party, person_dapil, person_family = persons.get(nama, ("", "", ""))
+            spouse_info = persons.get(spouse_name)
+            if spouse_info:
+                spouse_party, spouse_dapil, spouse_family = spouse_info
+            else:
+                spouse_party, spouse_dapil = "", ""
+                spouse_family = self.family_label(spouse_name)
 
             cross_family = (
                 person_family.lower() != spouse_family.lower()
                 if person_family and spouse_family
                 else False
             )
-
-            cross_party = False
-            if person_party and spouse_party and person_party != spouse_party:
-                cross_party = True
+            cross_party = bool(person_party and spouse_party and person_party != spouse_party)
 
             if cross_party:
                 key = tuple(sorted([person_party, spouse_party]))
@@ -617,6 +1430,10 @@ def get_strategic_marriage_summary(csv_path: str, max_rows: int = 1000) -> str:
                 key_f = tuple(sorted([person_family, spouse_family]))
                 cross_family_counts[key_f] = cross_family_counts.get(key_f, 0) + 1
 
+            # Deteksi orang yang menikah ke lebih dari satu keluarga berbeda
+            if spouse_family:
+                person_to_families.setdefault(nama, set()).add(spouse_family)
+
             marriages.append(
                 {
                     "person": nama,
@@ -633,48 +1450,61 @@ def get_strategic_marriage_summary(csv_path: str, max_rows: int = 1000) -> str:
                 }
             )
 
-    # Deteksi orang yang menikah ke lebih dari satu keluarga berbeda
-    multi_family_bridge = []
-    person_to_families = {}
-    for m in marriages:
-        fam = m["spouse_family"]
-        if not fam:
-            continue
-        person_to_families.setdefault(m["person"], set()).add(fam)
-
-    for person, fams in person_to_families.items():
-        if len(fams) > 1:
-            multi_family_bridge.append(
-                {
-                    "person": person,
-                    "families": list(fams),
-                    "partai": persons.get(person, {}).get("partai", ""),
-                    "dapil": persons.get(person, {}).get("dapil", ""),
-                }
-            )
+        multi_family_bridge = [
+            {
+                "person": person,
+                "families": list(fams),
+                "partai": persons.get(person, ("", ""))[0],
+                "dapil": persons.get(person, ("", ""))[1],
+            }
+            for person, fams in person_to_families.items()
+            if len(fams) > 1
+        ]
+
+        return {
+            "total_persons": len(persons),
+            "total_marriages": len(marriages),
+            "total_cross_family_marriages": sum(1 for m in marriages if m["cross_family"]),
+            "total_cross_party_marriages": sum(1 for m in marriages if m["cross_party"]),
+            "marriages": marriages,
+            "cross_party_pairs": [
+                {"partai_a": k[0], "partai_b": k[1], "count": v}
+                for k, v in sorted(cross_party_counts.items(), key=lambda x: -x[1])
+            ],
+            "cross_family_pairs": [
+                {"keluarga_a": k[0], "keluarga_b": k[1], "count": v}
+                for k, v in sorted(cross_family_counts.items(), key=lambda x: -x[1])
+            ],
+            "multi_family_bridge_persons": multi_family_bridge,
+        }
 
-    summary = {
-        "total_persons": len(persons),
-        "total_marriages": len(marriages),
-        "total_cross_family_marriages": sum(1 for m in marriages if m["cross_family"]),
-        "total_cross_party_marriages": sum(1 for m in marriages if m["cross_party"]),
-        "marriages": marriages,
-        "cross_party_pairs": [
-            {"partai_a": k[0], "partai_b": k[1], "count": v}
-            for k, v in sorted(cross_party_counts.items(), key=lambda x: -x[1])
-        ],
-        "cross_family_pairs": [
-            {"keluarga_a": k[0], "keluarga_b": k[1], "count": v}
-            for k, v in sorted(cross_family_counts.items(), key=lambda x: -x[1])
-        ],
-        "multi_family_bridge_persons": multi_family_bridge,
-    }
 
-    return json.dumps(summary, ensure_ascii=False)
+def get_strategic_marriage_summary(csv_path: str, max_rows: int = 1000) -> str:
+    """
+    Tool Agent 3:
+    - Baca anggota_dpr_enriched.csv
+    - Bangun relasi (Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga)
+    - Deteksi calon "pernikahan politik" (cross-family, cross-party)
+    - Return JSON string ringkasan.
+    """
+    with PROFILER.stage("strategic_summary"):
+        aggregator = StrategicMarriageAggregator()
+        # Jabatan, Pendidikan & Keluarga tidak dipakai di ringkasan -> tidak dibaca
+        for df in iter_enriched_chunks(
+            csv_path, columns=["Nama", "Dapil", "Partai", "Pasangan"], max_rows=max_rows
+        ):
+            # Pastikan kolom-kolom kunci ada
+            for col in STRATEGIC_COLUMNS:
+                if col not in df.columns:
+                    df[col] = ""
+            for _, row in df.iterrows():
+                aggregator.add_row(row)
+
+        return json.dumps(aggregator.summary(), ensure_ascii=False)
 
 
 # ==================================================
-# 10. AGENT 3: STRATEGIC MARRIAGE ANALYSIS
+# 11. AGENT 3: STRATEGIC MARRIAGE ANALYSIS
 # ==================================================
 
 SYSTEM_PROMPT_A3 = """
@@ -718,43 +1548,49 @@ PENTING:
 - Jawaban dalam bahasa Indonesia, gaya analitis tapi mudah dipahami, 4–8 paragraf.
 """.strip()
 
-strategic_agent = create_react_agent(
-    llm,
-    tools=[get_strategic_marriage_summary],
-    prompt=SYSTEM_PROMPT_A3,
-    name="strategic_marriage_agent",
-)
 
+@lru_cache(maxsize=None)
+def get_strategic_agent():
+    from langgraph.prebuilt import create_react_agent
 
-def run_strategic_marriage_agent(csv_path: str):
-    user_prompt = textwrap.dedent(f"""
-    Lakukan analisis "Strategic Marriage — Mendeteksi Pernikahan Politik"
-    dengan membaca file CSV berikut:
+    return create_react_agent(
+        get_llm(),
+        tools=[_as_tool(get_strategic_marriage_summary)],
+        prompt=SYSTEM_PROMPT_A3,
+        name="strategic_marriage_agent",
+    )
 
-    {csv_path}
 
-    Langkah:
-    1. Panggil tool `get_strategic_marriage_summary` dengan csv_path ini.
-    2. Gunakan JSON yang dikembalikan untuk membuat analisis seperti di sistem prompt.
-    """)
+def run_strategic_marriage_agent(csv_path: str, summary_json: str = None):
+    """
+    summary_json: ringkasan yang sudah dihitung (mis. dari pipeline streaming);
+    jika diisi, agent tidak perlu memanggil tool / membaca ulang CSV.
+    """
+    if summary_json is not None:
+        user_prompt = textwrap.dedent(f"""
+        Lakukan analisis "Strategic Marriage — Mendeteksi Pernikahan Politik"
+        untuk data dari file CSV {csv_path}.
+
+        Ringkasan JSON (format sama dengan output tool `get_strategic_marriage_summary`)
+        sudah tersedia di bawah ini, jadi JANGAN memanggil tool lagi:
+        """) + summary_json
+    else:
+        user_prompt = textwrap.dedent(f"""
+        Lakukan analisis "Strategic Marriage — Mendeteksi Pernikahan Politik"
+        dengan membaca file CSV berikut:
 
-    state = strategic_agent.invoke(
-        {"messages": [{"role": "user", "content": user_prompt}]}
-    )
-    messages = state["messages"]
-    last_msg = messages[-1]
-    content = last_msg.content
+        {csv_path}
 
-    if isinstance(content, list):
-        parts = []
-        for c in content:
-            if isinstance(c, dict) and c.get("type") == "text":
-                parts.append(c.get("text", ""))
-            else:
-                parts.append(str(c))
-        content_str = "\n".join(parts)
-    else:
-        content_str = str(content)
+        Langkah:
+        1. Panggil tool `get_strategic_marriage_summary` dengan csv_path ini.
+        2. Gunakan JSON yang dikembalikan untuk membuat analisis seperti di sistem prompt.
+        """)
+
+    state = invoke_agent(
+        get_strategic_agent(),
+        {"messages": [{"role": "user", "content": user_prompt}]},
+    )
+    content_str = agent_output_text(state)
 
     print("\n===== HASIL ANALISIS STRATEGIC MARRIAGE =====\n")
     print(content_str)
@@ -762,428 +1598,4752 @@ def run_strategic_marriage_agent(csv_path: str):
 
 
 # ==================================================
-# 12. TOOL & AGENT 4: BANGUN RELASI NAMA–DAPIL–PARTAI–JABATAN–PENDIDIKAN–PASANGAN–KELUARGA
+# 12. DATASET ENRICHED: CSV <-> PARQUET (KOLOM TERSTRUKTUR)
 # ==================================================
+# Di CSV, Pasangan/Keluarga disimpan sebagai string "Nama (relasi, catatan); ..."
+# dan Jabatan/Pendidikan sebagai "a; b; c". Di Parquet kolom-kolom itu bertipe
+# list<struct<name, relation, note>> / list<string>, jadi parsing cukup sekali
+# saat konversi. Kolom teks lain disimpan dictionary-encoded (banyak nilai
+# berulang). pyarrow opsional: hanya dibutuhkan untuk file .parquet.
 
-@tool
-def build_kg_from_enriched_csv(csv_path: str, max_rows: int = 1000) -> str:
-    """
-    Tool Agent 4:
-    - Baca CSV yang berisi kolom:
-      Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga
-    - Bangun node & relasi dasar di Neo4j:
-      (Person)-[:REPRESENTS]->(Dapil)
-      (Person)-[:MEMBER_OF]->(Party)
-      (Person)-[:HOLDS_POSITION]->(Position)
-      (Person)-[:ALUMNI_OF]->(Education)
-      (Person)-[:SPOUSE_OF]->(Person)
-      (Person)-[:FAMILY_OF]->(Person)
-    """
-    global driver
-    if driver is None:
-        raise RuntimeError("Neo4j driver belum diinisialisasi.")
-
-    df = pd.read_csv(csv_path)
-    if max_rows < len(df):
-        df = df.head(max_rows)
+RELATION_COLUMNS = ["Pasangan", "Keluarga"]
+LIST_COLUMNS = ["Jabatan", "Pendidikan"]
 
-    with driver.session() as session:
-        for _, row in df.iterrows():
-            nama = str(row.get("Nama", "")).strip()
-            if not nama:
-                continue
 
-            dapil = str(row.get("Dapil", "")).strip()
-            partai = str(row.get("Partai", "")).strip()
-            jabatan = str(row.get("Jabatan", "")).strip()
-            pendidikan = str(row.get("Pendidikan", "")).strip()
+def parse_relation_entry(entry: str) -> dict:
+    """
+    "Himmatul Aliyah (istri)"     -> name, relation="istri", note=""
+    "Ahmad (anak, Bupati Lebak)"  -> name, relation="anak",  note="Bupati Lebak"
+    "Ahmad"                       -> name, relation="",      note=""
+    """
+    entry = entry.strip()
+    if "(" not in entry:
+        return {"name": entry, "relation": "", "note": ""}
+    name_part, rel_part = entry.split("(", 1)
+    if rel_part.endswith(")"):
+        # satu ")" saja: catatan bisa berisi kurung, mis. "(saudara, pahlawan (pertalian darah))"
+        rel_part = rel_part[:-1]
+    relation, _, note = rel_part.partition(",")
+    return {"name": name_part.strip(), "relation": relation.strip(), "note": note.strip()}
+
+
+def split_relation_entries(text: str) -> list:
+    """
+    Pisah "A (istri); B (anak, lahir 2012; kuliah di X)" per ";" di luar kurung,
+    supaya ";" di dalam catatan tidak memecah satu entri menjadi dua.
+    """
+    entries, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        elif ch == ";" and depth == 0:
+            entries.append(text[start:i])
+            start = i + 1
+    entries.append(text[start:])
+    return [e.strip() for e in entries if e.strip()]
 
-            pasangan_val = row.get("Pasangan", "")
-            keluarga_val = row.get("Keluarga", "")
 
-            pasangan = "" if pd.isna(pasangan_val) else str(pasangan_val).strip()
-            keluarga = "" if pd.isna(keluarga_val) else str(keluarga_val).strip()
+def relation_label(rel: dict) -> str:
+    # Teks di dalam kurung seperti di CSV: "istri" atau "anak, Bupati Lebak"
+    return ", ".join(x for x in (rel.get("relation"), rel.get("note")) if x)
 
-            # --- Person utama ---
-            session.run(
-                """
-                MERGE (p:Person {name: $nama})
-                ON CREATE SET p.created_at = timestamp()
-                SET p.last_seen = timestamp(),
-                    p.dapil = $dapil,
-                    p.partai = $partai,
-                    p.jabatan_raw = $jabatan,
-                    p.pendidikan_raw = $pendidikan
-                """,
-                nama=nama,
-                dapil=dapil,
-                partai=partai,
-                jabatan=jabatan,
-                pendidikan=pendidikan,
-            )
 
-            # --- Dapil ---
-            if dapil:
-                session.run(
-                    """
-                    MERGE (d:Dapil {name: $dapil})
-                    MERGE (p:Person {name: $nama})
-                    MERGE (p)-[:REPRESENTS]->(d)
-                    """,
-                    dapil=dapil,
-                    nama=nama,
-                )
+def format_relation_entry(rel: dict) -> str:
+    # Kebalikan parse_relation_entry (format yang ditulis merge_family_labels)
+    inner = relation_label(rel)
+    return f"{rel['name']} ({inner})" if inner else rel["name"]
 
-            # --- Partai ---
-            if partai:
-                session.run(
-                    """
-                    MERGE (par:Party {name: $partai})
-                    MERGE (p:Person {name: $nama})
-                    MERGE (p)-[:MEMBER_OF]->(par)
-                    """,
-                    partai=partai,
-                    nama=nama,
-                )
 
-            # --- Jabatan (bisa banyak, dipisah ; ) ---
-            if jabatan:
-                for j in [x.strip() for x in jabatan.split(";") if x.strip()]:
-                    session.run(
-                        """
-                        MERGE (pos:Position {name: $jabatan})
-                        MERGE (p:Person {name: $nama})
-                        MERGE (p)-[:HOLDS_POSITION]->(pos)
-                        """,
-                        jabatan=j,
-                        nama=nama,
-                    )
+def _is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    import pandas as pd
 
-            # --- Pendidikan (bisa banyak, dipisah ; ) ---
-            if pendidikan:
-                for edu in [x.strip() for x in pendidikan.split(";") if x.strip()]:
-                    session.run(
-                        """
-                        MERGE (u:Education {name: $edu})
-                        MERGE (p:Person {name: $nama})
-                        MERGE (p)-[:ALUMNI_OF]->(u)
-                        """,
-                        edu=edu,
-                        nama=nama,
-                    )
+    return value is pd.NA
 
-            # --- Pasangan -> SPOUSE_OF ---
-            if pasangan:
-                pasangan_entries = [e.strip() for e in pasangan.split(";") if e.strip()]
-                for entry in pasangan_entries:
-                    spouse_name = entry
-                    rel_label = "pasangan"
-
-                    # Format umum: "Jo Lin Sumbardi (istri)" dst.
-                    if "(" in entry:
-                        name_part, rel_part = entry.split("(", 1)
-                        spouse_name = name_part.strip()
-                        rel_part = rel_part.rstrip(")")
-                        rel_label = rel_part.strip()  # misalnya "istri", "suami"
-
-                    session.run(
-                        """
-                        MERGE (s:Person {name: $spouse_name})
-                        ON CREATE SET s.created_at = timestamp()
-                        SET s.last_seen = timestamp()
-                        """,
-                        spouse_name=spouse_name,
-                    )
 
-                    session.run(
-                        """
-                        MATCH (p:Person {name: $nama}),
-                              (s:Person {name: $spouse_name})
-                        MERGE (p)-[r:SPOUSE_OF]->(s)
-                        SET r.relation_label = $rel_label,
-                            r.created_at = coalesce(r.created_at, timestamp()),
-                            r.last_seen = timestamp()
-                        """,
-                        nama=nama,
-                        spouse_name=spouse_name,
-                        rel_label=rel_label,
-                    )
+def relation_entries(value) -> list:
+    """
+    Nilai kolom Pasangan/Keluarga -> list dict {name, relation, note}.
+    Terima string CSV (di-parse) maupun list struct dari Parquet (apa adanya).
+    """
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        return [parse_relation_entry(e) for e in split_relation_entries(value)]
+    return [dict(rel) for rel in value if rel and rel.get("name")]
 
-            # --- Keluarga lain -> FAMILY_OF (sederhana) ---
-            if keluarga:
-                keluarga_entries = [e.strip() for e in keluarga.split(";") if e.strip()]
-                for entry in keluarga_entries:
-                    fam_name = entry
-                    note = ""
-
-                    if "(" in entry:
-                        name_part, note_part = entry.split("(", 1)
-                        fam_name = name_part.strip()
-                        note_part = note_part.rstrip(")")
-                        note = note_part.strip()
-
-                    session.run(
-                        """
-                        MERGE (f:Person {name: $fam_name})
-                        ON CREATE SET f.created_at = timestamp()
-                        SET f.last_seen = timestamp()
-                        """,
-                        fam_name=fam_name,
-                    )
 
-                    session.run(
-                        """
-                        MATCH (p:Person {name: $nama}),
-                              (f:Person {name: $fam_name})
-                        MERGE (p)-[r:FAMILY_OF]->(f)
-                        SET r.note = $note,
-                            r.created_at = coalesce(r.created_at, timestamp()),
-                            r.last_seen = timestamp()
-                        """,
-                        nama=nama,
-                        fam_name=fam_name,
-                        note=note,
-                    )
+def list_entries(value) -> list:
+    # Nilai kolom Jabatan/Pendidikan -> list string (CSV "a; b" atau list Parquet)
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        return [x.strip() for x in value.split(";") if x.strip()]
+    return [str(x) for x in value if x]
 
-    return f"Berhasil membangun KG dari {len(df)} baris di {csv_path}"
 
+def cell_text(value) -> str:
+    # Teks kolom seperti di CSV; list dari Parquet digabung lagi dengan "; "
+    if isinstance(value, (str, float)) or not hasattr(value, "__iter__"):
+        return str(value)
+    return "; ".join(str(x) for x in value)
 
-SYSTEM_PROMPT_A4 = """
-Kamu adalah agen pembangun knowledge graph (Agent 4) dari data CSV anggota DPR.
 
-Tugas:
-- Menerima path file CSV yang berisi kolom:
-  Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga.
-- PANGGIL tool `build_kg_from_enriched_csv` TEPAT SATU KALI dengan:
-  - csv_path = path CSV
-  - max_rows = sesuai instruksi di pesan user (misalnya 1000).
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Format Parquet butuh pyarrow. Install dulu: pip install pyarrow") from e
+    return pyarrow
+
+
+def is_parquet_path(path: str) -> bool:
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def enriched_arrow_schema(columns=None):
+    pa = _require_pyarrow()
+    relation = pa.list_(pa.struct([
+        ("name", pa.string()), ("relation", pa.string()), ("note", pa.string()),
+    ]))
+    fields = []
+    for col in columns or STRATEGIC_COLUMNS:
+        if col in RELATION_COLUMNS:
+            fields.append(pa.field(col, relation))
+        elif col in LIST_COLUMNS:
+            fields.append(pa.field(col, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    return pa.schema(fields)
 
-Setelah tool dipanggil:
-- Balas singkat dalam bahasa Indonesia, misalnya:
-  "KG berhasil dibangun dari N baris."
-- Jangan mengarang data di luar hasil tool.
-""".strip()
 
-kg_rel_agent = create_react_agent(
-    llm,
-    tools=[build_kg_from_enriched_csv],
-    prompt=SYSTEM_PROMPT_A4,
-    name="relation_kg_agent",
-)
+def csv_to_parquet(csv_path: str, parquet_path: str, compression: str = "zstd") -> int:
+    """
+    Konversi CSV enriched -> Parquet. Kolom di luar STRATEGIC_COLUMNS ikut
+    disimpan sebagai string. Return jumlah baris.
+    """
+    import pandas as pd
+
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    df = pd.read_csv(csv_path, dtype=str)
+    columns = [c for c in STRATEGIC_COLUMNS if c in df.columns]
+    columns += [c for c in df.columns if c not in columns]
+
+    arrays = {}
+    for col in columns:
+        values = df[col].tolist()
+        if col in RELATION_COLUMNS:
+            arrays[col] = [relation_entries(v) for v in values]
+        elif col in LIST_COLUMNS:
+            arrays[col] = [None if _is_missing(v) else list_entries(v) for v in values]
+        else:
+            arrays[col] = [None if _is_missing(v) else v for v in values]
+
+    table = pa.Table.from_pydict(arrays, schema=enriched_arrow_schema(columns))
+    pq.write_table(
+        table,
+        parquet_path,
+        compression=compression,
+        use_dictionary=[c for c in columns if c not in RELATION_COLUMNS],
+    )
+    return table.num_rows
 
 
-def run_relation_kg_agent(csv_path: str, max_rows: int = 1000):
-    user_prompt = textwrap.dedent(f"""
-    Bangun knowledge graph Neo4j dari file CSV berikut:
+def parquet_to_csv(parquet_path: str, csv_path: str) -> int:
+    """
+    Konversi Parquet -> CSV enriched ("; " dan "Nama (relasi, catatan)").
+    Entri berformat standar kembali identik; entri yang rusak di CSV asal
+    (mis. kurung tidak ditutup) ditulis ulang dalam bentuk baku.
+    Return jumlah baris.
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    df = pq.read_table(parquet_path).to_pandas()
+    for col in df.columns:
+        if col in RELATION_COLUMNS:
+            df[col] = [
+                "; ".join(format_relation_entry(r) for r in relation_entries(v)) or None
+                for v in df[col]
+            ]
+        elif col in LIST_COLUMNS:
+            df[col] = [None if _is_missing(v) else "; ".join(list_entries(v)) for v in df[col]]
+    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    return len(df)
+
+
+def read_enriched_table(path: str, columns=None, max_rows: int = None, dtype=None):
+    """
+    Baca dataset enriched (CSV atau Parquet) sebagai DataFrame.
+    - columns: proyeksi kolom; kolom yang tidak ada di file dilewati.
+    - dtype: diteruskan ke pd.read_csv (Parquet sudah bertipe).
+    - Di Parquet, Pasangan/Keluarga/Jabatan/Pendidikan sudah berupa list
+      (pakai relation_entries / list_entries, tanpa parsing string).
+    - Nilai kosong kolom teks tetap NaN, sama seperti pd.read_csv.
+    """
+    import pandas as pd
+
+    if not is_parquet_path(path):
+        if columns is None:
+            return pd.read_csv(path, nrows=max_rows, dtype=dtype)
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda c: c in wanted, nrows=max_rows, dtype=dtype)
+
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    names = pf.schema_arrow.names
+    if columns is not None:
+        names = [c for c in names if c in set(columns)]
+    if max_rows is not None and max_rows < pf.metadata.num_rows:
+        batch = next(pf.iter_batches(batch_size=max(1, max_rows), columns=names), None)
+        df = batch.to_pandas().head(max_rows) if batch is not None else pd.DataFrame(columns=names)
+    else:
+        df = pf.read(columns=names).to_pandas()
+    return _parquet_nan(df)
 
-    {csv_path}
 
-    CSV ini memiliki kolom:
-    Nama,Dapil,Partai,Jabatan,Pendidikan,Pasangan,Keluarga
+def _parquet_nan(df):
+    # None/NA dari Arrow -> NaN, supaya sama dengan hasil pd.read_csv
+    for col in df.columns:
+        df[col] = df[col].astype(object).where(df[col].notna(), float("nan"))
+    return df
 
-    Panggil tool `build_kg_from_enriched_csv` dengan:
-    - csv_path = "{csv_path}"
-    - max_rows = {max_rows}
-    """)
-    state = kg_rel_agent.invoke(
-        {"messages": [{"role": "user", "content": user_prompt}]}
-    )
-    messages = state["messages"]
-    last_msg = messages[-1]
-    content = last_msg.content
 
-    if isinstance(content, list):
-        parts = []
-        for c in content:
-            if isinstance(c, dict) and c.get("type") == "text":
-                parts.append(c.get("text", ""))
-            else:
-                parts.append(str(c))
-        content_str = "\n".join(parts)
-    else:
-        content_str = str(content)
+# Baca dataset bertahap per N baris (0 = sekaligus); lihat iter_enriched_chunks
+CSV_CHUNK_ROWS = int(os.environ.get("CSV_CHUNK_ROWS", "0"))
 
-    print("\n===== HASIL AGENT 4 (RELATIONAL KG) =====\n")
-    print(content_str)
-    print("\n=========================================\n")
 
+def configure_chunking(chunk_rows: int = None):
+    global CSV_CHUNK_ROWS
+    if chunk_rows is not None:
+        CSV_CHUNK_ROWS = max(0, int(chunk_rows))
 
-# ==================================================
-# 13. TOOL & AGENT 5: QA NEO4J (BAHASA INDONESIA -> CYPHER)
-# ==================================================
 
-@tool
-def run_cypher_query(cypher: str) -> str:
+def iter_enriched_chunks(path: str, columns=None, max_rows: int = None, chunk_rows: int = None):
     """
-    Tool Agent 5:
-    Jalankan query Cypher ke Neo4j dan kembalikan hasilnya sebagai JSON string.
+    Seperti read_enriched_table, tapi bertahap: yield DataFrame per
+    `chunk_rows` baris (default CSV_CHUNK_ROWS), index baris tetap berurutan
+    lintas chunk. CSV dibaca dengan dtype str eksplisit (juga saat tidak
+    di-chunk) supaya tipe kolom tidak ditebak ulang (dan berbeda) di tiap
+    chunk. chunk_rows 0 = satu DataFrame utuh dari read_enriched_table.
     """
-    global driver
-    if driver is None:
-        raise RuntimeError("Neo4j driver belum diinisialisasi.")
+    import pandas as pd
 
-    with driver.session() as session:
-        result = session.run(cypher)
-        rows = [dict(r) for r in result]
+    chunk_rows = CSV_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    if not chunk_rows:
+        yield read_enriched_table(path, columns=columns, max_rows=max_rows, dtype=str)
+        return
 
-    return json.dumps(
-        {
-            "cypher": cypher,
-            "rows": rows,
-        },
-        ensure_ascii=False,
-    )
+    if not is_parquet_path(path):
+        wanted = None if columns is None else set(columns)
+        reader = pd.read_csv(
+            path,
+            usecols=None if wanted is None else (lambda c: c in wanted),
+            dtype=str,
+            chunksize=chunk_rows,
+            nrows=max_rows,
+        )
+        with reader:
+            yield from reader
+        return
 
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    names = pf.schema_arrow.names
+    if columns is not None:
+        names = [c for c in names if c in set(columns)]
+    offset = 0
+    for batch in pf.iter_batches(batch_size=chunk_rows, columns=names):
+        df = batch.to_pandas()
+        if max_rows is not None:
+            df = df.head(max_rows - offset)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+        if len(df):
+            yield _parquet_nan(df)
+        if max_rows is not None and offset >= max_rows:
+            return
+
+
+def convert_enriched_dataset(src: str, dst: str) -> int:
+    # Arah konversi ditentukan dari ekstensi: CSV -> Parquet atau Parquet -> CSV
+    if is_parquet_path(dst) and not is_parquet_path(src):
+        return csv_to_parquet(src, dst)
+    if is_parquet_path(src) and not is_parquet_path(dst):
+        return parquet_to_csv(src, dst)
+    raise ValueError("Konversi hanya CSV -> .parquet atau .parquet -> CSV")
 
-SYSTEM_PROMPT_A5 = """
-Kamu adalah Agent 5, asisten tanya-jawab untuk database graf Neo4j yang berisi data anggota DPR dan relasi keluarganya.
 
-Skema graf (ringkas):
+# ==================================================
+# 13. TOOL & AGENT 4: BANGUN RELASI NAMA–DAPIL–PARTAI–JABATAN–PENDIDIKAN–PASANGAN–KELUARGA
+# ==================================================
 
-Node:
-- (:Person {name, dapil, partai, jabatan_raw, pendidikan_raw, ...})
-- (:Dapil {name})
-- (:Party {name})
-- (:Position {name})
-- (:Education {name})
+KG_BATCH_SIZE = int(os.environ.get("KG_BATCH_SIZE", "200"))
+
+
+# --- Normalisasi Jabatan & Pendidikan ---------------------------------------
+# "Wakil Ketua Majelis Permusyawaratan Rakyat Republik Indonesia" dan
+# "Wakil Ketua MPR RI" harus jadi satu node Position, begitu juga "S-1
+# Universitas Gadjah Mada" dan "Universitas Gadjah Mada" untuk Education.
+# Teks asli tetap tersimpan di Person.jabatan_raw / pendidikan_raw.
+
+# Frasa resmi -> singkatan baku (urutan penting: yang lebih panjang dulu)
+POSITION_PHRASES = [
+    (r"Majelis Permusyawaratan Rakyat Republik Indonesia", "MPR RI"),
+    (r"Majelis Permusyawaratan Rakyat", "MPR"),
+    (r"Dewan Perwakilan Rakyat Daerah", "DPRD"),
+    (r"Dewan Perwakilan Rakyat Republik Indonesia", "DPR RI"),
+    (r"Dewan Perwakilan Rakyat", "DPR"),
+    (r"Dewan Perwakilan Daerah Republik Indonesia", "DPD RI"),
+    (r"Dewan Perwakilan Daerah", "DPD"),
+    (r"Republik Indonesia", "RI"),
+    (r"(DPR|MPR|DPD)\s*-\s*RI", r"\1 RI"),
+]
+
+# Nama utuh (setelah frasa di atas) -> nama kanonik
+POSITION_ALIASES = {
+    "DPR RI": ["Anggota DPR RI", "Anggota DPR", "DPR Republik Indonesia"],
+    "MPR RI": ["Anggota MPR RI"],
+    "DPD RI": ["Anggota DPD RI"],
+}
 
-Relasi penting:
-- (p:Person)-[:REPRESENTS]->(d:Dapil)
-- (p:Person)-[:MEMBER_OF]->(par:Party)
-- (p:Person)-[:HOLDS_POSITION]->(pos:Position)
-- (p:Person)-[:ALUMNI_OF]->(u:Education)
-- (p:Person)-[:SPOUSE_OF]->(s:Person)
-- (p:Person)-[:FAMILY_OF]->(f:Person)
-- (p:Person)-[:PARENT_OF]->(c:Person)   -- jika ada
-- (p:Person)-[:IN_LAW_OF]->(x:Person)   -- jika ada
+EDUCATION_ALIASES = {
+    "Universitas Indonesia": ["UI"],
+    "Universitas Gadjah Mada": ["UGM", "Universitas Gajah Mada"],
+    "Institut Teknologi Bandung": ["ITB"],
+    "Institut Pertanian Bogor": ["IPB", "IPB University"],
+    "Universitas Padjadjaran": ["Unpad"],
+    "Universitas Diponegoro": ["Undip"],
+    "Universitas Airlangga": ["Unair"],
+    "Universitas Hasanuddin": ["Unhas"],
+    "Universitas Sumatera Utara": ["USU"],
+    "Universitas Sebelas Maret": ["UNS"],
+    "Universitas Brawijaya": ["UB", "Unibraw"],
+    "Institut Pemerintahan Dalam Negeri": ["IPDN"],
+}
 
-TUGASMU:
-- Menerjemahkan pertanyaan dalam bahasa Indonesia menjadi query Cypher terhadap graf di atas.
-- SELALU panggil tool `run_cypher_query` TEPAT SATU KALI dengan parameter:
-  - cypher = string query Cypher yang kamu susun.
+# Periode jabatan di akhir: "(2009–2014)", "(2021–sekarang)", "periode 2024–2029"
+_PERIOD_SUFFIX = r"\s*(\(\s*\d{4}\s*[-–—]\s*(\d{4}|sekarang)\s*\)|periode\s+\d{4}\s*[-–—]\s*\d{4})$"
+# Jenjang di depan / tahun lulus di akhir: "S-1 Universitas X (2006)"
+_DEGREE_PREFIX = r"^[SD]\s*-?\s*[0-3]\.?\s+"
+_YEAR_SUFFIX = r"\s*\(\s*\d{4}\s*\)$"
 
-Langkah berpikir (di kepalamu, jangan ditulis eksplisit):
-1. Pahami maksud pertanyaan (misalnya: "siapa anggota DPR dari Lampung I yang punya pasangan dari partai berbeda?").
-2. Tentukan node/relasi yang relevan.
-3. Susun query Cypher yang valid dan efisien.
-4. Panggil tool `run_cypher_query` dengan query tersebut.
-5. Gunakan hasil tool (JSON) untuk membuat jawaban yang rapi.
 
-OUTPUT KE USER:
-- Tampilkan dulu query Cypher yang kamu gunakan dalam blok kode.
-- Setelah itu, jelaskan hasilnya dalam bahasa Indonesia yang jelas, berupa daftar/tabel ringkas:
-  - Jika hasil berupa daftar orang: sebutkan minimal name, partai, dapil.
-  - Jika hasil kosong, jelaskan bahwa tidak ditemukan data yang cocok.
-- Jangan menuliskan langkah-langkah berpikir internalmu.
-""".strip()
+class CanonicalNames:
+    """
+    Registry nama kanonik untuk satu jenis entitas (Position / Education):
+    frasa & alias dari kamus, lipat spasi + huruf besar/kecil ("model" dan
+    "Model" -> satu node). Nama tampilan tiap kunci: bentuk kanonik kamus jika
+    ada, selain itu varian terkecil (display_rank) dari semua varian yang
+    terlihat, jadi tidak bergantung urutan baris / penjadwalan thread selama
+    semua varian didaftarkan lebih dulu (register_canonical_names). Aman
+    dipakai dari banyak thread.
+    """
 
-qa_agent = create_react_agent(
-    llm,
-    tools=[run_cypher_query],
-    prompt=SYSTEM_PROMPT_A5,
-    name="cypher_qa_agent",
+    def __init__(self, aliases=None, phrases=(), strip_patterns=()):
+        import re
+
+        self._phrases = [(re.compile(rf"\b{p}\b", re.IGNORECASE), r) for p, r in phrases]
+        self._strip = [re.compile(p, re.IGNORECASE) for p in strip_patterns]
+        self._lock = threading.Lock()
+        self._fixed = {}
+        self._display = {}
+        self._aliases = {}
+        for canonical, variants in (aliases or {}).items():
+            self._fixed[self.key(canonical)] = canonical
+            for variant in variants:
+                self._aliases[self.key(variant)] = canonical
+
+    @staticmethod
+    def display_rank(text: str):
+        # Varian campuran huruf besar/kecil didahulukan dari HURUF BESAR / huruf kecil semua
+        return text.isupper(), text.islower(), text
+
+    def key(self, name: str) -> str:
+        return " ".join(str(name).split()).casefold()
+
+    def fold(self, name: str) -> str:
+        text = " ".join(str(name).split()).strip(" ;,.")
+        for pattern in self._strip:
+            text = pattern.sub("", text).strip(" ;,.")
+        for pattern, replacement in self._phrases:
+            text = pattern.sub(replacement, text)
+        return " ".join(text.split())
+
+    def canonical(self, name: str) -> str:
+        # "" jika kosong setelah dinormalisasi
+        text = self.fold(name)
+        if not text:
+            return ""
+        key = self.key(text)
+        text = self._aliases.get(key, text)
+        key = self.key(text)
+        if key in self._fixed:
+            return self._fixed[key]
+        with self._lock:
+            current = self._display.get(key)
+            if current is None or self.display_rank(text) < self.display_rank(current):
+                self._display[key] = current = text
+            return current
+
+    def canonical_list(self, names) -> list:
+        # Normalisasi + dedup dalam satu baris, urutan kemunculan dipertahankan
+        out = []
+        for name in names:
+            c = self.canonical(name)
+            if c and c not in out:
+                out.append(c)
+        return out
+
+
+POSITION_NAMES = CanonicalNames(
+    aliases=POSITION_ALIASES, phrases=POSITION_PHRASES, strip_patterns=[_PERIOD_SUFFIX]
+)
+EDUCATION_NAMES = CanonicalNames(
+    aliases=EDUCATION_ALIASES, strip_patterns=[_DEGREE_PREFIX, _YEAR_SUFFIX]
 )
 
 
-def run_agent5_qa(question: str):
+def register_canonical_names(path: str):
     """
-    Jalankan Agent 5 untuk satu pertanyaan bahasa Indonesia.
+    Daftarkan semua varian Jabatan & Pendidikan di dataset (CSV/Parquet, hanya
+    dua kolom itu, per chunk) sebelum record dibuat, supaya nama tampilan node
+    Position/Education sudah final untuk baris pertama sekalipun.
     """
-    state = qa_agent.invoke(
-        {"messages": [{"role": "user", "content": question}]}
-    )
-    messages = state["messages"]
-    last_msg = messages[-1]
-    content = last_msg.content
+    registries = {"Jabatan": POSITION_NAMES, "Pendidikan": EDUCATION_NAMES}
+    for df in iter_enriched_chunks(path, columns=list(registries)):
+        for col, registry in registries.items():
+            if col in df.columns:
+                for value in df[col]:
+                    registry.canonical_list(list_entries(value))
 
-    if isinstance(content, list):
-        parts = []
-        for c in content:
-            if isinstance(c, dict) and c.get("type") == "text":
-                parts.append(c.get("text", ""))
-            else:
-                parts.append(str(c))
-        content_str = "\n".join(parts)
-    else:
-        content_str = str(content)
 
-    print("\n===== HASIL AGENT 5 (QA NEO4J) =====\n")
-    print(content_str)
-    print("\n====================================\n")
+def kg_record_from_row(row):
+    """
+    Ubah satu baris CSV (Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga)
+    menjadi dict siap tulis ke KG. Return None jika Nama kosong.
+    """
+    nama = str(row.get("Nama", "")).strip()
+    if not nama:
+        return None
+
+    # Pasangan, format umum: "Jo Lin Sumbardi (istri)" dst.
+    spouses = [
+        {"name": rel["name"], "rel_label": relation_label(rel) or "pasangan"}
+        for rel in relation_entries(row.get("Pasangan", ""))
+    ]
 
+    # Keluarga lain -> FAMILY_OF (sederhana)
+    families = [
+        {"name": rel["name"], "note": relation_label(rel)}
+        for rel in relation_entries(row.get("Keluarga", ""))
+    ]
 
-# ==================================================
-# 14. MAIN: PILIH MODE (AGENT 1+2, 3, 4, 5)
-# ==================================================
+    return {
+        "nama": nama,
+        "dapil": str(row.get("Dapil", "")).strip(),
+        "partai": str(row.get("Partai", "")).strip(),
+        "jabatan": cell_text(row.get("Jabatan", "")).strip(),
+        "pendidikan": cell_text(row.get("Pendidikan", "")).strip(),
+        # Jabatan & pendidikan bisa banyak, dipisah ; (di Parquet sudah list);
+        # dinormalisasi ke nama kanonik & di-dedup per baris
+        "positions": POSITION_NAMES.canonical_list(list_entries(row.get("Jabatan", ""))),
+        "educations": EDUCATION_NAMES.canonical_list(list_entries(row.get("Pendidikan", ""))),
+        "spouses": spouses,
+        "families": families,
+    }
 
-if __name__ == "__main__":
-    mode = input(
-        "Pilih mode:\n"
-        "  1 = Jalankan Agent 1 + 2 (scrape Wikipedia + tulis Neo4j + update CSV)\n"
-        "  3 = Jalankan Agent 3 saja (analisis Strategic Marriage dari anggota_dpr_enriched.csv)\n"
-        "  4 = Jalankan Agent 4 (bangun relasi Nama–Dapil–Partai–Jabatan–Pendidikan–Pasangan–Keluarga ke Neo4j dari CSV)\n"
-        "  5 = Jalankan Agent 5 (tanya jawab ke Neo4j pakai bahasa Indonesia -> Cypher)\n"
-        "Masukkan pilihan (1/3/4/5): "
-    ).strip()
 
-    if mode == "1":
-        # Inisialisasi Neo4j driver global
-        driver = GraphDatabase.driver(
-            NEO4J_URI,
-            auth=(NEO4J_USER, NEO4J_PASSWORD),
-        )
-        try:
-            process_csv_with_agents_1_2(CSV_RAW_PATH, max_rows=1000)
-        finally:
-            driver.close()
+def _group_holders(records, field):
+    # [{name, holders: [nama, ...]}] untuk semua nilai `field` di batch, tanpa duplikat
+    holders = {}
+    for r in records:
+        for name in r[field]:
+            holders.setdefault(name, {})[r["nama"]] = None
+    return [{"name": name, "holders": list(names)} for name, names in holders.items()]
 
-    elif mode == "3":
-        # Hanya baca CSV yang sudah enriched, tidak scraping ulang, tidak token ekstraksi per orang
-        if not os.path.exists(CSV_ENRICHED_PATH):
-            print(f"⚠️ File {CSV_ENRICHED_PATH} tidak ditemukan. Pastikan sudah menjalankan mode 1 sebelumnya.")
-        else:
-            run_strategic_marriage_agent(CSV_ENRICHED_PATH)
 
-    elif mode == "4":
-        # Bangun KG relasi Nama–Dapil–Partai–Jabatan–Pendidikan–Pasangan–Keluarga
-        driver = GraphDatabase.driver(
-            NEO4J_URI,
-            auth=(NEO4J_USER, NEO4J_PASSWORD),
-        )
-        try:
-            # Kalau sudah ada enriched, pakai itu; kalau belum, fallback ke raw
-            if os.path.exists(CSV_ENRICHED_PATH):
-                csv_path = CSV_ENRICHED_PATH
-            else:
-                csv_path = CSV_RAW_PATH
-            print(f"📄 Menggunakan file CSV: {csv_path}")
-            run_relation_kg_agent(csv_path, max_rows=1000)
-        finally:
-            driver.close()
+def _write_kg_batch(tx, records):
+    """
+    Tulis satu batch record KG dalam satu transaksi (UNWIND per jenis relasi),
+    bukan satu round-trip per node/relasi.
+    """
+    run_statement(
+        tx,
+        "kg_person",
+        """
+        UNWIND $rows AS row
+        MERGE (p:Person {name: row.nama})
+        ON CREATE SET p.created_at = timestamp()
+        SET p.last_seen = timestamp(),
+            p.dapil = row.dapil,
+            p.partai = row.partai,
+            p.jabatan_raw = row.jabatan,
+            p.pendidikan_raw = row.pendidikan
+        """,
+        rows=records,
+    )
 
-    elif mode == "5":
-        # Mode QA: tanya jawab ke Neo4j dengan bahasa Indonesia
-        driver = GraphDatabase.driver(
-            NEO4J_URI,
-            auth=(NEO4J_USER, NEO4J_PASSWORD),
+    dapil_rows = [{"nama": r["nama"], "name": r["dapil"]} for r in records if r["dapil"]]
+    if dapil_rows:
+        run_statement(
+            tx,
+            "kg_dapil",
+            """
+            UNWIND $rows AS row
+            MERGE (d:Dapil {name: row.name})
+            WITH row, d
+            MATCH (p:Person {name: row.nama})
+            MERGE (p)-[:REPRESENTS]->(d)
+            """,
+            rows=dapil_rows,
         )
-        try:
-            print(
-                "\nMode Agent 5 (QA Neo4j).\n"
-                "Ketik pertanyaan dalam bahasa Indonesia tentang graf DPR.\n"
-                "Contoh: 'siapa anggota DPR dari Lampung I yang punya pasangan dari partai berbeda?'\n"
-                "Ketik 'exit' untuk keluar.\n"
+
+    party_rows = [{"nama": r["nama"], "name": r["partai"]} for r in records if r["partai"]]
+    if party_rows:
+        run_statement(
+            tx,
+            "kg_party",
+            """
+            UNWIND $rows AS row
+            MERGE (par:Party {name: row.name})
+            WITH row, par
+            MATCH (p:Person {name: row.nama})
+            MERGE (p)-[:MEMBER_OF]->(par)
+            """,
+            rows=party_rows,
+        )
+
+    # Dikelompokkan per Position/Education: tiap node di-MERGE sekali per batch
+    # ("DPR RI" dipegang ratusan orang), lalu relasinya per pemegang.
+    position_rows = _group_holders(records, "positions")
+    if position_rows:
+        run_statement(
+            tx,
+            "kg_position",
+            """
+            UNWIND $rows AS row
+            MERGE (pos:Position {name: row.name})
+            WITH row, pos
+            UNWIND row.holders AS nama
+            MATCH (p:Person {name: nama})
+            MERGE (p)-[:HOLDS_POSITION]->(pos)
+            """,
+            rows=position_rows,
+        )
+
+    education_rows = _group_holders(records, "educations")
+    if education_rows:
+        run_statement(
+            tx,
+            "kg_education",
+            """
+            UNWIND $rows AS row
+            MERGE (u:Education {name: row.name})
+            WITH row, u
+            UNWIND row.holders AS nama
+            MATCH (p:Person {name: nama})
+            MERGE (p)-[:ALUMNI_OF]->(u)
+            """,
+            rows=education_rows,
+        )
+
+    spouse_rows = [
+        {"nama": r["nama"], "name": s["name"], "rel_label": s["rel_label"]}
+        for r in records
+        for s in r["spouses"]
+    ]
+    if spouse_rows:
+        run_statement(
+            tx,
+            "kg_spouse",
+            """
+            UNWIND $rows AS row
+            MERGE (s:Person {name: row.name})
+            ON CREATE SET s.created_at = timestamp()
+            SET s.last_seen = timestamp()
+            WITH row, s
+            MATCH (p:Person {name: row.nama})
+            MERGE (p)-[r:SPOUSE_OF]->(s)
+            SET r.relation_label = row.rel_label,
+                r.created_at = coalesce(r.created_at, timestamp()),
+                r.last_seen = timestamp()
+            """,
+            rows=spouse_rows,
+        )
+
+    family_rows = [
+        {"nama": r["nama"], "name": f["name"], "note": f["note"]}
+        for r in records
+        for f in r["families"]
+    ]
+    if family_rows:
+        run_statement(
+            tx,
+            "kg_family",
+            """
+            UNWIND $rows AS row
+            MERGE (f:Person {name: row.name})
+            ON CREATE SET f.created_at = timestamp()
+            SET f.last_seen = timestamp()
+            WITH row, f
+            MATCH (p:Person {name: row.nama})
+            MERGE (p)-[r:FAMILY_OF]->(f)
+            SET r.note = row.note,
+                r.created_at = coalesce(r.created_at, timestamp()),
+                r.last_seen = timestamp()
+            """,
+            rows=family_rows,
+        )
+
+
+def write_kg_records(graph, records, batch_size: int = KG_BATCH_SIZE):
+    """
+    Tulis record KG ke Neo4j, `batch_size` orang per transaksi.
+    """
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(records), batch_size):
+        graph.write_kg_batch(records[start:start + batch_size])
+    get_kinship_index.cache_clear()
+
+    if DERIVED_KINSHIP_ENABLED:
+        update_derived_kinship(graph, kg_records_touched(records))
+
+
+def kg_records_touched(records) -> list:
+    # Kedua ujung SPOUSE_OF dari CSV (relasi dasar untuk mertua & ipar)
+    names = set()
+    for r in records:
+        if r["spouses"]:
+            names.add(r["nama"])
+            names.update(s["name"] for s in r["spouses"])
+    return sorted(names)
+
+
+# --- Sinkronisasi berbasis diff (build-kg --sync) ----------------------------
+# Hash isi record per orang disimpan di graf (Person.kg_hash) dan di manifest
+# lokal. Run berikutnya hanya menulis orang yang baru/berubah/terhapus, dan
+# relasi yang sudah tidak ada di CSV dihapus. Manifest hanya dipakai jika
+# sync_id-nya sama dengan yang tersimpan di graf (node KgSync, diganti tiap
+# sync yang menulis); graf yang dibuat ulang (volume direset, neo4j-admin
+# import, file SQLite dihapus) tidak punya sync_id itu, maka hash dibaca dari graf.
+
+KG_SYNC_MANIFEST_PATH = os.environ.get("KG_SYNC_MANIFEST_PATH", "kg_sync_manifest.json")
+
+# Relasi keluar dari Person yang sepenuhnya ditentukan oleh baris CSV-nya
+KG_SYNC_REL_TYPES = ["REPRESENTS", "MEMBER_OF", "HOLDS_POSITION", "ALUMNI_OF", "SPOUSE_OF", "FAMILY_OF"]
+
+
+def kg_record_hash(records) -> str:
+    """
+    Hash isi semua record satu orang (Nama bisa muncul di >1 baris CSV;
+    semuanya ditulis ke node Person yang sama).
+    """
+    import hashlib
+
+    payload = json.dumps(records, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def group_kg_records(records) -> dict:
+    # nama -> [record, ...] dengan urutan CSV dipertahankan
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["nama"], []).append(record)
+    return grouped
+
+
+def _kg_keep_targets(records) -> dict:
+    # Per tipe relasi: nama target yang masih ada di CSV untuk orang ini
+    keep = {t: set() for t in KG_SYNC_REL_TYPES}
+    for r in records:
+        if r["dapil"]:
+            keep["REPRESENTS"].add(r["dapil"])
+        if r["partai"]:
+            keep["MEMBER_OF"].add(r["partai"])
+        keep["HOLDS_POSITION"].update(r["positions"])
+        keep["ALUMNI_OF"].update(r["educations"])
+        keep["SPOUSE_OF"].update(s["name"] for s in r["spouses"])
+        keep["FAMILY_OF"].update(f["name"] for f in r["families"])
+    return {t: sorted(names) for t, names in keep.items()}
+
+
+def load_kg_manifest(path: str = KG_SYNC_MANIFEST_PATH, target: str = None, sync_id: str = None):
+    """
+    Return dict nama -> hash, atau None jika manifest tidak ada / untuk
+    database lain / sync_id-nya tidak sama dengan sync_id di graf (maka hash
+    dibaca dari graf).
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Manifest sync {path} tidak bisa dibaca ({e}), pakai hash dari graf.")
+        return None
+    if manifest.get("graph") != (target or NEO4J_URI):
+        return None
+    if not sync_id or manifest.get("sync_id") != sync_id:
+        return None
+    return dict(manifest.get("hashes", {}))
+
+
+def save_kg_manifest(hashes: dict, path: str = KG_SYNC_MANIFEST_PATH, target: str = None,
+                     sync_id: str = None):
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": 2, "graph": target or NEO4J_URI, "sync_id": sync_id, "hashes": hashes},
+            f, ensure_ascii=False, indent=0, sort_keys=True,
+        )
+    os.replace(tmp_path, path)
+
+
+def _sync_kg_batch(tx, grouped, hashes):
+    """
+    Satu transaksi sync: tulis ulang orang yang berubah, hapus relasi yang
+    tidak lagi ada di CSV, lalu simpan hash barunya di node Person.
+    """
+    records = [r for records in grouped.values() for r in records]
+    _write_kg_batch(tx, records)
+
+    rows = [
+        {"nama": nama, "keep": _kg_keep_targets(person_records), "hash": hashes[nama]}
+        for nama, person_records in grouped.items()
+    ]
+    run_statement(
+        tx,
+        "kg_sync_prune",
+        f"""
+        UNWIND $rows AS row
+        MATCH (p:Person {{name: row.nama}})-[r:{'|'.join(KG_SYNC_REL_TYPES)}]->(x)
+        WHERE NOT x.name IN row.keep[type(r)]
+        DELETE r
+        """,
+        rows=rows,
+    )
+    run_statement(
+        tx,
+        "kg_sync_hash",
+        """
+        UNWIND $rows AS row
+        MATCH (p:Person {name: row.nama})
+        SET p.kg_hash = row.hash
+        """,
+        rows=rows,
+    )
+
+
+def _delete_kg_rows(tx, names):
+    """
+    Orang yang barisnya hilang dari CSV: relasi & properti dari CSV dihapus;
+    node Person ikut dihapus jika tidak punya relasi lain (mis. dari Agent 2).
+    """
+    run_statement(
+        tx,
+        "kg_sync_delete",
+        f"""
+        UNWIND $names AS nama
+        MATCH (p:Person {{name: nama}})
+        OPTIONAL MATCH (p)-[r:{'|'.join(KG_SYNC_REL_TYPES)}]->()
+        DELETE r
+        WITH DISTINCT p
+        REMOVE p.kg_hash, p.dapil, p.partai, p.jabatan_raw, p.pendidikan_raw
+        WITH p
+        WHERE NOT (p)--()
+        DELETE p
+        """,
+        names=names,
+    )
+
+
+def _delete_kg_orphans(tx):
+    # Dapil/Party/Position/Education yang tidak lagi dipakai siapa pun
+    run_statement(
+        tx,
+        "kg_sync_orphans",
+        """
+        MATCH (n)
+        WHERE (n:Dapil OR n:Party OR n:Position OR n:Education) AND NOT (n)--()
+        DELETE n
+        """,
+    )
+
+
+def sync_kg_records(
+    graph,
+    records,
+    batch_size: int = KG_BATCH_SIZE,
+    manifest_path: str = KG_SYNC_MANIFEST_PATH,
+    detect_deleted: bool = True,
+) -> dict:
+    """
+    Tulis hanya orang yang baru/berubah (hash berbeda) dan hapus orang yang
+    hilang dari CSV. Return statistik {added, changed, deleted, unchanged}.
+    detect_deleted=False jika `records` hanya sebagian CSV (mis. --max-rows).
+    """
+    grouped = group_kg_records(records)
+    hashes = {nama: kg_record_hash(person_records) for nama, person_records in grouped.items()}
+
+    target = graph.target()
+    sync_id = graph.read_sync_id()
+    previous = load_kg_manifest(manifest_path, target, sync_id)
+    if previous is None:
+        previous = graph.read_kg_hashes()
+
+    changed = [nama for nama, h in hashes.items() if previous.get(nama) != h]
+    deleted = [nama for nama in previous if nama not in hashes] if detect_deleted else []
+    stats = {
+        "added": sum(1 for nama in changed if nama not in previous),
+        "changed": sum(1 for nama in changed if nama in previous),
+        "deleted": len(deleted),
+        "unchanged": len(hashes) - len(changed),
+    }
+
+    # sync_id baru ditulis ke graf sebelum batch pertama; manifest diperbarui
+    # per batch yang sudah commit, jadi run yang gagal di tengah jalan cukup
+    # diulang (jika manifest tidak sempat disimpan, sync_id-nya tidak cocok lagi).
+    if changed or deleted or not sync_id:
+        import uuid
+
+        sync_id = uuid.uuid4().hex
+        graph.write_sync_id(sync_id)
+    current = dict(previous)
+    batch_size = max(1, int(batch_size))
+    try:
+        for start in range(0, len(changed), batch_size):
+            names = changed[start:start + batch_size]
+            graph.sync_kg_batch({nama: grouped[nama] for nama in names}, hashes)
+            current.update((nama, hashes[nama]) for nama in names)
+        for start in range(0, len(deleted), batch_size):
+            names = deleted[start:start + batch_size]
+            graph.delete_kg_rows(names)
+            for nama in names:
+                current.pop(nama, None)
+        if changed or deleted:
+            graph.delete_kg_orphans()
+            get_kinship_index.cache_clear()
+    finally:
+        save_kg_manifest(current, manifest_path, target, sync_id)
+
+    if DERIVED_KINSHIP_ENABLED and (changed or deleted):
+        # SPOUSE_OF lama yang dipangkas ditemukan lewat orangnya (ada di changed/deleted)
+        touched = set(changed) | set(deleted)
+        touched.update(kg_records_touched([r for nama in changed for r in grouped[nama]]))
+        update_derived_kinship(graph, touched)
+
+    for key, value in stats.items():
+        METRICS.inc("kg_sync_persons_total", value, status=key)
+    return stats
+
+
+# --- Dominasi partai per Dapil (agregat yang dimaterialisasi) ----------------
+# Jumlah kursi & pangsa per (Dapil, Partai) dan konsentrasi klaster keluarga
+# per Dapil dihitung dengan pandas groupby dari record CSV, lalu disimpan
+# sebagai properti node Dapil. Pertanyaan "partai apa yang dominan di Dapil X"
+# cukup membaca satu node. Hanya Dapil yang agregatnya berubah yang ditulis
+# (hash di Dapil.dominance_hash).
+
+DAPIL_DOMINANCE_PROPS = [
+    "seats", "parties", "party_seats", "party_shares", "top_party", "top_party_share",
+    "party_hhi", "family_seats", "family_clusters", "top_family", "top_family_seats",
+    "top_family_share", "family_hhi", "dominance_hash",
+]
+
+
+class DapilDominanceAggregator:
+    """
+    Agregat berjalan untuk dominasi per Dapil: daftar kursi (nama, dapil,
+    partai) + union-find klaster keluarga atas Pasangan & Keluarga (kerabat
+    non-anggota ikut jadi penghubung). Bisa diisi per chunk record, jadi
+    record KG lengkap tidak perlu disimpan.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.members = []  # (nama, dapil, partai)
+
+    def find(self, x):
+        parent = self.parent
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def add(self, records):
+        for r in records:
+            root = self.find(r["nama"])
+            for rel in r["spouses"] + r["families"]:
+                other = self.find(rel["name"])
+                if other != root:
+                    self.parent[other] = root
+            # Dapil/partai berulang di banyak baris -> intern supaya tidak disimpan berkali-kali
+            self.members.append((r["nama"], sys.intern(r["dapil"]), sys.intern(r["partai"])))
+        return self
+
+    def clusters(self) -> dict:
+        # Nama anggota -> wakil klaster (nama anggota terkecil secara abjad di klaster itu)
+        members = sorted({m[0] for m in self.members})
+        representative = {}
+        for nama in members:
+            representative.setdefault(self.find(nama), nama)
+        return {nama: representative[self.find(nama)] for nama in members}
+
+
+def dominance_aggregator(records) -> DapilDominanceAggregator:
+    if isinstance(records, DapilDominanceAggregator):
+        return records
+    return DapilDominanceAggregator().add(records)
+
+
+def family_clusters(records) -> dict:
+    """
+    Klaster keluarga lewat union-find atas Pasangan & Keluarga. Return nama
+    anggota -> wakil klaster. records = list record KG atau DapilDominanceAggregator.
+    """
+    return dominance_aggregator(records).clusters()
+
+
+def party_dominance_tables(records):
+    """
+    Return (members, party, family): DataFrame anggota (nama, dapil, partai,
+    family) dan tabel agregat per (dapil, partai) / (dapil, family) berisi
+    seats & share. Satu kursi = satu pasangan (nama, dapil) unik.
+    """
+    import pandas as pd
+
+    aggregator = dominance_aggregator(records)
+    members = pd.DataFrame(aggregator.members, columns=["nama", "dapil", "partai"])
+    members = members.replace({"dapil": {"nan": ""}, "partai": {"nan": ""}})
+    members = members[members["dapil"] != ""].drop_duplicates(["nama", "dapil"])
+    members["family"] = members["nama"].map(aggregator.clusters())
+    seats = members.groupby("dapil").size()
+
+    def shares(keys):
+        table = members.groupby(["dapil", keys]).size().rename("seats").reset_index()
+        table["share"] = table["seats"] / table["dapil"].map(seats)
+        return table.sort_values(["dapil", "seats", keys], ascending=[True, False, True])
+
+    party = shares("partai")
+    family = shares("family")
+    cluster_size = members.groupby("family")["nama"].nunique()
+    family["multi"] = family["family"].map(cluster_size) > 1
+    return members, party[party["partai"] != ""], family
+
+
+def dapil_dominance_rows(records) -> dict:
+    """
+    Dapil -> properti agregat (lihat DAPIL_DOMINANCE_PROPS), siap ditulis ke node Dapil.
+    """
+    import hashlib
+
+    members, party, family = party_dominance_tables(records)
+    seats = members.groupby("dapil").size()
+    party_groups = dict(tuple(party.groupby("dapil", sort=False)))
+    family_groups = dict(tuple(family.groupby("dapil", sort=False)))
+
+    rows = {}
+    for dapil, total in seats.items():
+        p = party_groups.get(dapil)
+        f = family_groups[dapil]
+        dynasties = f[f["multi"]]
+        props = {
+            "seats": int(total),
+            "parties": [] if p is None else p["partai"].tolist(),
+            "party_seats": [] if p is None else [int(x) for x in p["seats"]],
+            "party_shares": [] if p is None else [round(float(x), 4) for x in p["share"]],
+            "top_party": None if p is None else p["partai"].iloc[0],
+            "top_party_share": None if p is None else round(float(p["share"].iloc[0]), 4),
+            "party_hhi": None if p is None else round(float((p["share"] ** 2).sum()), 4),
+            # Kursi yang dipegang anggota dari klaster keluarga berisi >1 anggota DPR
+            "family_seats": int(dynasties["seats"].sum()),
+            "family_clusters": int(len(dynasties)),
+            "top_family": dynasties["family"].iloc[0] if len(dynasties) else None,
+            "top_family_seats": int(dynasties["seats"].iloc[0]) if len(dynasties) else 0,
+            "top_family_share": round(float(dynasties["share"].iloc[0]), 4) if len(dynasties) else 0.0,
+            "family_hhi": round(float((f["share"] ** 2).sum()), 4),
+        }
+        payload = json.dumps(props, ensure_ascii=False, sort_keys=True)
+        props["dominance_hash"] = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        rows[dapil] = props
+    return rows
+
+
+def update_party_dominance(graph, records, batch_size: int = KG_BATCH_SIZE) -> dict:
+    """
+    Hitung agregat dari `records` (seluruh CSV; list record KG atau
+    DapilDominanceAggregator) dan tulis Dapil yang
+    berubah; Dapil yang tidak lagi punya anggota dikosongkan agregatnya.
+    Return {"dapil": jumlah Dapil, "updated": jumlah yang ditulis}.
+    """
+    with PROFILER.stage("party_dominance"):
+        rows = dapil_dominance_rows(records)
+
+    previous = {
+        name: value
+        for (_, name), value in graph.read_node_property("dominance_hash", ["Dapil"]).items()
+    }
+
+    updates = [
+        {"name": dapil, "props": props}
+        for dapil, props in rows.items()
+        if previous.get(dapil) != props["dominance_hash"]
+    ]
+    updates += [
+        {"name": dapil, "props": dict.fromkeys(DAPIL_DOMINANCE_PROPS)}
+        for dapil in previous
+        if dapil not in rows
+    ]
+
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(updates), batch_size):
+        graph.set_node_properties("Dapil", [
+            {"name": u["name"], **u["props"]} for u in updates[start:start + batch_size]
+        ])
+    return {"dapil": len(rows), "updated": len(updates)}
+
+
+def build_kg_from_enriched_csv(
+    csv_path: str, max_rows: int = 1000, batch_size: int = KG_BATCH_SIZE, sync: bool = False
+) -> str:
+    """
+    Tool Agent 4:
+    - Baca CSV (atau .parquet) yang berisi kolom:
+      Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga
+    - Bangun node & relasi dasar di Neo4j:
+      (Person)-[:REPRESENTS]->(Dapil)
+      (Person)-[:MEMBER_OF]->(Party)
+      (Person)-[:HOLDS_POSITION]->(Position)
+      (Person)-[:ALUMNI_OF]->(Education)
+      (Person)-[:SPOUSE_OF]->(Person)
+      (Person)-[:FAMILY_OF]->(Person)
+    - Ditulis per batch (`batch_size` baris per transaksi).
+    - sync=True: hanya orang yang baru/berubah/terhapus sejak run sebelumnya
+      yang ditulis (hash per orang), relasi yang sudah hilang dari CSV dihapus.
+    """
+    # CSV_CHUNK_ROWS > 0: dibaca & (tanpa sync) ditulis per chunk. Yang
+    # disimpan lintas chunk hanya agregat berjalan untuk Dapil; sync tetap
+    # butuh semua record per orang untuk hash & diff.
+    records, rows_read, truncated = [], 0, False
+    dominance = DapilDominanceAggregator()
+    # Dibaca max_rows + 1 baris: baris ekstra hanya penanda bahwa CSV memang
+    # lebih panjang dari max_rows (CSV dengan tepat max_rows baris = lengkap)
+    limit = None if max_rows is None else max_rows + 1
+    register_canonical_names(csv_path)
+    for df in iter_enriched_chunks(csv_path, columns=STRATEGIC_COLUMNS, max_rows=limit):
+        if max_rows is not None and len(df) and df.index[-1] >= max_rows:
+            truncated = True
+            df = df[df.index < max_rows]
+        rows_read += len(df)
+        with PROFILER.stage("kg_records"):
+            chunk = []
+            for _, row in df.iterrows():
+                record = kg_record_from_row(row)
+                if record is not None:
+                    chunk.append(record)
+        if sync:
+            records.extend(chunk)
+        else:
+            write_kg_records(get_driver(), chunk, batch_size=batch_size)
+            dominance.add(chunk)
+
+    # Agregat per Dapil hanya sah jika seluruh CSV terbaca
+    complete = not truncated
+    if sync:
+        # Jika CSV dipotong max_rows: orang di luar potongan bukan berarti terhapus,
+        # dan orang yang barisnya juga ada di luar potongan baru bisa di-hash
+        # lengkap pada run penuh.
+        if not complete:
+            partial = {
+                str(n).strip()
+                for rest in iter_enriched_chunks(csv_path, columns=["Nama"])
+                for n in rest["Nama"][rest.index >= rows_read]
+            }
+            records = [r for r in records if r["nama"] not in partial]
+        stats = sync_kg_records(get_driver(), records, batch_size=batch_size, detect_deleted=complete)
+        message = (
+            f"Sinkronisasi KG dari {rows_read} baris di {csv_path}: "
+            f"{stats['added']} baru, {stats['changed']} berubah, "
+            f"{stats['deleted']} dihapus, {stats['unchanged']} tidak berubah"
+        )
+    else:
+        message = f"Berhasil membangun KG dari {rows_read} baris di {csv_path}"
+
+    if complete:
+        info = update_party_dominance(get_driver(), records if sync else dominance, batch_size=batch_size)
+        message += f"; dominasi partai: {info['updated']} dari {info['dapil']} Dapil diperbarui"
+    return message
+
+
+SYSTEM_PROMPT_A4 = """
+Kamu adalah agen pembangun knowledge graph (Agent 4) dari data CSV anggota DPR.
+
+Tugas:
+- Menerima path file CSV yang berisi kolom:
+  Nama, Dapil, Partai, Jabatan, Pendidikan, Pasangan, Keluarga.
+- PANGGIL tool `build_kg_from_enriched_csv` TEPAT SATU KALI dengan:
+  - csv_path = path CSV
+  - max_rows = sesuai instruksi di pesan user (misalnya 1000).
+  - sync = sesuai instruksi di pesan user (true = hanya tulis baris yang berubah).
+
+Setelah tool dipanggil:
+- Balas singkat dalam bahasa Indonesia, misalnya:
+  "KG berhasil dibangun dari N baris."
+- Jangan mengarang data di luar hasil tool.
+""".strip()
+
+
+@lru_cache(maxsize=None)
+def get_kg_rel_agent():
+    from langgraph.prebuilt import create_react_agent
+
+    return create_react_agent(
+        get_llm(),
+        tools=[_as_tool(build_kg_from_enriched_csv)],
+        prompt=SYSTEM_PROMPT_A4,
+        name="relation_kg_agent",
+    )
+
+
+def run_relation_kg_agent(csv_path: str, max_rows: int = 1000, sync: bool = False):
+    user_prompt = textwrap.dedent(f"""
+    Bangun knowledge graph Neo4j dari file CSV berikut:
+
+    {csv_path}
+
+    CSV ini memiliki kolom:
+    Nama,Dapil,Partai,Jabatan,Pendidikan,Pasangan,Keluarga
+
+    Panggil tool `build_kg_from_enriched_csv` dengan:
+    - csv_path = "{csv_path}"
+    - max_rows = {max_rows}
+    - sync = {"true" if sync else "false"}
+    """)
+    state = invoke_agent(
+        get_kg_rel_agent(),
+        {"messages": [{"role": "user", "content": user_prompt}]},
+    )
+    content_str = agent_output_text(state)
+
+    print("\n===== HASIL AGENT 4 (RELATIONAL KG) =====\n")
+    print(content_str)
+    print("\n=========================================\n")
+
+
+# ==================================================
+# 14. TOOL & AGENT 5: QA NEO4J (BAHASA INDONESIA -> CYPHER)
+# ==================================================
+
+def run_cypher_query(cypher: str) -> str:
+    """
+    Tool Agent 5:
+    Jalankan query Cypher ke Neo4j dan kembalikan hasilnya sebagai JSON string.
+    """
+    graph = get_driver()
+    if not graph.supports_cypher:
+        return json.dumps(
+            {
+                "cypher": cypher,
+                "rows": [],
+                "error": f"Backend graf '{graph.name}' tidak mendukung Cypher; "
+                         "Agent 5 butuh Neo4j (--backend neo4j).",
+            },
+            ensure_ascii=False,
+        )
+
+    rows = graph.run_cypher(cypher)
+    return json.dumps(
+        {
+            "cypher": cypher,
+            "rows": rows,
+        },
+        ensure_ascii=False,
+    )
+
+
+SYSTEM_PROMPT_A5 = """
+Kamu adalah Agent 5, asisten tanya-jawab untuk database graf Neo4j yang berisi data anggota DPR dan relasi keluarganya.
+
+Skema graf (ringkas):
+
+Node:
+- (:Person {name, dapil, partai, jabatan_raw, pendidikan_raw, pagerank, degree, betweenness, ...})
+- (:Dapil {name, seats, parties, party_seats, party_shares, top_party, top_party_share, party_hhi,
+          family_seats, family_clusters, top_family, top_family_seats, top_family_share, family_hhi})
+- (:Party {name, pagerank, degree, betweenness})
+- (:Position {name})    -- nama kanonik singkat, mis. "DPR RI", "Wakil Ketua MPR RI" (bukan nama resmi panjang)
+- (:Education {name})   -- nama kanonik tanpa jenjang/tahun, mis. "Universitas Gadjah Mada"
+
+Relasi penting:
+- (p:Person)-[:REPRESENTS]->(d:Dapil)
+- (p:Person)-[:MEMBER_OF]->(par:Party)
+- (p:Person)-[:HOLDS_POSITION]->(pos:Position)
+- (p:Person)-[:ALUMNI_OF]->(u:Education)
+- (p:Person)-[:SPOUSE_OF]->(s:Person)
+- (p:Person)-[:FAMILY_OF]->(f:Person)
+- (p:Person)-[:PARENT_OF]->(c:Person)   -- jika ada
+- (p:Person)-[:IN_LAW_OF]->(x:Person)   -- jika ada
+
+Relasi turunan (sudah dihitung, pakai ini alih-alih path panjang [*2..]):
+- (g:Person)-[:GRANDPARENT_OF]->(c:Person)     -- kakek/nenek -> cucu
+- (m:Person)-[:PARENT_IN_LAW_OF]->(x:Person)   -- mertua -> menantu
+- (a:Person)-[:SIBLING_IN_LAW_OF]-(b:Person)   -- ipar, tanpa arah
+  Properti: derived = true, rule, via = [nama perantara]
+
+Proyeksi orang–orang (dihitung dari matriks insiden, hanya top-k tetangga terkuat per orang):
+- (a:Person)-[:CO_ALUMNI]-(b:Person)     -- pernah di institusi pendidikan yang sama, tanpa arah
+- (a:Person)-[:CO_POSITION]-(b:Person)   -- memegang jabatan yang sama, tanpa arah
+  Properti: weight (makin besar makin kuat), shared_count, shared = [nama institusi]
+  Institusi yang sangat umum (mis. "DPR RI") tidak dihitung.
+Contoh "anggota yang satu kampus dan satu partai":
+  MATCH (a:Person)-[r:CO_ALUMNI]-(b:Person)
+  WHERE a.name < b.name AND a.partai = b.partai
+  RETURN a.name, b.name, a.partai, r.shared ORDER BY r.weight DESC LIMIT 20
+
+Skor pengaruh (dihitung berkala atas graf kekerabatan + partai, sudah ter-index):
+- pagerank    -- pengaruh jaringan (rata-rata 1; makin besar makin berpengaruh)
+- degree      -- jumlah relasi keluarga + partai langsung
+- betweenness -- seberapa sering orang ini jadi "jembatan" antar keluarga/partai (0..1)
+Untuk "siapa paling berpengaruh di partai X", pakai properti ini, jangan hitung ulang:
+  MATCH (p:Person)-[:MEMBER_OF]->(:Party {name: "X"})
+  WHERE p.pagerank IS NOT NULL
+  RETURN p.name, p.dapil, p.pagerank, p.degree ORDER BY p.pagerank DESC LIMIT 10
+
+Agregat per Dapil (sudah dihitung dari seluruh data, jangan agregasi ulang REPRESENTS/MEMBER_OF):
+- seats; parties / party_seats / party_shares  -- list sejajar, urut kursi terbanyak
+- top_party, top_party_share, party_hhi        -- partai dominan & indeks konsentrasi (0..1)
+- family_seats, family_clusters                -- kursi milik klaster keluarga berisi >1 anggota DPR
+- top_family (nama wakil klaster), top_family_seats, top_family_share, family_hhi
+Contoh "partai apa yang dominan di Dapil X":
+  MATCH (d:Dapil {name: "X"}) RETURN d.top_party, d.top_party_share, d.parties, d.party_seats
+
+TUGASMU:
+- Menerjemahkan pertanyaan dalam bahasa Indonesia menjadi query Cypher terhadap graf di atas.
+- SELALU panggil tool `run_cypher_query` TEPAT SATU KALI dengan parameter:
+  - cypher = string query Cypher yang kamu susun.
+- KECUALI untuk pertanyaan "bagaimana A berhubungan/bersaudara dengan B?": jangan pakai
+  shortestPath, panggil tool `find_kinship_path` TEPAT SATU KALI (person_a, person_b) dan
+  jelaskan `chain`-nya, mis. "istri → ayah" = B adalah ayah dari istri A.
+- KECUALI juga untuk detail biografi yang tidak ada di graf (riwayat karier, tempat/tanggal lahir,
+  organisasi, kasus, dsb.): panggil tool `search_biographies` (query, person = nama jika disebut)
+  dan jawab HANYA dari potongan teks `hits`, sebutkan `url` sumbernya. Jika hasilnya berisi `error`
+  (index biografi kosong), katakan bahwa biografi belum tersedia beserta alasannya; jangan mengarang.
+
+Langkah berpikir (di kepalamu, jangan ditulis eksplisit):
+1. Pahami maksud pertanyaan (misalnya: "siapa anggota DPR dari Lampung I yang punya pasangan dari partai berbeda?").
+2. Tentukan node/relasi yang relevan.
+3. Susun query Cypher yang valid dan efisien.
+4. Panggil tool `run_cypher_query` dengan query tersebut.
+5. Gunakan hasil tool (JSON) untuk membuat jawaban yang rapi.
+
+OUTPUT KE USER:
+- Tampilkan dulu query Cypher yang kamu gunakan dalam blok kode.
+- Setelah itu, jelaskan hasilnya dalam bahasa Indonesia yang jelas, berupa daftar/tabel ringkas:
+  - Jika hasil berupa daftar orang: sebutkan minimal name, partai, dapil.
+  - Jika hasil kosong, jelaskan bahwa tidak ditemukan data yang cocok.
+- Jangan menuliskan langkah-langkah berpikir internalmu.
+""".strip()
+
+
+@lru_cache(maxsize=None)
+def get_qa_agent():
+    from langgraph.prebuilt import create_react_agent
+
+    return create_react_agent(
+        get_llm(),
+        tools=[_as_tool(run_cypher_query), _as_tool(find_kinship_path), _as_tool(search_biographies)],
+        prompt=SYSTEM_PROMPT_A5,
+        name="cypher_qa_agent",
+    )
+
+
+def run_agent5_qa(question: str):
+    """
+    Jalankan Agent 5 untuk satu pertanyaan bahasa Indonesia.
+    """
+    state = invoke_agent(
+        get_qa_agent(),
+        {"messages": [{"role": "user", "content": question}]},
+    )
+    content_str = agent_output_text(state)
+
+    print("\n===== HASIL AGENT 5 (QA NEO4J) =====\n")
+    print(content_str)
+    print("\n====================================\n")
+
+
+# Kompatibilitas: `Keluarga_v2.llm`, `Keluarga_v2.family_agent`, dst. tetap bisa
+# diakses sebagai atribut modul, tapi baru dibangun saat pertama kali diakses.
+_LAZY_ATTRS = {
+    "llm": get_llm,
+    "family_agent": get_family_agent,
+    "kg_agent": get_kg_agent,
+    "strategic_agent": get_strategic_agent,
+    "kg_rel_agent": get_kg_rel_agent,
+    "qa_agent": get_qa_agent,
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
+
+
+# ==================================================
+# 15. PIPELINE STREAMING: AGENT 1 -> NEO4J WRITER + ANALITIK
+# ==================================================
+
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "64"))
+PIPELINE_FLUSH_INTERVAL = 2.0  # detik; batch Neo4j di-flush jika antrean sepi selama ini
+
+_PIPELINE_DONE = object()
+
+
+def _pipeline_writer_stage(in_queue, graph, batch_size, stats, dominance):
+    """
+    Konsumen 1: tulis relasi keluarga (hasil Agent 1) + record KG ke Neo4j per batch.
+    Batch di-flush saat penuh atau saat antrean sepi, supaya orang yang sudah
+    diekstrak tidak menunggu terlalu lama sebelum masuk graf. Record yang
+    lewat juga masuk agregat dominasi Dapil (`dominance`).
+    """
+    import queue
+
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        dominance.add([item["record"] for item in batch if item["record"] is not None])
+        try:
+            for item in batch:
+                if item["families"]:
+                    write_family_to_neo4j(
+                        graph, item["nama"], item["families"], item["source_url"]
+                    )
+            write_kg_records(graph, [item["record"] for item in batch], batch_size=batch_size)
+            stats["written"] += len(batch)
+        except Exception as e:
+            print(f"  ⚠️ Gagal tulis batch ({len(batch)} orang) ke Neo4j: {e}")
+            stats["write_errors"] += len(batch)
+        batch.clear()
+
+    while True:
+        try:
+            item = in_queue.get(timeout=PIPELINE_FLUSH_INTERVAL)
+        except queue.Empty:
+            flush()
+            continue
+        if item is _PIPELINE_DONE:
+            flush()
+            return
+        batch.append(item)
+        if len(batch) >= batch_size:
+            flush()
+
+
+def _pipeline_analytics_stage(in_queue, aggregator, stats):
+    """
+    Konsumen 2: update agregat strategic marriage begitu satu orang selesai diekstrak.
+    Baris yang gagal diagregasi dihitung lalu dilewati; antrean tetap dikuras.
+    """
+    while True:
+        item = in_queue.get()
+        if item is _PIPELINE_DONE:
+            return
+        try:
+            with PROFILER.stage("strategic_aggregate"):
+                aggregator.add_row(item["row"])
+        except Exception as e:
+            print(f"  ⚠️ Gagal agregasi {item['nama']}: {e}")
+            stats["analytics_errors"] += 1
+
+
+def _pipeline_put(out_queue, item, *consumers):
+    """
+    put dengan backpressure (antrean bounded), tapi tidak menunggu selamanya
+    jika semua thread konsumennya sudah mati: RuntimeError, bukan hang.
+    """
+    import queue
+
+    while True:
+        try:
+            out_queue.put(item, timeout=1.0)
+            return
+        except queue.Full:
+            if not any(t.is_alive() for t in consumers):
+                raise RuntimeError(f"Tahap {consumers[0].name} berhenti; antrean tidak dikuras lagi")
+
+
+def run_streaming_pipeline(
+    csv_path: str,
+    out_csv: str = CSV_ENRICHED_PATH,
+    max_rows: int = 1000,
+    concurrency: int = 1,
+    batch_size: int = KG_BATCH_SIZE,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    delay: float = 1.0,
+) -> dict:
+    """
+    extract -> build-kg -> analyze sebagai satu pipeline streaming:
+    - CSV dibaca sekali, per chunk (CSV_CHUNK_ROWS; 0 = sekaligus); baris
+      chunk masuk antrean job bounded untuk `concurrency` thread Agent 1,
+    - tiap orang yang selesai langsung masuk ke antrean writer Neo4j dan
+      antrean analitik (semua bounded -> backpressure ke produser),
+    - chunk ditulis ke CSV enriched begitu semua barisnya (dan semua chunk
+      sebelumnya) selesai, tanpa menahan job chunk berikutnya; baris di luar
+      max_rows disalin apa adanya,
+    - setelah writer selesai, dominasi partai per Dapil diperbarui (hanya
+      jika seluruh CSV diproses, seperti build-kg).
+    Error per baris dihitung dan dilewati; jika satu tahap mati, pipeline
+    berhenti dengan RuntimeError, bukan menggantung.
+    Agent 2 tidak dipakai di sini: hasil Agent 1 ditulis langsung oleh writer.
+    Return ringkasan strategic marriage (dict).
+    """
+    import queue
+    from collections import deque
+
+    jobs = queue.Queue(maxsize=queue_size)
+    writer_queue = queue.Queue(maxsize=queue_size)
+    analytics_queue = queue.Queue(maxsize=queue_size)
+    aggregator = StrategicMarriageAggregator()
+    dominance = DapilDominanceAggregator()
+    graph = get_driver()
+    pending = deque()  # [df, sisa job] per chunk, urut CSV; hanya chunk yang belum ditulis
+    chunks_written = [0]
+    csv_lock = threading.Lock()
+    stats = {"extracted": 0, "extract_errors": 0, "row_errors": 0,
+             "written": 0, "write_errors": 0, "analytics_errors": 0}
+    stats_lock = threading.Lock()
+    stop = threading.Event()  # di-set saat satu tahap mati -> job sisa hanya dikuras
+
+    def process_job(idx, nama, row):
+        # Return (Pasangan, Keluarga) baru, atau None jika tidak ada relasi
+        print(f"=== [{idx}] Memproses: {nama} ===")
+        families = []
+        source_url = None
+        try:
+            result = run_family_agent(nama)
+            source_url = result.get("source_url")
+            families = result.get("families", [])
+            if not isinstance(families, list):
+                print(f"  ⚠️ Format 'families' tidak list untuk {nama}, dilewati.")
+                families = []
+            with stats_lock:
+                stats["extracted"] += 1
+        except Exception as e:
+            print(f"  ❌ Error dari agent 1 (ekstraksi) untuk {nama}: {e}")
+            with stats_lock:
+                stats["extract_errors"] += 1
+
+        if families:
+            print(f"  ✅ Ditemukan {len(families)} relasi keluarga")
+            pasangan, keluarga = merge_family_labels(
+                row.get("Pasangan"), row.get("Keluarga"), families
+            )
+            row["Pasangan"] = pasangan
+            row["Keluarga"] = keluarga
+
+        # Baris tetap diteruskan walau ekstraksi gagal: data CSV-nya
+        # (Dapil, Partai, ...) tetap perlu masuk graf & agregat.
+        item = {
+            "nama": nama,
+            "row": row,
+            "record": kg_record_from_row(row),
+            "families": families,
+            "source_url": source_url,
+        }
+        _pipeline_put(writer_queue, item, writer)
+        _pipeline_put(analytics_queue, item, analytics)
+
+        if families and delay:
+            time.sleep(delay)
+        return (row["Pasangan"], row["Keluarga"]) if families else None
+
+    def flush_chunks():
+        # Panggil dengan csv_lock: tulis chunk terdepan yang semua barisnya selesai
+        while pending and pending[0][1] == 0:
+            write_csv_chunk(pending.popleft()[0], out_csv, chunks_written[0] == 0)
+            chunks_written[0] += 1
+
+    def job_done(chunk, idx, labels):
+        with csv_lock:
+            if labels:
+                chunk[0].at[idx, "Pasangan"], chunk[0].at[idx, "Keluarga"] = labels
+            chunk[1] -= 1
+            flush_chunks()
+
+    def extract_worker():
+        while True:
+            job = jobs.get()
+            if job is _PIPELINE_DONE:
+                return
+            idx, nama, row, chunk = job
+            labels = None
+            try:
+                if not stop.is_set():
+                    labels = process_job(idx, nama, row)
+            except Exception as e:
+                print(f"  ❌ Baris {idx} ({nama}) gagal diproses: {e}")
+                with stats_lock:
+                    stats["row_errors"] += 1
+            finally:
+                job_done(chunk, idx, labels)
+
+    def guarded(target, *args):
+        # Tahap yang mati karena error tak terduga menghentikan pipeline
+        def run():
+            try:
+                target(*args)
+            except BaseException as e:
+                print(f"  ❌ Tahap {threading.current_thread().name} berhenti: {e!r}")
+                stop.set()
+                raise
+        return run
+
+    extractors = [
+        threading.Thread(target=guarded(extract_worker), name=f"extract-{i}")
+        for i in range(max(1, concurrency))
+    ]
+    writer = threading.Thread(
+        target=guarded(_pipeline_writer_stage, writer_queue, graph, max(1, batch_size), stats, dominance),
+        name="neo4j-writer",
+    )
+    analytics = threading.Thread(
+        target=guarded(_pipeline_analytics_stage, analytics_queue, aggregator, stats),
+        name="analytics",
+    )
+
+    # Nama tampilan Position/Education ditetapkan sebelum thread Agent 1 berjalan
+    register_canonical_names(csv_path)
+    started = time.time()
+    for t in [writer, analytics, *extractors]:
+        t.start()
+    complete = True  # False jika ada baris di luar max_rows (agregat Dapil tidak sah)
+    print(f"📄 Pipeline streaming: maks. {max_rows} baris pertama dari {csv_path}\n")
+    try:
+        for df in iter_extract_chunks(csv_path):
+            start = df.index[0] if len(df) else 0
+            n = max(0, min(max_rows - start, len(df)))
+            complete = complete and n == len(df)
+            chunk_jobs = extract_jobs(df, n)
+            chunk = [df, len(chunk_jobs)]
+            with csv_lock:
+                pending.append(chunk)
+                flush_chunks()
+            for idx, nama in chunk_jobs:
+                _pipeline_put(jobs, (idx, nama, df.loc[idx].to_dict(), chunk), *extractors)
+            if stop.is_set():
+                break
+    finally:
+        # Satu sinyal selesai per thread (sinyal bisa diambil thread mana saja);
+        # antrean yang konsumennya sudah mati semua tidak perlu sinyal lagi
+        def finish(out_queue, consumers):
+            for _ in consumers:
+                try:
+                    _pipeline_put(out_queue, _PIPELINE_DONE, *consumers)
+                except RuntimeError:
+                    return
+            for t in consumers:
+                t.join()
+
+        # Writer & analitik baru diberi sinyal setelah semua extractor selesai
+        finish(jobs, extractors)
+        finish(writer_queue, [writer])
+        finish(analytics_queue, [analytics])
+
+    if complete and not stop.is_set():
+        info = update_party_dominance(graph, dominance, batch_size=batch_size)
+        print(f"🏛️ Dominasi partai: {info['updated']} dari {info['dapil']} Dapil diperbarui")
+    print(
+        f"\n💾 File hasil CSV disimpan ke: {out_csv}\n"
+        f"⏱️ Pipeline selesai dalam {time.time() - started:.1f} detik — "
+        f"ekstraksi OK {stats['extracted']}, gagal {stats['extract_errors']}; "
+        f"ditulis ke Neo4j {stats['written']}, gagal {stats['write_errors']}; "
+        f"baris error {stats['row_errors']}, agregasi error {stats['analytics_errors']}"
+    )
+    if stop.is_set():
+        raise RuntimeError("Pipeline berhenti karena ada tahap yang mati (lihat log di atas)")
+    return aggregator.summary()
+
+
+# ==================================================
+# 16. EKSPOR BULK: CSV UNTUK `neo4j-admin database import`
+# ==================================================
+# Untuk database baru (environment baru / disaster recovery): dataset enriched
+# (+ JSON hasil Agent 1, opsional) diubah jadi file node & relasi CSV untuk
+# import offline, jauh lebih cepat daripada loop MERGE online. Isi graf sama
+# dengan build_kg_from_enriched_csv + write_family_to_neo4j. ID stabil (hash
+# label + nama), jadi ekspor ulang dari data yang sama memberi ID yang sama.
+
+BULK_NODE_LABELS = ["Person", "Dapil", "Party", "Position", "Education"]
+
+
+def bulk_node_id(label: str, name: str) -> str:
+    import hashlib
+
+    return f"{label[:3].lower()}_{hashlib.sha1(f'{label}:{name}'.encode('utf-8')).hexdigest()[:16]}"
+
+
+def load_family_results(paths) -> list:
+    """
+    Baca hasil Agent 1 ({"person", "source_url", "families": [...]}) dari
+    file .json (satu objek atau list) / .jsonl (satu objek per baris).
+    """
+    results = []
+    for path in paths or []:
+        with open(path, encoding="utf-8") as f:
+            if str(path).lower().endswith(".jsonl"):
+                results.extend(json.loads(line) for line in f if line.strip())
+            else:
+                data = json.load(f)
+                results.extend(data if isinstance(data, list) else [data])
+    return results
+
+
+class BulkGraphExport:
+    """
+    Kumpulkan node & relasi dengan semantik MERGE (satu node per label+nama,
+    satu relasi per (awal, tipe, akhir); properti yang ditulis belakangan menang),
+    lalu tulis sebagai CSV neo4j-admin.
+    """
+
+    def __init__(self, timestamp_ms: int = None):
+        self.timestamp = timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+        self.nodes = {label: {} for label in BULK_NODE_LABELS}
+        self.rels = {}  # (type, start_label, start, end_label, end) -> props
+
+    def node(self, label: str, name: str, **props):
+        current = self.nodes[label].setdefault(name, {})
+        current.update({k: v for k, v in props.items() if v is not None})
+
+    def rel(self, rel_type, start_label, start, end_label, end, **props):
+        self.node(start_label, start)
+        self.node(end_label, end)
+        key = (rel_type, start_label, start, end_label, end)
+        current = self.rels.setdefault(key, {})
+        # created_at hanya di-set sekali (coalesce), properti lain: yang terakhir menang
+        if "created_at" in current:
+            props.pop("created_at", None)
+        current.update({k: v for k, v in props.items() if v is not None})
+
+    def add_family_result(self, result: dict):
+        # Sama dengan write_family_to_neo4j
+        person = (result.get("person") or "").strip()
+        if not person:
+            return
+        self.node("Person", person)
+        for fam in result.get("families") or []:
+            rel_raw = (fam.get("relation") or "").strip().lower()
+            rel_name = (fam.get("name") or "").strip()
+            note = (fam.get("note") or "").strip()
+            if not rel_name:
+                continue
+            rel_type, direction = family_relation_type(rel_raw)
+            start, end = (rel_name, person) if direction == "incoming" else (person, rel_name)
+            self.rel(
+                rel_type, "Person", start, "Person", end,
+                relation_label=rel_raw, note=note or None,
+                source=result.get("source_url"), last_seen=self.timestamp,
+            )
+
+    def add_kg_records(self, records):
+        # Sama dengan _write_kg_batch (+ kg_hash supaya `build-kg --sync` langsung cocok)
+        for nama, person_records in group_kg_records(records).items():
+            for r in person_records:
+                self.node(
+                    "Person", nama, dapil=r["dapil"], partai=r["partai"],
+                    jabatan_raw=r["jabatan"], pendidikan_raw=r["pendidikan"],
+                )
+                if r["dapil"]:
+                    self.rel("REPRESENTS", "Person", nama, "Dapil", r["dapil"])
+                if r["partai"]:
+                    self.rel("MEMBER_OF", "Person", nama, "Party", r["partai"])
+                for name in r["positions"]:
+                    self.rel("HOLDS_POSITION", "Person", nama, "Position", name)
+                for name in r["educations"]:
+                    self.rel("ALUMNI_OF", "Person", nama, "Education", name)
+                for s in r["spouses"]:
+                    self.rel("SPOUSE_OF", "Person", nama, "Person", s["name"],
+                             relation_label=s["rel_label"],
+                             created_at=self.timestamp, last_seen=self.timestamp)
+                for f in r["families"]:
+                    self.rel("FAMILY_OF", "Person", nama, "Person", f["name"], note=f["note"],
+                             created_at=self.timestamp, last_seen=self.timestamp)
+            self.node("Person", nama, kg_hash=kg_record_hash(person_records))
+
+    def write(self, out_dir: str) -> dict:
+        """
+        Tulis nodes_<label>.csv & rels_<type>.csv (header di baris pertama).
+        Return {"nodes": {label: n}, "relationships": {type: n}, "files": [...]}.
+        """
+        import csv
+
+        os.makedirs(out_dir, exist_ok=True)
+        summary = {"nodes": {}, "relationships": {}, "files": []}
+
+        def header_fields(items):
+            # Properti yang ada di salah satu item; angka diberi tipe :long
+            names = sorted({k for props in items for k in props})
+            typed = [
+                f"{k}:long" if any(isinstance(p.get(k), int) for p in items) else k
+                for k in names
+            ]
+            return names, typed
+
+        def write_csv(filename, header, rows):
+            path = os.path.join(out_dir, filename)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            summary["files"].append(path)
+
+        for label in BULK_NODE_LABELS:
+            nodes = self.nodes[label]
+            if label == "Person":
+                for props in nodes.values():
+                    props.setdefault("created_at", self.timestamp)
+                    props.setdefault("last_seen", self.timestamp)
+            names, typed = header_fields(nodes.values())
+            write_csv(
+                f"nodes_{label.lower()}.csv",
+                [f":ID({label})", "name", *typed, ":LABEL"],
+                (
+                    [bulk_node_id(label, name), name, *(props.get(k, "") for k in names), label]
+                    for name, props in sorted(nodes.items())
+                ),
+            )
+            summary["nodes"][label] = len(nodes)
+
+        by_type = {}
+        for key, props in self.rels.items():
+            by_type.setdefault(key[0], []).append((key, props))
+        for rel_type, items in sorted(by_type.items()):
+            start_label, end_label = items[0][0][1], items[0][0][3]
+            names, typed = header_fields([props for _, props in items])
+            write_csv(
+                f"rels_{rel_type.lower()}.csv",
+                [f":START_ID({start_label})", f":END_ID({end_label})", *typed, ":TYPE"],
+                (
+                    [bulk_node_id(key[1], key[2]), bulk_node_id(key[3], key[4]),
+                     *(props.get(k, "") for k in names), rel_type]
+                    for key, props in sorted(items, key=lambda item: item[0])
+                ),
+            )
+            summary["relationships"][rel_type] = len(items)
+        return summary
+
+
+def neo4j_admin_import_command(out_dir: str, files, database: str = "neo4j") -> str:
+    args = [f"neo4j-admin database import full {database}", "--overwrite-destination",
+            "--multiline-fields=true"]
+    for path in files:
+        name = os.path.basename(path)
+        kind = "--nodes" if name.startswith("nodes_") else "--relationships"
+        args.append(f"{kind}={os.path.join(out_dir, name)}")
+    return " \\\n    ".join(args)
+
+
+def export_bulk_import(
+    csv_path: str, out_dir: str, family_json_paths=None, max_rows: int = None
+) -> dict:
+    """
+    Dataset enriched (CSV/Parquet) + hasil Agent 1 (opsional) -> file CSV
+    neo4j-admin di out_dir. Return ringkasan jumlah node/relasi + perintah import.
+    """
+    export = BulkGraphExport()
+    # Urutan sama dengan alur biasa: extract (Agent 2) dulu, baru build-kg
+    for result in load_family_results(family_json_paths):
+        export.add_family_result(result)
+
+    register_canonical_names(csv_path)
+    df = read_enriched_table(csv_path, columns=STRATEGIC_COLUMNS, max_rows=max_rows)
+    records = []
+    for _, row in df.iterrows():
+        record = kg_record_from_row(row)
+        if record is not None:
+            records.append(record)
+    export.add_kg_records(records)
+
+    summary = export.write(out_dir)
+    summary["command"] = neo4j_admin_import_command(out_dir, summary["files"])
+    return summary
+
+
+# ==================================================
+# 17. BACKEND GRAF: ANTARMUKA, NEO4J, SQLITE
+# ==================================================
+# Semua penulis & pembaca graf (Agent 2, build-kg, sync, dominasi, sentralitas,
+# relasi turunan, proyeksi) hanya memanggil method GraphBackend. get_driver()
+# mengembalikan Neo4jGraph (driver Neo4j + Cypher) atau, dengan `--backend
+# sqlite` (env GRAPH_BACKEND=sqlite), SqliteGraph: graf di satu file lokal untuk
+# laptop, uji coba, deployment kecil, dan benchmark writer tanpa jaringan.
+# Cypher bebas (Agent 5) hanya tersedia di Neo4j (supports_cypher).
+
+# Relasi kekerabatan yang ditelusuri kinship_paths()
+KINSHIP_REL_TYPES = ["SPOUSE_OF", "PARENT_OF", "SIBLING_OF", "IN_LAW_OF", "FAMILY_OF"]
+
+
+class GraphBackend:
+    """
+    Antarmuka backend graf. Semantik tiap method mengikuti statement Cypher
+    padanannya: MERGE per label+nama / per (awal, tipe, akhir), created_at
+    hanya saat dibuat, properti lain ditimpa, nilai None menghapus properti.
+    """
+
+    name = ""
+    supports_cypher = False
+
+    def target(self) -> str:
+        # Identitas database tujuan (dipakai manifest sync)
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    # --- tulis -----------------------------------------------------------
+
+    def write_family(self, person_name, families, source_url=None):
+        raise NotImplementedError
+
+    def write_kg_batch(self, records):
+        raise NotImplementedError
+
+    def sync_kg_batch(self, grouped, hashes):
+        raise NotImplementedError
+
+    def delete_kg_rows(self, names):
+        raise NotImplementedError
+
+    def delete_kg_orphans(self):
+        raise NotImplementedError
+
+    def write_sync_id(self, sync_id):
+        # Generasi sync terakhir (node KgSync), pasangan sync_id di manifest
+        raise NotImplementedError
+
+    def set_node_properties(self, label, rows):
+        # rows: [{"name", prop: nilai}]
+        raise NotImplementedError
+
+    def ensure_property_indexes(self, labels, props):
+        raise NotImplementedError
+
+    def write_derived_edges(self, rel_type, rule, upserts, deletes, derived_at):
+        # upserts: [{"a", "c", "via"}], deletes: [{"a", "c"}]
+        raise NotImplementedError
+
+    def write_person_edges(self, rel_type, upserts, deletes):
+        # upserts: [{"a", "c", "props"}], deletes: [{"a", "c"}]
+        raise NotImplementedError
+
+    # --- baca ------------------------------------------------------------
+
+    def read_kg_hashes(self) -> dict:
+        # {nama: Person.kg_hash}
+        raise NotImplementedError
+
+    def read_sync_id(self):
+        raise NotImplementedError
+
+    def read_node_property(self, prop, labels) -> dict:
+        # {(label, nama): nilai} untuk node yang punya properti tsb.
+        raise NotImplementedError
+
+    def read_edges(self, rel_types) -> list:
+        # [(label_a, nama_a, label_b, nama_b)]
+        raise NotImplementedError
+
+    def read_relations(self, rel_types, names=None) -> list:
+        # Relasi Person–Person: [(tipe, awal, akhir, via, label)]
+        raise NotImplementedError
+
+    def read_relations_via(self, rel_types, names) -> list:
+        # Relasi yang salah satu perantaranya (via) ada di `names`
+        raise NotImplementedError
+
+    def run_cypher(self, cypher: str) -> list:
+        raise NotImplementedError(f"Backend graf '{self.name}' tidak mendukung Cypher")
+
+
+class Neo4jGraph(GraphBackend):
+    """
+    Backend Neo4j: tiap method satu transaksi (execute_write, dengan retry)
+    atau satu query baca, lewat connection pool driver yang dibungkus.
+    """
+
+    name = "neo4j"
+    supports_cypher = True
+
+    def __init__(self, driver, uri: str = None):
+        self.driver = driver
+        self.uri = uri or NEO4J_URI
+
+    def target(self) -> str:
+        return self.uri
+
+    def close(self):
+        self.driver.close()
+
+    def _write(self, op: str, work, *args):
+        with self.driver.session() as session:
+            return execute_write(session, op, work, *args)
+
+    def _read(self, op: str, query: str, **params) -> list:
+        with METRICS.timer("neo4j_statement_seconds", statement=op):
+            with self.driver.session() as session:
+                return list(session.run(query, **params))
+
+    # --- tulis -----------------------------------------------------------
+
+    def write_family(self, person_name, families, source_url=None):
+        _write_family_statements(self.driver, person_name, families, source_url)
+
+    def write_kg_batch(self, records):
+        self._write("kg_batch", _write_kg_batch, records)
+
+    def sync_kg_batch(self, grouped, hashes):
+        self._write("kg_sync_batch", _sync_kg_batch, grouped, hashes)
+
+    def delete_kg_rows(self, names):
+        self._write("kg_sync_delete_batch", _delete_kg_rows, names)
+
+    def delete_kg_orphans(self):
+        self._write("kg_sync_orphans", _delete_kg_orphans)
+
+    def write_sync_id(self, sync_id):
+        with self.driver.session() as session:
+            run_statement(
+                session, "kg_sync_id",
+                "MERGE (s:KgSync {name: 'kg_sync'}) SET s.sync_id = $sync_id",
+                sync_id=sync_id,
+            )
+
+    def set_node_properties(self, label, rows):
+        # SET n += {prop: null} menghapus properti, sama dengan json_patch di SQLite
+        self._write("node_properties", _set_node_properties_batch, label, [
+            {"name": r["name"], "props": {k: v for k, v in r.items() if k != "name"}} for r in rows
+        ])
+
+    def ensure_property_indexes(self, labels, props):
+        with self.driver.session() as session:
+            for label in labels:
+                for prop in ["name", *props]:
+                    run_statement(
+                        session, "property_index",
+                        f"CREATE INDEX {label.lower()}_{prop} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+                    )
+
+    def write_derived_edges(self, rel_type, rule, upserts, deletes, derived_at):
+        self._write("kinship_derive_batch", _write_derived_batch, rel_type, rule, upserts, deletes, derived_at)
+
+    def write_person_edges(self, rel_type, upserts, deletes):
+        self._write("projection_batch", _write_person_edges_batch, rel_type, upserts, deletes)
+
+    # --- baca ------------------------------------------------------------
+
+    def read_kg_hashes(self) -> dict:
+        rows = self._read(
+            "kg_sync_read_hashes",
+            "MATCH (p:Person) WHERE p.kg_hash IS NOT NULL RETURN p.name AS name, p.kg_hash AS hash",
+        )
+        return {r["name"]: r["hash"] for r in rows}
+
+    def read_sync_id(self):
+        rows = self._read("kg_sync_read_id", "MATCH (s:KgSync {name: 'kg_sync'}) RETURN s.sync_id AS sync_id")
+        return rows[0]["sync_id"] if rows else None
+
+    def read_node_property(self, prop, labels) -> dict:
+        rows = self._read(
+            f"read_{prop}",
+            f"""
+            MATCH (n) WHERE ({' OR '.join(f'n:{label}' for label in labels)}) AND n.{prop} IS NOT NULL
+            RETURN labels(n)[0] AS label, n.name AS name, n.{prop} AS value
+            """,
+        )
+        return {(r["label"], r["name"]): r["value"] for r in rows}
+
+    def read_edges(self, rel_types) -> list:
+        rows = self._read(
+            "read_edges",
+            """
+            MATCH (a)-[r]->(b)
+            WHERE type(r) IN $types AND a.name IS NOT NULL AND b.name IS NOT NULL
+            RETURN labels(a)[0] AS a_label, a.name AS a_name,
+                   labels(b)[0] AS b_label, b.name AS b_name
+            """,
+            types=list(rel_types),
+        )
+        return [(r["a_label"], r["a_name"], r["b_label"], r["b_name"]) for r in rows]
+
+    def read_relations(self, rel_types, names=None) -> list:
+        types = "|".join(rel_types)
+        if names is None:
+            query = f"""
+            MATCH (a:Person)-[r:{types}]->(c:Person)
+            RETURN type(r) AS type, a.name AS a, c.name AS c, r.via AS via,
+                   coalesce(r.relation_label, r.note) AS label
+            """
+        else:
+            query = f"""
+            UNWIND $names AS nama
+            MATCH (:Person {{name: nama}})-[r:{types}]-(:Person)
+            RETURN DISTINCT type(r) AS type, startNode(r).name AS a, endNode(r).name AS c,
+                   r.via AS via, coalesce(r.relation_label, r.note) AS label
+            """
+        rows = self._read("kinship_read", query, names=list(names or []))
+        return [(r["type"], r["a"], r["c"], r["via"], r["label"]) for r in rows]
+
+    def read_relations_via(self, rel_types, names) -> list:
+        rows = self._read(
+            "kinship_read_via",
+            f"""
+            MATCH (a:Person)-[r:{'|'.join(rel_types)}]->(c:Person)
+            WHERE any(v IN r.via WHERE v IN $names)
+            RETURN type(r) AS type, a.name AS a, c.name AS c, r.via AS via
+            """,
+            names=list(names),
+        )
+        return [(r["type"], r["a"], r["c"], r["via"], None) for r in rows]
+
+    def run_cypher(self, cypher: str) -> list:
+        return [dict(r) for r in self._read("qa_cypher", cypher)]
+
+
+def _set_node_properties_batch(tx, label, rows):
+    run_statement(
+        tx,
+        "node_properties",
+        f"""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{name: row.name}})
+        SET n += row.props
+        """,
+        rows=rows,
+    )
+
+
+def graph_backend(driver):
+    """
+    Driver Neo4j mentah (atau driver palsu untuk benchmark) -> Neo4jGraph;
+    GraphBackend dikembalikan apa adanya.
+    """
+    if driver is None or isinstance(driver, GraphBackend):
+        return driver
+    return Neo4jGraph(driver)
+
+
+class SqliteGraph(GraphBackend):
+    """
+    Graf di satu file SQLite: tabel nodes (label, name, props JSON) dan edges
+    (type, src, dst, props JSON) dengan index unik yang sama dengan kunci MERGE.
+    Tulis per batch (executemany dalam satu transaksi), penelusuran kekerabatan
+    lewat BFS per kedalaman (satu query edge per level). Satu koneksi dipakai
+    bersama, dijaga lock.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS nodes (
+        id INTEGER PRIMARY KEY,
+        label TEXT NOT NULL,
+        name TEXT NOT NULL,
+        props TEXT NOT NULL DEFAULT '{}',
+        UNIQUE (label, name)
+    );
+    CREATE TABLE IF NOT EXISTS edges (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        src INTEGER NOT NULL REFERENCES nodes (id),
+        dst INTEGER NOT NULL REFERENCES nodes (id),
+        props TEXT NOT NULL DEFAULT '{}',
+        UNIQUE (src, type, dst)
+    );
+    CREATE INDEX IF NOT EXISTS edges_dst ON edges (dst, type);
+    """
+
+    # created_at tidak ikut ditimpa saat baris sudah ada (= ON CREATE SET / coalesce)
+    UPSERT_NODE = """
+    INSERT INTO nodes (label, name, props) VALUES (?, ?, ?)
+    ON CONFLICT (label, name) DO UPDATE
+    SET props = json_patch(nodes.props, json_remove(excluded.props, '$.created_at'))
+    """
+    UPSERT_EDGE = """
+    INSERT INTO edges (type, src, dst, props)
+    SELECT ?, s.id, d.id, ?
+    FROM nodes s JOIN nodes d ON d.label = ? AND d.name = ?
+    WHERE s.label = ? AND s.name = ?
+    ON CONFLICT (src, type, dst) DO UPDATE
+    SET props = json_patch(edges.props, json_remove(excluded.props, '$.created_at'))
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def transaction(self, op: str):
+        with self._lock, METRICS.timer("graph_backend_seconds", backend=self.name, op=op):
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def target(self) -> str:
+        return f"sqlite:{os.path.abspath(self.path)}"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- tulis -----------------------------------------------------------
+
+    @staticmethod
+    def _props(props: dict) -> str:
+        return json.dumps(props, ensure_ascii=False)
+
+    def _upsert_nodes(self, conn, label, rows):
+        # rows: [(name, props)]
+        conn.executemany(
+            self.UPSERT_NODE, [(label, name, self._props(props)) for name, props in rows]
+        )
+
+    def _upsert_edges(self, conn, rel_type, start_label, end_label, rows):
+        # rows: [(start_name, end_name, props)]; kedua node harus sudah ada
+        conn.executemany(
+            self.UPSERT_EDGE,
+            [
+                (rel_type, self._props(props), end_label, end, start_label, start)
+                for start, end, props in rows
+            ],
+        )
+
+    def write_family(self, person_name, families, source_url=None):
+        now = int(time.time() * 1000)
+        stamp = {"created_at": now, "last_seen": now}
+        edges = {}
+        relatives = []
+        for fam in families:
+            rel_raw = (fam.get("relation") or "").strip().lower()
+            rel_name = (fam.get("name") or "").strip()
+            note = (fam.get("note") or "").strip()
+            if not rel_name:
+                continue
+            rel_type, direction = family_relation_type(rel_raw)
+            start, end = (rel_name, person_name) if direction == "incoming" else (person_name, rel_name)
+            relatives.append((rel_name, stamp))
+            edges.setdefault(rel_type, []).append((start, end, {
+                "relation_label": rel_raw,
+                "note": note if note else None,
+                "source": source_url,
+                "last_seen": now,
+            }))
+
+        with self.transaction("family") as conn:
+            self._upsert_nodes(conn, "Person", [(person_name, stamp)] + relatives)
+            for rel_type, rows in edges.items():
+                self._upsert_edges(conn, rel_type, "Person", "Person", rows)
+
+    def _write_kg_records(self, conn, records):
+        # Padanan _write_kg_batch
+        now = int(time.time() * 1000)
+        stamp = {"created_at": now, "last_seen": now}
+        self._upsert_nodes(conn, "Person", [
+            (r["nama"], {
+                **stamp,
+                "dapil": r["dapil"],
+                "partai": r["partai"],
+                "jabatan_raw": r["jabatan"],
+                "pendidikan_raw": r["pendidikan"],
+            })
+            for r in records
+        ])
+
+        for label, rel_type, field in (
+            ("Dapil", "REPRESENTS", "dapil"),
+            ("Party", "MEMBER_OF", "partai"),
+        ):
+            pairs = [(r["nama"], r[field]) for r in records if r[field]]
+            self._upsert_nodes(conn, label, [(name, {}) for _, name in pairs])
+            self._upsert_edges(conn, rel_type, "Person", label, [(n, v, {}) for n, v in pairs])
+
+        for label, rel_type, field in (
+            ("Position", "HOLDS_POSITION", "positions"),
+            ("Education", "ALUMNI_OF", "educations"),
+        ):
+            grouped = _group_holders(records, field)
+            self._upsert_nodes(conn, label, [(g["name"], {}) for g in grouped])
+            self._upsert_edges(conn, rel_type, "Person", label, [
+                (nama, g["name"], {}) for g in grouped for nama in g["holders"]
+            ])
+
+        spouses = [(r["nama"], s["name"], s["rel_label"]) for r in records for s in r["spouses"]]
+        families = [(r["nama"], f["name"], f["note"]) for r in records for f in r["families"]]
+        self._upsert_nodes(conn, "Person", [(name, stamp) for _, name, _ in spouses + families])
+        self._upsert_edges(conn, "SPOUSE_OF", "Person", "Person", [
+            (nama, name, {**stamp, "relation_label": label}) for nama, name, label in spouses
+        ])
+        self._upsert_edges(conn, "FAMILY_OF", "Person", "Person", [
+            (nama, name, {**stamp, "note": note}) for nama, name, note in families
+        ])
+
+    def write_kg_batch(self, records):
+        with self.transaction("kg_batch") as conn:
+            self._write_kg_records(conn, records)
+
+    # --- sync (build-kg --sync) -------------------------------------------
+
+    def _person_edges(self, conn, nama, rel_types):
+        marks = ",".join("?" * len(rel_types))
+        return conn.execute(
+            f"""
+            SELECT e.id, e.type, d.name
+            FROM nodes s
+            JOIN edges e ON e.src = s.id AND e.type IN ({marks})
+            JOIN nodes d ON d.id = e.dst
+            WHERE s.label = 'Person' AND s.name = ?
+            """,
+            [*rel_types, nama],
+        ).fetchall()
+
+    def sync_kg_batch(self, grouped, hashes):
+        # Padanan _sync_kg_batch: tulis, pangkas relasi usang, simpan hash
+        with self.transaction("kg_sync_batch") as conn:
+            self._write_kg_records(conn, [r for records in grouped.values() for r in records])
+            stale = []
+            for nama, person_records in grouped.items():
+                keep = _kg_keep_targets(person_records)
+                stale.extend(
+                    (row["id"],)
+                    for row in self._person_edges(conn, nama, KG_SYNC_REL_TYPES)
+                    if row["name"] not in keep[row["type"]]
+                )
+            conn.executemany("DELETE FROM edges WHERE id = ?", stale)
+            conn.executemany(
+                "UPDATE nodes SET props = json_set(props, '$.kg_hash', ?) "
+                "WHERE label = 'Person' AND name = ?",
+                [(hashes[nama], nama) for nama in grouped],
+            )
+
+    def delete_kg_rows(self, names):
+        with self.transaction("kg_sync_delete") as conn:
+            for nama in names:
+                conn.executemany(
+                    "DELETE FROM edges WHERE id = ?",
+                    [(row["id"],) for row in self._person_edges(conn, nama, KG_SYNC_REL_TYPES)],
+                )
+            conn.executemany(
+                "UPDATE nodes SET props = json_remove(props, '$.kg_hash', '$.dapil', "
+                "'$.partai', '$.jabatan_raw', '$.pendidikan_raw') "
+                "WHERE label = 'Person' AND name = ?",
+                [(nama,) for nama in names],
+            )
+            conn.executemany(
+                """
+                DELETE FROM nodes
+                WHERE label = 'Person' AND name = ?
+                  AND NOT EXISTS (SELECT 1 FROM edges WHERE src = nodes.id)
+                  AND NOT EXISTS (SELECT 1 FROM edges WHERE dst = nodes.id)
+                """,
+                [(nama,) for nama in names],
+            )
+
+    def delete_kg_orphans(self):
+        with self.transaction("kg_sync_orphans") as conn:
+            conn.execute(
+                """
+                DELETE FROM nodes
+                WHERE label IN ('Dapil', 'Party', 'Position', 'Education')
+                  AND NOT EXISTS (SELECT 1 FROM edges WHERE src = nodes.id)
+                  AND NOT EXISTS (SELECT 1 FROM edges WHERE dst = nodes.id)
+                """
+            )
+
+    def write_sync_id(self, sync_id):
+        with self.transaction("kg_sync_id") as conn:
+            self._upsert_nodes(conn, "KgSync", [("kg_sync", {"sync_id": sync_id})])
+
+    def read_sync_id(self):
+        rows = self.query(
+            "SELECT json_extract(props, '$.sync_id') AS sync_id FROM nodes "
+            "WHERE label = 'KgSync' AND name = 'kg_sync'"
+        )
+        return rows[0]["sync_id"] if rows else None
+
+    def read_kg_hashes(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, json_extract(props, '$.kg_hash') AS hash FROM nodes "
+                "WHERE label = 'Person' AND json_extract(props, '$.kg_hash') IS NOT NULL"
+            ).fetchall()
+        return {row["name"]: row["hash"] for row in rows}
+
+    # --- properti turunan (sentralitas dll.) ------------------------------
+
+    def set_node_properties(self, label, rows):
+        # rows: [{"name", prop: nilai}]; nilai None menghapus properti (= SET n.x = null)
+        with self.transaction("node_properties") as conn:
+            conn.executemany(
+                "UPDATE nodes SET props = json_patch(props, ?) WHERE label = ? AND name = ?",
+                [
+                    (self._props({k: v for k, v in r.items() if k != "name"}), label, r["name"])
+                    for r in rows
+                ],
+            )
+
+    def ensure_property_indexes(self, labels, props):
+        # Index (label, properti) berlaku untuk semua label sekaligus
+        with self._lock:
+            for prop in props:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS nodes_{prop} "
+                    f"ON nodes (label, json_extract(props, '$.{prop}'))"
+                )
+
+    def read_node_property(self, prop, labels) -> dict:
+        rows = self.query(
+            f"SELECT label, name, json_extract(props, '$.{prop}') AS value FROM nodes "
+            f"WHERE label IN ({','.join('?' * len(labels))}) "
+            f"AND json_extract(props, '$.{prop}') IS NOT NULL",
+            *labels,
+        )
+        return {(row["label"], row["name"]): row["value"] for row in rows}
+
+    def read_edges(self, rel_types) -> list:
+        rows = self.query(
+            f"""
+            SELECT s.label AS a_label, s.name AS a_name, d.label AS b_label, d.name AS b_name
+            FROM edges e JOIN nodes s ON s.id = e.src JOIN nodes d ON d.id = e.dst
+            WHERE e.type IN ({','.join('?' * len(rel_types))})
+            """,
+            *rel_types,
+        )
+        return [(r["a_label"], r["a_name"], r["b_label"], r["b_name"]) for r in rows]
+
+    # --- relasi kekerabatan turunan ------------------------------------------
+
+    RELATION_COLUMNS = """
+        e.type AS type, s.name AS a, d.name AS c, json_extract(e.props, '$.via') AS via,
+        coalesce(json_extract(e.props, '$.relation_label'), json_extract(e.props, '$.note')) AS label
+    """
+
+    @staticmethod
+    def _relation_rows(rows) -> list:
+        return [
+            (r["type"], r["a"], r["c"], json.loads(r["via"]) if r["via"] else None, r["label"])
+            for r in rows
+        ]
+
+    def read_relations(self, rel_types, names=None) -> list:
+        marks = ",".join("?" * len(rel_types))
+        if names is None:
+            return self._relation_rows(self.query(
+                f"""
+                SELECT {self.RELATION_COLUMNS}
+                FROM edges e
+                JOIN nodes s ON s.id = e.src AND s.label = 'Person'
+                JOIN nodes d ON d.id = e.dst AND d.label = 'Person'
+                WHERE e.type IN ({marks})
+                """,
+                *rel_types,
+            ))
+        # Dua arah lewat index (src, type, dst) dan (dst, type)
+        names_json = json.dumps(list(names), ensure_ascii=False)
+        return self._relation_rows(self.query(
+            f"""
+            SELECT {self.RELATION_COLUMNS}
+            FROM json_each(?) j
+            JOIN nodes s ON s.label = 'Person' AND s.name = j.value
+            JOIN edges e ON e.src = s.id AND e.type IN ({marks})
+            JOIN nodes d ON d.id = e.dst AND d.label = 'Person'
+            UNION
+            SELECT {self.RELATION_COLUMNS}
+            FROM json_each(?) j
+            JOIN nodes d ON d.label = 'Person' AND d.name = j.value
+            JOIN edges e ON e.dst = d.id AND e.type IN ({marks})
+            JOIN nodes s ON s.id = e.src AND s.label = 'Person'
+            """,
+            names_json, *rel_types, names_json, *rel_types,
+        ))
+
+    def read_relations_via(self, rel_types, names) -> list:
+        return self._relation_rows(self.query(
+            f"""
+            SELECT {self.RELATION_COLUMNS}
+            FROM edges e
+            JOIN nodes s ON s.id = e.src
+            JOIN nodes d ON d.id = e.dst
+            WHERE e.type IN ({','.join('?' * len(rel_types))})
+              AND EXISTS (
+                  SELECT 1 FROM json_each(e.props, '$.via') v
+                  WHERE v.value IN (SELECT value FROM json_each(?))
+              )
+            """,
+            *rel_types, json.dumps(list(names), ensure_ascii=False),
+        ))
+
+    def write_derived_edges(self, rel_type, rule, upserts, deletes, derived_at):
+        # Padanan _write_derived_batch
+        with self.transaction("kinship_derive") as conn:
+            self._upsert_edges(conn, rel_type, "Person", "Person", [
+                (row["a"], row["c"], {
+                    "created_at": derived_at, "derived": True, "rule": rule,
+                    "via": row["via"], "derived_at": derived_at,
+                })
+                for row in upserts
+            ])
+            conn.executemany(
+                """
+                DELETE FROM edges
+                WHERE type = ?
+                  AND src = (SELECT id FROM nodes WHERE label = 'Person' AND name = ?)
+                  AND dst = (SELECT id FROM nodes WHERE label = 'Person' AND name = ?)
+                """,
+                [(rel_type, row["a"], row["c"]) for row in deletes],
+            )
+
+    def write_person_edges(self, rel_type, upserts, deletes):
+        # Padanan _write_person_edges_batch
+        with self.transaction("projection") as conn:
+            self._upsert_edges(conn, rel_type, "Person", "Person", [
+                (row["a"], row["c"], row["props"]) for row in upserts
+            ])
+            conn.executemany(
+                """
+                DELETE FROM edges
+                WHERE type = ?
+                  AND src = (SELECT id FROM nodes WHERE label = 'Person' AND name = ?)
+                  AND dst = (SELECT id FROM nodes WHERE label = 'Person' AND name = ?)
+                """,
+                [(rel_type, row["a"], row["c"]) for row in deletes],
+            )
+
+    # --- baca ------------------------------------------------------------
+
+    def query(self, sql: str, *params) -> list:
+        # SQL bebas (read-only dianjurkan), hasil list of dict
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def counts(self) -> dict:
+        rows = self.query("SELECT label AS k, count(*) AS n FROM nodes GROUP BY label")
+        rows += self.query("SELECT type AS k, count(*) AS n FROM edges GROUP BY type")
+        return {row["k"]: row["n"] for row in rows}
+
+    def kinship_paths(self, name: str, max_depth: int = 3, rel_types=None) -> list:
+        """
+        Semua orang yang terhubung ke `name` lewat relasi kekerabatan (dua arah)
+        sampai `max_depth` langkah. BFS per kedalaman: tiap node dikunjungi
+        sekali (kedalaman minimum), tiap langkah satu query edge untuk frontier,
+        jadi biayanya sebanding jumlah node terjangkau, bukan jumlah jalur.
+        Per orang: jarak terpendek + satu jalur {"name", "depth", "path":
+        [nama...], "relations": [...]} dengan relasi bertanda arah, mis.
+        "PARENT_OF>" (maju) / "PARENT_OF<" (mundur).
+        """
+        rel_types = list(rel_types or KINSHIP_REL_TYPES)
+        marks = ",".join("?" * len(rel_types))
+        start = self.query("SELECT id FROM nodes WHERE label = 'Person' AND name = ?", name)
+        if not start:
+            return []
+        root = start[0]["id"]
+
+        # node -> (node sebelumnya, relasi bertanda arah, kedalaman)
+        visited = {root: (None, None, 0)}
+        frontier = [root]
+        for depth in range(1, int(max_depth) + 1):
+            if not frontier:
+                break
+            frontier_set = set(frontier)
+            found = {}
+            for offset in range(0, len(frontier), 500):
+                chunk = frontier[offset:offset + 500]
+                chunk_marks = ",".join("?" * len(chunk))
+                for edge in self.query(
+                    f"""
+                    SELECT src, dst, type FROM edges
+                    WHERE type IN ({marks}) AND (src IN ({chunk_marks}) OR dst IN ({chunk_marks}))
+                    ORDER BY src, dst, type
+                    """,
+                    *rel_types, *chunk, *chunk,
+                ):
+                    if edge["src"] in frontier_set and edge["dst"] not in visited:
+                        found.setdefault(edge["dst"], (edge["src"], edge["type"] + ">", depth))
+                    if edge["dst"] in frontier_set and edge["src"] not in visited:
+                        found.setdefault(edge["src"], (edge["dst"], edge["type"] + "<", depth))
+            visited.update(found)
+            frontier = sorted(found)
+
+        ids = sorted(visited)
+        names = {}
+        for offset in range(0, len(ids), 500):
+            chunk = ids[offset:offset + 500]
+            for r in self.query(
+                f"SELECT id, name FROM nodes WHERE id IN ({','.join('?' * len(chunk))})", *chunk
+            ):
+                names[r["id"]] = r["name"]
+
+        results = []
+        for node, (_, _, depth) in sorted(visited.items(), key=lambda item: (item[1][2], item[0])):
+            if node == root:
+                continue
+            path, relations = [node], []
+            current = node
+            while current != root:
+                previous, relation, _ = visited[current]
+                path.append(previous)
+                relations.append(relation)
+                current = previous
+            results.append({
+                "name": names[node],
+                "depth": depth,
+                "path": [names[i] for i in reversed(path)],
+                "relations": relations[::-1],
+            })
+        return results
+
+
+def open_sqlite_graph(path: str = None) -> SqliteGraph:
+    return SqliteGraph(path or SQLITE_GRAPH_PATH)
+
+
+# ==================================================
+# 18. MATERIALISASI SENTRALITAS: PAGERANK, DEGREE, BETWEENNESS
+# ==================================================
+# Skor dihitung di luar database atas graf kekerabatan + partai (Person &
+# Party, relasi dianggap tak berarah), lalu ditulis balik sebagai properti
+# node per batch. Agent 5 cukup ORDER BY p.pagerank (ada index) untuk
+# pertanyaan "siapa paling berpengaruh di partai X", tanpa algoritma graf
+# ad-hoc. PageRank memakai power iteration di matriks sparse (scipy) dan
+# mulai dari skor run sebelumnya, jadi refresh berkala cepat konvergen.
+
+CENTRALITY_REL_TYPES = KINSHIP_REL_TYPES + ["MEMBER_OF"]
+CENTRALITY_LABELS = ["Person", "Party"]
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-10
+# Betweenness dihitung dari sampel sumber (Brandes); 0 = semua node (eksak)
+CENTRALITY_BETWEENNESS_SAMPLES = int(os.environ.get("CENTRALITY_BETWEENNESS_SAMPLES", "256"))
+
+
+def _require_scipy():
+    try:
+        import numpy  # noqa: F401
+        import scipy.sparse  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Perhitungan sentralitas butuh numpy + scipy: pip install scipy") from e
+
+
+def read_centrality_graph(graph):
+    """
+    Return (edges, previous): edges = [(label_a, nama_a, label_b, nama_b)],
+    previous = {(label, nama): pagerank} dari run sebelumnya.
+    """
+    return (
+        graph.read_edges(CENTRALITY_REL_TYPES),
+        graph.read_node_property("pagerank", CENTRALITY_LABELS),
+    )
+
+
+def build_adjacency(edges):
+    """
+    Edge list -> (nodes, A): nodes = [(label, nama)], A = matriks CSR simetris
+    0/1 (relasi ganda digabung, self-loop dibuang).
+    """
+    import numpy as np
+    import scipy.sparse as sp
+
+    index = {}
+    rows, cols = [], []
+    for a_label, a_name, b_label, b_name in edges:
+        a = index.setdefault((a_label, a_name), len(index))
+        b = index.setdefault((b_label, b_name), len(index))
+        if a != b:
+            rows.extend((a, b))
+            cols.extend((b, a))
+    n = len(index)
+    A = sp.csr_matrix(
+        (np.ones(len(rows)), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(n, n),
+    )
+    A.sum_duplicates()
+    A.data[:] = 1.0
+    return list(index), A
+
+
+def pagerank_scores(A, x0=None, damping=PAGERANK_DAMPING, tol=PAGERANK_TOLERANCE, max_iter=200):
+    """
+    PageRank dengan power iteration: x <- d·Aᵀ(x/deg) + (d·massa dangling + 1-d)/n.
+    x0 = skor awal (warm start), dinormalisasi ke jumlah 1.
+    Return (x, jumlah iterasi); jumlah x = 1.
+    """
+    import numpy as np
+
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0), 0
+    deg = np.asarray(A.sum(axis=1)).ravel()
+    inv_deg = np.divide(1.0, deg, out=np.zeros(n), where=deg > 0)
+    dangling = deg == 0
+    AT = A.T.tocsr()
+
+    if x0 is None or not np.isfinite(x0).all() or x0.sum() <= 0:
+        x = np.full(n, 1.0 / n)
+    else:
+        x = np.asarray(x0, dtype=float) / x0.sum()
+
+    for iteration in range(1, max_iter + 1):
+        y = damping * (AT @ (x * inv_deg))
+        y += (damping * x[dangling].sum() + (1.0 - damping)) / n
+        err = np.abs(y - x).sum()
+        x = y
+        if err < n * tol:
+            break
+    return x, iteration
+
+
+def betweenness_scores(A, samples=CENTRALITY_BETWEENNESS_SAMPLES, batch=32, seed=0):
+    """
+    Betweenness Brandes (graf tak berarah, ternormalisasi seperti networkx)
+    dalam bentuk matriks: BFS beberapa sumber sekaligus (kolom matriks padat
+    n×batch), jumlah jalur terpendek lewat A @ frontier, lalu akumulasi
+    dependensi mundur per level. samples < n -> estimasi dari sumber acak.
+    """
+    import numpy as np
+
+    n = A.shape[0]
+    bc = np.zeros(n)
+    if n < 3:
+        return bc
+    if samples and samples < n:
+        sources = np.random.default_rng(seed).choice(n, size=samples, replace=False)
+    else:
+        sources = np.arange(n)
+
+    for start in range(0, len(sources), batch):
+        src = sources[start:start + batch]
+        cols = np.arange(len(src))
+        sigma = np.zeros((n, len(src)))
+        sigma[src, cols] = 1.0
+        depth = np.full((n, len(src)), -1, dtype=np.int32)
+        depth[src, cols] = 0
+
+        frontier = sigma.copy()
+        level = 0
+        while True:
+            nxt = A @ frontier
+            nxt[depth >= 0] = 0.0
+            reached = nxt > 0
+            if not reached.any():
+                break
+            level += 1
+            depth[reached] = level
+            sigma[reached] = nxt[reached]
+            frontier = nxt
+
+        delta = np.zeros_like(sigma)
+        safe_sigma = np.where(sigma > 0, sigma, 1.0)
+        for lvl in range(level, 0, -1):
+            w = np.where(depth == lvl, (1.0 + delta) / safe_sigma, 0.0)
+            parents = depth == lvl - 1
+            delta[parents] += (A @ w)[parents] * sigma[parents]
+        delta[src, cols] = 0.0
+        bc += delta.sum(axis=1)
+
+    bc *= n / len(sources)  # skala sampel -> semua sumber
+    bc /= 2.0  # tak berarah: tiap pasangan terhitung dua kali
+    bc /= (n - 1) * (n - 2) / 2.0
+    return bc
+
+
+def compute_centrality(edges, previous=None, samples=CENTRALITY_BETWEENNESS_SAMPLES, adjacency=None):
+    """
+    Return (rows per label, info): rows = {label: [{name, pagerank, degree,
+    betweenness}]}. pagerank disimpan dengan skala rata-rata 1 (x·n), supaya
+    nilainya tidak mengecil saat graf membesar. adjacency = (nodes, A) yang
+    sudah jadi (mis. GraphSnapshot.adjacency()); jika diisi, edges diabaikan.
+    """
+    import numpy as np
+
+    _require_scipy()
+    nodes, A = adjacency if adjacency is not None else build_adjacency(edges)
+    n = len(nodes)
+    x0 = None
+    if previous and n:
+        # Warm start: skor lama (skala x·n) untuk node lama, 1 untuk node baru
+        x0 = np.array([float(previous.get(node, 1.0)) for node in nodes])
+
+    with PROFILER.stage("centrality"):
+        pr, iterations = pagerank_scores(A, x0=x0)
+        degree = np.diff(A.indptr)
+        bc = betweenness_scores(A, samples=samples)
+
+    rows = {label: [] for label in CENTRALITY_LABELS}
+    for i, (label, name) in enumerate(nodes):
+        if label in rows:
+            rows[label].append({
+                "name": name,
+                "pagerank": float(pr[i] * n),
+                "degree": int(degree[i]),
+                "betweenness": float(bc[i]),
+            })
+    info = {"nodes": n, "edges": int(A.nnz // 2), "pagerank_iterations": iterations,
+            "warm_start": x0 is not None}
+    return rows, info
+
+
+def ensure_centrality_indexes(graph):
+    # Index supaya "ORDER BY p.pagerank DESC" & lookup nama tidak scan semua node
+    graph.ensure_property_indexes(CENTRALITY_LABELS, ["pagerank"])
+
+
+def write_centrality(graph, rows, previous=None, batch_size: int = KG_BATCH_SIZE):
+    """
+    Tulis skor per batch. Node yang punya skor lama tapi tidak lagi ada di
+    graf sentralitas (mis. relasinya dihapus) dikosongkan skornya.
+    """
+    computed_at = int(time.time() * 1000)
+    rows = {label: list(label_rows) for label, label_rows in rows.items()}
+    current = {(label, r["name"]) for label, label_rows in rows.items() for r in label_rows}
+    for label, name in previous or {}:
+        if (label, name) not in current and label in rows:
+            rows[label].append({"name": name, "pagerank": None, "degree": None, "betweenness": None})
+
+    batch_size = max(1, int(batch_size))
+    for label, label_rows in rows.items():
+        for start in range(0, len(label_rows), batch_size):
+            graph.set_node_properties(label, [
+                {**r, "centrality_at": computed_at if r["pagerank"] is not None else None}
+                for r in label_rows[start:start + batch_size]
+            ])
+
+
+def refresh_centrality(graph=None, samples=CENTRALITY_BETWEENNESS_SAMPLES,
+                       batch_size: int = KG_BATCH_SIZE, snapshot=None) -> dict:
+    """
+    Satu siklus materialisasi: baca graf -> hitung -> tulis balik. Return info run.
+    snapshot = GraphSnapshot / folder snapshot: graf dibaca dari situ, bukan dari database.
+    """
+    graph = graph or get_driver()
+    started = time.perf_counter()
+    if snapshot is not None:
+        if not isinstance(snapshot, GraphSnapshot):
+            snapshot = GraphSnapshot.load(snapshot)
+        previous = snapshot.previous_pagerank()
+        rows, info = compute_centrality(None, previous, samples=samples, adjacency=snapshot.adjacency())
+    else:
+        edges, previous = read_centrality_graph(graph)
+        rows, info = compute_centrality(edges, previous, samples=samples)
+    ensure_centrality_indexes(graph)
+    write_centrality(graph, rows, previous, batch_size=batch_size)
+    info["seconds"] = round(time.perf_counter() - started, 3)
+    for label in CENTRALITY_LABELS:
+        top = sorted(rows[label], key=lambda r: -r["pagerank"])[:5]
+        info[f"top_{label.lower()}"] = [(r["name"], round(r["pagerank"], 3)) for r in top]
+    return info
+
+
+# ==================================================
+# 19. RELASI KEKERABATAN TURUNAN (KAKEK/NENEK, MERTUA, IPAR)
+# ==================================================
+# Pertanyaan multi-hop ("cucu X", "mertua X", "ipar X") jadi lookup satu
+# langkah: relasi turunan disimpan sebagai relasi bertipe dengan provenance
+# (derived = true, rule, via = daftar orang perantara). Dihitung ulang
+# secara inkremental tiap kali relasi dasar ditulis (Agent 2, build-kg,
+# sync); `derive-kinship` menghitung ulang semuanya.
+
+# Tipe turunan -> aturan (dua relasi dasar lewat satu perantara "via")
+DERIVED_KINSHIP_RULES = {
+    "GRANDPARENT_OF": "PARENT_OF>PARENT_OF",  # kakek/nenek -> cucu
+    "PARENT_IN_LAW_OF": "PARENT_OF>SPOUSE_OF",  # mertua -> menantu
+    "SIBLING_IN_LAW_OF": "SIBLING_OF>SPOUSE_OF",  # ipar, tanpa arah (nama urut abjad)
+}
+DERIVED_KINSHIP_BASE_TYPES = ["PARENT_OF", "SPOUSE_OF", "SIBLING_OF"]
+DERIVED_KINSHIP_ENABLED = os.environ.get("DERIVED_KINSHIP", "1") != "0"
+
+
+def derive_kinship_edges(base, middles=None) -> dict:
+    """
+    base = [(tipe, awal, akhir, ...)] relasi dasar. Return {(tipe_turunan,
+    a, c): {via, ...}} untuk perantara di `middles` (None = semua orang).
+    """
+    parents, children, spouses, siblings = {}, {}, {}, {}
+    for rel_type, a, c, *_ in base:
+        if a == c:
+            continue
+        if rel_type == "PARENT_OF":
+            children.setdefault(a, set()).add(c)
+            parents.setdefault(c, set()).add(a)
+        elif rel_type == "SPOUSE_OF":
+            spouses.setdefault(a, set()).add(c)
+            spouses.setdefault(c, set()).add(a)
+        elif rel_type == "SIBLING_OF":
+            siblings.setdefault(a, set()).add(c)
+            siblings.setdefault(c, set()).add(a)
+
+    derived = {}
+
+    def add(rel_type, a, c, via):
+        if a != c:
+            derived.setdefault((rel_type, a, c), set()).add(via)
+
+    if middles is None:
+        middles = set(parents) | set(siblings)
+    for b in middles:
+        for a in parents.get(b, ()):
+            for c in children.get(b, ()):
+                add("GRANDPARENT_OF", a, c, b)
+            for c in spouses.get(b, ()):
+                add("PARENT_IN_LAW_OF", a, c, b)
+        for a in siblings.get(b, ()):
+            for c in spouses.get(b, ()):
+                add("SIBLING_IN_LAW_OF", *sorted((a, c)), b)
+    return derived
+
+
+def read_kinship_relations(graph, rel_types, names=None) -> list:
+    """
+    Relasi Person–Person bertipe `rel_types`: [(tipe, awal, akhir, via, label)],
+    label = relation_label (atau note). names = hanya relasi yang menyentuh
+    salah satu nama tsb. (lewat index nama).
+    """
+    return graph.read_relations(rel_types, names)
+
+
+def read_derived_via(graph, names) -> list:
+    # Relasi turunan yang perantaranya (via) ada di `names`
+    rel_types = list(DERIVED_KINSHIP_RULES)
+    return graph.read_relations_via(rel_types, names)
+
+
+def _write_derived_batch(tx, rel_type, rule, upserts, deletes, derived_at):
+    if upserts:
+        run_statement(
+            tx,
+            "kinship_derive_upsert",
+            f"""
+            UNWIND $rows AS row
+            MATCH (a:Person {{name: row.a}}), (c:Person {{name: row.c}})
+            MERGE (a)-[d:{rel_type}]->(c)
+            ON CREATE SET d.created_at = $derived_at
+            SET d.derived = true, d.rule = $rule, d.via = row.via, d.derived_at = $derived_at
+            """,
+            rows=upserts,
+            rule=rule,
+            derived_at=derived_at,
+        )
+    if deletes:
+        run_statement(
+            tx,
+            "kinship_derive_delete",
+            f"""
+            UNWIND $rows AS row
+            MATCH (:Person {{name: row.a}})-[d:{rel_type}]->(:Person {{name: row.c}})
+            DELETE d
+            """,
+            rows=deletes,
+        )
+
+
+def write_derived_kinship(graph, upserts: dict, deletes, batch_size: int = KG_BATCH_SIZE):
+    """
+    upserts = {(tipe, a, c): [via...]} (via ditimpa), deletes = [(tipe, a, c)].
+    """
+    derived_at = int(time.time() * 1000)
+    by_type = {rel_type: ([], []) for rel_type in DERIVED_KINSHIP_RULES}
+    for (rel_type, a, c), via in upserts.items():
+        by_type[rel_type][0].append({"a": a, "c": c, "via": via})
+    for rel_type, a, c in deletes:
+        by_type[rel_type][1].append({"a": a, "c": c})
+
+    batch_size = max(1, int(batch_size))
+    for rel_type, (ups, dels) in by_type.items():
+        for start in range(0, max(len(ups), len(dels)), batch_size):
+            graph.write_derived_edges(
+                rel_type, DERIVED_KINSHIP_RULES[rel_type],
+                ups[start:start + batch_size], dels[start:start + batch_size], derived_at,
             )
-            while True:
-                q = input("Pertanyaan: ").strip()
-                if not q:
+    get_kinship_index.cache_clear()
+
+
+def update_derived_kinship(graph, touched=None) -> dict:
+    """
+    Hitung ulang relasi turunan. touched = nama yang relasi dasarnya baru
+    ditulis/dihapus (kedua ujung untuk relasi baru); None = hitung ulang semua.
+
+    Inkremental: perantara yang perlu dihitung ulang = touched + via dari
+    relasi turunan yang menyentuh touched. Hanya relasi di sekitar mereka yang
+    dibaca; via lama di luar himpunan itu tetap sah, jadi hanya selisihnya
+    yang ditulis. Return {added, changed, deleted}.
+    """
+    derived_types = list(DERIVED_KINSHIP_RULES)
+    if touched is None:
+        middles = None
+        derived = derive_kinship_edges(read_kinship_relations(graph, DERIVED_KINSHIP_BASE_TYPES))
+        existing = read_kinship_relations(graph, derived_types)
+    else:
+        touched = sorted({name for name in touched if name})
+        if not touched:
+            return {"added": 0, "changed": 0, "deleted": 0}
+        incident = read_kinship_relations(graph, derived_types, touched)
+        middles = set(touched) | {v for _, _, _, via, _ in incident for v in via or ()}
+        base = read_kinship_relations(graph, DERIVED_KINSHIP_BASE_TYPES, sorted(middles))
+        derived = derive_kinship_edges(base, middles)
+        # Relasi turunan lama yang mungkin berubah: via di middles, atau kunci yang baru diturunkan
+        existing = read_derived_via(graph, sorted(middles)) + read_kinship_relations(
+            graph, derived_types, sorted({a for _, a, _ in derived})
+        )
+
+    old = {(rel_type, a, c): set(via or ()) for rel_type, a, c, via, _ in existing}
+    upserts, deletes = {}, []
+    stats = {"added": 0, "changed": 0, "deleted": 0}
+    for key in set(old) | set(derived):
+        kept = old.get(key, set()) - middles if middles is not None else set()
+        via = kept | derived.get(key, set())
+        if not via:
+            if key in old:
+                deletes.append(key)
+                stats["deleted"] += 1
+        elif via != old.get(key):
+            upserts[key] = sorted(via)
+            stats["changed" if key in old else "added"] += 1
+
+    if upserts or deletes:
+        write_derived_kinship(graph, upserts, deletes)
+    for key, value in stats.items():
+        METRICS.inc("derived_kinship_edges_total", value, status=key)
+    return stats
+
+
+def derived_kinship_touched(families, person_name=None) -> list:
+    # Nama yang relasi dasarnya (PARENT_OF/SPOUSE_OF/SIBLING_OF) baru ditulis Agent 2
+    names = [
+        (fam.get("name") or "").strip()
+        for fam in families or []
+        if family_relation_type((fam.get("relation") or "").strip().lower())[0]
+        in DERIVED_KINSHIP_BASE_TYPES
+    ]
+    names = [name for name in names if name]
+    return [person_name, *names] if names else []
+
+
+# ==================================================
+# 20. LAYANAN JALUR KEKERABATAN (BFS DUA ARAH, IN-MEMORY)
+# ==================================================
+# "Bagaimana A berhubungan dengan B?" dijawab tanpa shortestPath Cypher:
+# relasi keluarga dimuat sekali ke index adjacency (id integer + label
+# relasi per arah), lalu BFS dua arah dari A dan B. Hasilnya rantai yang
+# bisa dibaca: "istri → ayah → saudara" = ayah dari istri A adalah saudara B.
+# Dipakai Agent 5 (tool find_kinship_path) dan lewat kinship_path().
+
+KINSHIP_PATH_MAX_DEPTH = int(os.environ.get("KINSHIP_PATH_MAX_DEPTH", "6"))
+# "graph" = baca dari graf (get_driver()), folder snapshot graf (lihat
+# GraphSnapshot), atau path CSV/.parquet enriched
+KINSHIP_INDEX_SOURCE = os.environ.get("KINSHIP_INDEX_SOURCE", "graph")
+
+# B adalah <label> dari A  ->  A adalah <kebalikan> dari B
+KINSHIP_INVERSE_LABELS = {
+    "istri": "suami", "suami": "istri", "pasangan": "pasangan",
+    "mantan istri": "mantan suami", "mantan suami": "mantan istri",
+    "ayah": "anak", "ibu": "anak", "orang tua": "anak",
+    "anak": "orang tua", "putra": "orang tua", "putri": "orang tua", "anak angkat": "orang tua angkat",
+    "kakak": "adik", "abang": "adik", "adik": "kakak",
+    "saudara": "saudara", "saudara kandung": "saudara kandung", "saudara seibu": "saudara seibu",
+    "kakek": "cucu", "nenek": "cucu", "cucu": "kakek/nenek", "kakek buyut": "cicit",
+    "paman": "keponakan", "bibi": "keponakan", "keponakan": "paman/bibi", "sepupu": "sepupu",
+    "menantu": "mertua", "mertua": "menantu", "ayah mertua": "menantu", "ibu mertua": "menantu",
+    "ipar": "ipar", "kakak ipar": "adik ipar", "adik ipar": "kakak ipar", "besan": "besan",
+}
+# Label default per tipe relasi jika relation_label/note kosong
+KINSHIP_DEFAULT_LABELS = {
+    "SPOUSE_OF": "pasangan", "SIBLING_OF": "saudara", "IN_LAW_OF": "ipar", "FAMILY_OF": "kerabat",
+}
+
+
+def kinship_edge_labels(rel_type: str, label=None):
+    """
+    Relasi (awal)-[rel_type {label}]->(akhir) -> (akhir adalah X dari awal,
+    awal adalah Y dari akhir). label = relation_label/note, mis. "istri" atau
+    "anak, dari Fatmawati" (yang dipakai hanya bagian sebelum koma).
+    """
+    text = str(label or "").split(",")[0].strip().lower()
+    if text == "suami/istri":
+        text = "pasangan"
+    if rel_type == "PARENT_OF":
+        # Selalu orang tua -> anak; label-nya menyebut salah satu sisi
+        forward = text if text in ("putra", "putri", "anak angkat") else "anak"
+        backward = text if text in ("ayah", "ibu") else "orang tua"
+        return forward, backward
+    forward = text or KINSHIP_DEFAULT_LABELS.get(rel_type, "kerabat")
+    return forward, KINSHIP_INVERSE_LABELS.get(forward, "kerabat")
+
+
+class KinshipIndex:
+    """
+    Index adjacency kekerabatan di memori: nama di-intern jadi id integer,
+    adj[id] = [(tetangga, label ke tetangga, label dari tetangga), ...].
+    Read-only setelah dibangun, jadi aman dipakai bersama banyak thread.
+    """
+
+    def __init__(self):
+        self.names = []  # id -> nama
+        self.ids = {}  # nama -> id
+        self._folded = {}  # nama casefold -> id (fallback lookup)
+        self.adj = []
+        self._labels = {}  # intern string label
+
+    def _node(self, name: str) -> int:
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.adj.append([])
+            self._folded.setdefault(" ".join(name.split()).casefold(), node)
+        return node
+
+    def add_relation(self, rel_type: str, start: str, end: str, label=None):
+        start, end = str(start).strip(), str(end).strip()
+        if not start or not end or start == end:
+            return
+        forward, backward = kinship_edge_labels(rel_type, label)
+        forward = self._labels.setdefault(forward, forward)
+        backward = self._labels.setdefault(backward, backward)
+        a, c = self._node(start), self._node(end)
+        if any(v == c for v, _, _ in self.adj[a]):
+            return  # relasi ganda antar pasangan orang yang sama: cukup satu
+        self.adj[a].append((c, forward, backward))
+        self.adj[c].append((a, backward, forward))
+
+    @classmethod
+    def from_relations(cls, relations):
+        # relations: [(tipe, awal, akhir, via, label)] seperti read_kinship_relations()
+        index = cls()
+        for rel_type, start, end, _, label in relations:
+            index.add_relation(rel_type, start, end, label)
+        return index
+
+    @classmethod
+    def from_records(cls, records):
+        # Record KG dari CSV: Pasangan -> SPOUSE_OF, Keluarga -> FAMILY_OF
+        index = cls()
+        for r in records:
+            for s in r["spouses"]:
+                index.add_relation("SPOUSE_OF", r["nama"], s["name"], s["rel_label"])
+            for f in r["families"]:
+                index.add_relation("FAMILY_OF", r["nama"], f["name"], f["note"])
+        return index
+
+    @classmethod
+    def from_enriched(cls, csv_path: str):
+        df = read_enriched_table(csv_path, columns=["Nama", "Pasangan", "Keluarga"])
+        records = []
+        for _, row in df.iterrows():
+            record = kg_record_from_row(row)
+            if record is not None:
+                records.append(record)
+        return cls.from_records(records)
+
+    @classmethod
+    def from_graph(cls, graph):
+        return cls.from_relations(read_kinship_relations(graph, KINSHIP_REL_TYPES))
+
+    @classmethod
+    def from_snapshot(cls, path: str):
+        return cls.from_relations(GraphSnapshot.load(path).kinship_relations())
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name: str):
+        name = str(name or "").strip()
+        node = self.ids.get(name)
+        if node is None:
+            node = self._folded.get(" ".join(name.split()).casefold())
+        return node
+
+    def _expand(self, frontier, seen, other, backward):
+        # Satu level BFS; return (frontier baru, node pertemuan atau None)
+        nxt = []
+        for u in frontier:
+            for v, to_v, from_v in self.adj[u]:
+                if v in seen:
                     continue
-                if q.lower() in ("exit", "quit", "keluar", "q"):
-                    print("Keluar dari mode Agent 5.")
-                    break
-                run_agent5_qa(q)
-        finally:
-            driver.close()
+                # seen[v] = (node sebelumnya, label langkah sesuai arah jalur A -> B)
+                seen[v] = (u, from_v if backward else to_v)
+                if v in other:
+                    return nxt, v
+                nxt.append(v)
+        return nxt, None
+
+    def path(self, person_a: str, person_b: str, max_depth: int = KINSHIP_PATH_MAX_DEPTH) -> dict:
+        """
+        Jalur terpendek A -> B: {"found", "from", "to", "hops", "path": [nama...],
+        "relations": [label...], "chain": "istri → ayah"}. Label ke-i = orang
+        ke-(i+1) adalah <label> dari orang ke-i.
+        """
+        source, target = self.lookup(person_a), self.lookup(person_b)
+        result = {"found": False, "from": person_a, "to": person_b}
+        missing = [name for name, node in ((person_a, source), (person_b, target)) if node is None]
+        if missing:
+            result["error"] = f"Nama tidak ada di index kekerabatan: {', '.join(missing)}"
+            return result
+        result["from"], result["to"] = self.names[source], self.names[target]
+
+        seen_a, seen_b = {source: None}, {target: None}
+        meet = source if source == target else None
+        front_a, front_b = [source], [target]
+        depth = 0
+        while meet is None and front_a and front_b and depth < max_depth:
+            depth += 1
+            # Kembangkan sisi dengan frontier lebih kecil
+            if len(front_a) <= len(front_b):
+                front_a, meet = self._expand(front_a, seen_a, seen_b, backward=False)
+            else:
+                front_b, meet = self._expand(front_b, seen_b, seen_a, backward=True)
+        if meet is None:
+            return result
+
+        nodes, labels = [meet], []
+        step = seen_a[meet]
+        while step is not None:
+            nodes.append(step[0])
+            labels.append(step[1])
+            step = seen_a[step[0]]
+        nodes.reverse()
+        labels.reverse()
+        step = seen_b[meet]
+        while step is not None:
+            nodes.append(step[0])
+            labels.append(step[1])
+            step = seen_b[step[0]]
+
+        result.update({
+            "found": True,
+            "hops": len(labels),
+            "path": [self.names[n] for n in nodes],
+            "relations": labels,
+            "chain": " → ".join(labels),
+        })
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_kinship_index(source: str = None) -> KinshipIndex:
+    # Dibangun sekali per proses & sumber; writer graf memanggil
+    # get_kinship_index.cache_clear() setelah menulis relasi kekerabatan
+    source = source or KINSHIP_INDEX_SOURCE
+    with METRICS.timer("stage_seconds", stage="kinship_index"):
+        if source == "graph":
+            return KinshipIndex.from_graph(get_driver())
+        if is_graph_snapshot(source):
+            return KinshipIndex.from_snapshot(source)
+        return KinshipIndex.from_enriched(source)
+
+
+def kinship_path(
+    person_a: str, person_b: str, max_depth: int = KINSHIP_PATH_MAX_DEPTH, source: str = None
+) -> dict:
+    """
+    API Python: jalur kekerabatan terpendek antara dua orang (lihat KinshipIndex.path).
+    source = "graph", folder snapshot graf, atau path CSV/.parquet enriched;
+    default KINSHIP_INDEX_SOURCE.
+    """
+    index = get_kinship_index(source)
+    with METRICS.timer("kinship_path_seconds"):
+        return index.path(person_a, person_b, max_depth=max_depth)
+
+
+def find_kinship_path(person_a: str, person_b: str) -> str:
+    """
+    Tool Agent 5:
+    Cari hubungan keluarga terpendek antara dua orang (mis. "bagaimana A
+    berhubungan dengan B?"). Kembalikan JSON: found, path (nama-nama di jalur),
+    relations, dan chain seperti "istri → ayah → saudara" (orang berikutnya
+    adalah <relasi> dari orang sebelumnya).
+    """
+    return json.dumps(kinship_path(person_a, person_b), ensure_ascii=False)
+
+
+# ==================================================
+# 21. PROYEKSI JARINGAN CO-ALUMNI & CO-JABATAN (MATRIKS SPARSE)
+# ==================================================
+# Matriks insiden B (orang × institusi) dari ALUMNI_OF / HOLDS_POSITION,
+# lalu B·Bᵀ per potongan baris = bobot orang–orang (jumlah institusi bersama,
+# diberi bobot idf supaya institusi kecil lebih bermakna). Per orang hanya
+# top-k tetangga yang disimpan. Institusi yang terlalu umum (mis. "DPR RI",
+# dipegang hampir semua anggota) dilewati: selain tidak informatif, ia
+# membuat hasil kali jadi padat (n²).
+
+PROJECTION_KINDS = {
+    "alumni": ("educations", "CO_ALUMNI"),
+    "position": ("positions", "CO_POSITION"),
+}
+PROJECTION_TOP_K = int(os.environ.get("PROJECTION_TOP_K", "20"))
+PROJECTION_MAX_GROUP = int(os.environ.get("PROJECTION_MAX_GROUP", "500"))
+PROJECTION_CHUNK_NNZ = 5000000  # perkiraan nnz maksimum per potongan hasil kali
+
+
+def incidence_matrix(records, field: str):
+    """
+    Return (people, institutions, B): B CSR biner, B[i, k] = 1 jika orang i
+    punya institusi k di record[field] (nama kanonik).
+    """
+    import numpy as np
+    import scipy.sparse as sp
+
+    people, institutions = {}, {}
+    rows, cols = [], []
+    for r in records:
+        i = people.setdefault(r["nama"], len(people))
+        for name in r[field]:
+            rows.append(i)
+            cols.append(institutions.setdefault(name, len(institutions)))
+    B = sp.csr_matrix(
+        (np.ones(len(rows)), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(people), len(institutions)),
+    )
+    B.sum_duplicates()
+    B.data[:] = 1.0
+    return list(people), list(institutions), B
+
+
+def project_cooccurrence(B, top_k: int = PROJECTION_TOP_K, max_group: int = PROJECTION_MAX_GROUP,
+                         chunk_nnz: int = PROJECTION_CHUNK_NNZ):
+    """
+    B·Bᵀ dengan bobot idf per institusi (log(n / ukuran)), dihitung per
+    potongan baris (perkiraan nnz hasil <= `chunk_nnz`) supaya memori
+    terbatas. Return (i, j, weight) dengan i < j: pasangan disimpan jika j
+    termasuk top-k tetangga i atau sebaliknya.
+    """
+    import numpy as np
+    import scipy.sparse as sp
+
+    n = B.shape[0]
+    sizes = np.asarray(B.sum(axis=0)).ravel()
+    keep = (sizes >= 2) & (sizes <= max_group)
+    idf = np.zeros_like(sizes)
+    idf[keep] = np.log(n / sizes[keep]) + 1.0
+    # Kolom diskalakan sqrt(idf) -> (W·Wᵀ)[i, j] = Σ idf institusi bersama
+    W = (B @ sp.diags(np.sqrt(idf))).tocsr()
+    W.eliminate_zeros()
+    WT = W.T.tocsr()
+
+    # Batas atas nnz baris i hasil kali = Σ ukuran institusi yang dipegang i
+    cost = np.cumsum((W != 0).astype(np.float64) @ np.where(keep, sizes, 0.0))
+    pairs = {}
+    start = 0
+    while start < n:
+        done = cost[start - 1] if start else 0.0
+        end = max(start + 1, int(np.searchsorted(cost, done + chunk_nnz, side="right")))
+        C = (W[start:end] @ WT).tocsr()
+        for offset in range(C.shape[0]):
+            i = start + offset
+            lo, hi = C.indptr[offset], C.indptr[offset + 1]
+            cols, vals = C.indices[lo:hi], C.data[lo:hi]
+            mask = cols != i
+            cols, vals = cols[mask], vals[mask]
+            if len(cols) > top_k:
+                best = np.argpartition(-vals, top_k - 1)[:top_k]
+                cols, vals = cols[best], vals[best]
+            for j, w in zip(cols.tolist(), vals.tolist()):
+                pairs[(min(i, j), max(i, j))] = w
+        start = end
+    return [(i, j, w) for (i, j), w in sorted(pairs.items())]
+
+
+def build_projection(records, kind: str, top_k: int = PROJECTION_TOP_K,
+                     max_group: int = PROJECTION_MAX_GROUP) -> list:
+    """
+    Return [{"a", "c", "weight", "shared_count", "shared": [institusi...]}]
+    untuk jenis proyeksi `kind` ("alumni" / "position").
+    """
+    _require_scipy()
+    field, _ = PROJECTION_KINDS[kind]
+    with PROFILER.stage(f"projection_{kind}"):
+        people, institutions, B = incidence_matrix(records, field)
+        pairs = project_cooccurrence(B, top_k=top_k, max_group=max_group)
+
+        sizes = B.getnnz(axis=0)
+        holdings = [
+            {institutions[k] for k in B.indices[B.indptr[i]:B.indptr[i + 1]] if sizes[k] <= max_group}
+            for i in range(B.shape[0])
+        ]
+        rows = []
+        for i, j, weight in pairs:
+            shared = sorted(holdings[i] & holdings[j])
+            a, c = sorted((people[i], people[j]))  # tanpa arah: nama urut abjad
+            rows.append({
+                "a": a,
+                "c": c,
+                "weight": round(weight, 4),
+                "shared_count": len(shared),
+                "shared": shared,
+            })
+    return rows
+
+
+def _write_person_edges_batch(tx, rel_type, upserts, deletes):
+    if upserts:
+        run_statement(
+            tx,
+            "projection_upsert",
+            f"""
+            UNWIND $rows AS row
+            MATCH (a:Person {{name: row.a}}), (c:Person {{name: row.c}})
+            MERGE (a)-[r:{rel_type}]->(c)
+            SET r += row.props
+            """,
+            rows=upserts,
+        )
+    if deletes:
+        run_statement(
+            tx,
+            "projection_delete",
+            f"""
+            UNWIND $rows AS row
+            MATCH (:Person {{name: row.a}})-[r:{rel_type}]->(:Person {{name: row.c}})
+            DELETE r
+            """,
+            rows=deletes,
+        )
+
+
+def write_projection(graph, rel_type: str, rows, batch_size: int = KG_BATCH_SIZE) -> dict:
+    """
+    Ganti relasi proyeksi `rel_type` dengan `rows`: semua baris di-upsert per
+    batch, relasi lama yang tidak lagi ada di hasil dihapus.
+    """
+    current = {(r["a"], r["c"]) for r in rows}
+    deletes = [
+        {"a": a, "c": c}
+        for _, a, c, _, _ in read_kinship_relations(graph, [rel_type])
+        if (a, c) not in current
+    ]
+
+    batch_size = max(1, int(batch_size))
+    for start in range(0, max(len(rows), len(deletes)), batch_size):
+        graph.write_person_edges(rel_type, [
+            {"a": r["a"], "c": r["c"], "props": {k: r[k] for k in ("weight", "shared_count", "shared")}}
+            for r in rows[start:start + batch_size]
+        ], deletes[start:start + batch_size])
+    return {"written": len(rows), "deleted": len(deletes)}
+
+
+def export_projection_csv(path: str, rows):
+    # Edge list untuk analisis di luar graf (pandas, Gephi, networkx, ...)
+    import csv
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "target", "weight", "shared_count", "shared"])
+        for r in rows:
+            writer.writerow([r["a"], r["c"], r["weight"], r["shared_count"], "; ".join(r["shared"])])
+
+
+def run_projection(
+    csv_path: str,
+    kinds=("alumni", "position"),
+    top_k: int = PROJECTION_TOP_K,
+    max_group: int = PROJECTION_MAX_GROUP,
+    export_dir: str = None,
+    write: bool = True,
+    max_rows: int = None,
+) -> dict:
+    """
+    Dataset enriched -> proyeksi per jenis; tulis ke graf dan/atau ekspor
+    CSV (<export_dir>/co_<jenis>.csv). Return ringkasan per jenis.
+    """
+    register_canonical_names(csv_path)
+    df = read_enriched_table(csv_path, columns=STRATEGIC_COLUMNS, max_rows=max_rows)
+    records = []
+    for _, row in df.iterrows():
+        record = kg_record_from_row(row)
+        if record is not None:
+            records.append(record)
+
+    summary = {}
+    for kind in kinds:
+        _, rel_type = PROJECTION_KINDS[kind]
+        rows = build_projection(records, kind, top_k=top_k, max_group=max_group)
+        summary[kind] = {"relationship": rel_type, "pairs": len(rows)}
+        if export_dir:
+            os.makedirs(export_dir, exist_ok=True)
+            path = os.path.join(export_dir, f"co_{kind}.csv")
+            export_projection_csv(path, rows)
+            summary[kind]["file"] = path
+        if write:
+            summary[kind].update(write_projection(get_driver(), rel_type, rows))
+    return summary
+
+
+# ==================================================
+# 22. INDEX BIOGRAFI (BM25, SQLITE FTS5) UNTUK AGENT 5
+# ==================================================
+# Teks biografi yang sudah di-cache (BIOGRAPHY_CACHE_DIR) dipecah per
+# paragraf (infobox = satu chunk) dan dimasukkan ke tabel FTS5 di file
+# SQLite; ranking pakai bm25() bawaan FTS5. Inkremental: hanya file cache
+# yang baru/berubah (mtime) yang di-index ulang, yang hilang dihapus.
+# Pertanyaan detail biografi dijawab dari sini dalam milidetik, tanpa
+# scrape ulang Wikipedia.
+
+BIOGRAPHY_INDEX_PATH = os.environ.get("BIOGRAPHY_INDEX_PATH", "biography_index.sqlite")
+BIOGRAPHY_SEARCH_LIMIT = 5
+# Bobot bm25 per kolom (title, section, body): nama orang paling menentukan
+BIOGRAPHY_BM25_WEIGHTS = (5.0, 0.5, 1.0)
+BIOGRAPHY_STOPWORDS = frozenset(
+    "yang dan di ke dari dengan untuk pada dalam ini itu atau adalah sebagai oleh juga "
+    "apa siapa kapan dimana mana bagaimana berapa apakah kah pernah sebelum sesudah "
+    "setelah saat tahun ia dia nya beliau para seorang the of".split()
+)
+
+
+def biography_chunks(text: str) -> list:
+    """
+    Teks hasil fetch_wikipedia_text_with_infobox -> [(section, paragraf)]:
+    seluruh infobox jadi satu chunk "infobox", tiap paragraf artikel satu chunk.
+    """
+    chunks, infobox, section = [], [], "artikel"
+    for line in text.splitlines():
+        line = line.strip()
+        if line == "INFORMASI PRIBADI (INFOBOX)":
+            section = "infobox"
+        elif line == "TEKS ARTIKEL":
+            section = "artikel"
+        elif line:
+            if section == "infobox":
+                infobox.append(line)
+            else:
+                chunks.append(("artikel", line))
+    if infobox:
+        chunks.insert(0, ("infobox", "\n".join(infobox)))
+    return chunks
+
+
+def fts_terms(text: str) -> list:
+    # Kata unik tanpa stopword, dikutip supaya aman dipakai di ekspresi MATCH FTS5
+    import re
+
+    words = [w for w in re.findall(r"\w+", str(text or "").lower()) if w not in BIOGRAPHY_STOPWORDS]
+    return [f'"{w}"' for w in dict.fromkeys(words)]
+
+
+class BiographyIndex:
+    """
+    Index BM25 di satu file SQLite: documents (url, title, mtime, chunks) +
+    tabel virtual FTS5 chunks (title, section, body). Satu koneksi dipakai
+    bersama, dijaga lock (seperti SqliteGraph).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS documents (
+        url TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        mtime REAL NOT NULL,
+        chunks INTEGER NOT NULL,
+        indexed_at INTEGER NOT NULL
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+        title, section, body, url UNINDEXED, para UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    """
+
+    def __init__(self, path: str = BIOGRAPHY_INDEX_PATH):
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+    def update_from_cache(self, cache_dir: str = None) -> dict:
+        """
+        Sinkronkan index dengan isi folder cache biografi.
+        Return {"added", "changed", "deleted", "unchanged", "chunks"}.
+        Tanpa folder cache (BIOGRAPHY_CACHE_DIR kosong) index dibiarkan apa adanya.
+        """
+        cache_dir = cache_dir or BIOGRAPHY_CACHE_DIR
+        stats = {"added": 0, "changed": 0, "deleted": 0, "unchanged": 0, "chunks": 0}
+        if not cache_dir:
+            return stats
+        files = {}
+        if cache_dir and os.path.isdir(cache_dir):
+            for entry in os.scandir(cache_dir):
+                if entry.name.endswith(".json"):
+                    files[entry.path] = entry.stat().st_mtime
+
+        with self._lock:
+            known = {
+                row["url"]: row["mtime"]
+                for row in self._conn.execute("SELECT url, mtime FROM documents")
+            }
+        seen = set()
+        now = int(time.time() * 1000)
+        with self._lock, METRICS.timer("stage_seconds", stage="biography_index"):
+            self._conn.execute("BEGIN")
+            try:
+                for path, mtime in sorted(files.items()):
+                    try:
+                        with open(path, encoding="utf-8") as f:
+                            doc = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    url = doc["url"]
+                    seen.add(url)
+                    if known.get(url) == mtime:
+                        stats["unchanged"] += 1
+                        continue
+                    title = doc.get("title") or wikipedia_title_from_url(url)
+                    chunks = biography_chunks(doc.get("text", ""))
+                    self._conn.execute("DELETE FROM chunks WHERE url = ?", (url,))
+                    self._conn.executemany(
+                        "INSERT INTO chunks (title, section, body, url, para) VALUES (?, ?, ?, ?, ?)",
+                        [(title, section, body, url, i) for i, (section, body) in enumerate(chunks)],
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO documents (url, title, mtime, chunks, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (url, title, mtime, len(chunks), now),
+                    )
+                    stats["changed" if url in known else "added"] += 1
+                    stats["chunks"] += len(chunks)
+                gone = [url for url in known if url not in seen]
+                self._conn.executemany("DELETE FROM chunks WHERE url = ?", [(u,) for u in gone])
+                self._conn.executemany("DELETE FROM documents WHERE url = ?", [(u,) for u in gone])
+                stats["deleted"] = len(gone)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return stats
+
+    def search(self, query: str, person: str = None, limit: int = BIOGRAPHY_SEARCH_LIMIT) -> list:
+        """
+        Chunk paling relevan untuk `query` (BM25). person = batasi ke biografi
+        orang itu (dicocokkan ke kata-kata judul). Return [{"name", "url",
+        "section", "text", "score"}], score makin besar makin relevan.
+        """
+        expression = " OR ".join(fts_terms(query))
+        name = " AND ".join(fts_terms(person))
+        if name:
+            expression = f"title : ({name})" + (f" AND ({expression})" if expression else "")
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT title, url, section, body, bm25(chunks, ?, ?, ?) AS rank
+                FROM chunks WHERE chunks MATCH ?
+                ORDER BY rank LIMIT ?
+                """,
+                (*BIOGRAPHY_BM25_WEIGHTS, expression, int(limit)),
+            ).fetchall()
+        return [
+            {
+                "name": r["title"],
+                "url": r["url"],
+                "section": r["section"],
+                "text": r["body"],
+                "score": round(-r["rank"], 4),
+            }
+            for r in rows
+        ]
+
+
+_biography_index = None
+_biography_index_synced = None
+_biography_index_lock = threading.Lock()
+
+
+def biography_cache_state():
+    # (folder, mtime folder): berubah tiap ada file cache yang ditulis/diganti/dihapus
+    if not BIOGRAPHY_CACHE_DIR:
+        return None
+    try:
+        return BIOGRAPHY_CACHE_DIR, os.stat(BIOGRAPHY_CACHE_DIR).st_mtime_ns
+    except OSError:
+        return BIOGRAPHY_CACHE_DIR, None
+
+
+def get_biography_index() -> BiographyIndex:
+    """
+    Index dibuka sekali per proses. Disinkronkan ulang dengan cache (hanya file
+    baru/berubah) setiap kali mtime folder cache berubah, jadi biografi yang
+    ditulis extract/prefetch setelah index dibuka tetap ikut dicari.
+    """
+    global _biography_index, _biography_index_synced
+    with _biography_index_lock:
+        if _biography_index is None:
+            _biography_index = BiographyIndex(BIOGRAPHY_INDEX_PATH)
+        state = biography_cache_state()
+        if state != _biography_index_synced:
+            _biography_index.update_from_cache()
+            _biography_index_synced = state
+        return _biography_index
+
+
+def search_biographies(query: str, person: str = "") -> str:
+    """
+    Tool Agent 5:
+    Cari potongan teks biografi Wikipedia (sudah di-cache lokal) yang relevan
+    dengan pertanyaan, mis. riwayat pendidikan, karier, tempat/tanggal lahir.
+    person (opsional) = nama orang untuk membatasi pencarian ke biografinya.
+    Kembalikan JSON: hits = [{name, url, section, text, score}]; jika index
+    kosong, hits = [] plus "error" yang menjelaskan sebabnya.
+    """
+    index = get_biography_index()
+    if not len(index):
+        if BIOGRAPHY_CACHE_DIR:
+            reason = (f"belum ada biografi di cache {BIOGRAPHY_CACHE_DIR}; "
+                      "jalankan `prefetch` atau `extract` dulu")
+        else:
+            reason = ("cache biografi tidak aktif; set --biography-cache DIR "
+                      "(atau env BIOGRAPHY_CACHE_DIR) lalu jalankan `prefetch`")
+        return json.dumps(
+            {"query": query, "person": person, "hits": [], "error": f"Index biografi kosong: {reason}."},
+            ensure_ascii=False,
+        )
+    with METRICS.timer("biography_search_seconds"):
+        hits = index.search(query, person=person or None)
+    return json.dumps({"query": query, "person": person, "hits": hits}, ensure_ascii=False)
+
+
+# ==================================================
+# 23. ANTREAN KERJA EKSTRAKSI: LEASE PER ORANG (SQLITE), N WORKER, MERGE
+# ==================================================
+# Satu run ekstraksi Agent 1 + 2 bisa dibagi ke beberapa proses/container:
+# `queue init` mengisi antrean (satu task per baris CSV), tiap `queue work`
+# mengambil task dengan lease berbatas waktu (diperpanjang heartbeat selama
+# diproses), dan `queue merge` menulis CSV enriched dari hasil yang sudah
+# selesai. Worker yang crash -> lease kedaluwarsa -> task diambil worker
+# lain. Commit hasil idempoten: hasil pertama yang masuk yang dipakai, commit
+# berikutnya untuk orang yang sama diabaikan. Tulis Neo4j oleh Agent 2 sudah
+# MERGE, jadi aman jika satu orang sempat diproses dua kali.
 
+WORK_QUEUE_PATH = os.environ.get("WORK_QUEUE_PATH", "extract_queue.sqlite")
+WORK_LEASE_SECONDS = float(os.environ.get("WORK_LEASE_SECONDS", "300"))
+WORK_MAX_ATTEMPTS = int(os.environ.get("WORK_MAX_ATTEMPTS", "3"))
+
+
+class WorkQueue:
+    """
+    Antrean task ekstraksi di satu file SQLite (aman dipakai banyak proses:
+    pengambilan lease lewat BEGIN IMMEDIATE). Status task: pending ->
+    leased -> done, atau failed setelah WORK_MAX_ATTEMPTS percobaan.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        row_idx INTEGER PRIMARY KEY,
+        nama TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        worker TEXT,
+        lease_token TEXT,
+        lease_expires REAL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        families TEXT,
+        error TEXT,
+        updated_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires);
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path: str = WORK_QUEUE_PATH, max_attempts: int = WORK_MAX_ATTEMPTS):
+        import sqlite3
+
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=60)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def transaction(self, op: str):
+        # IMMEDIATE: kunci tulis diambil di awal, jadi dua worker tidak bisa
+        # membaca task yang sama lalu sama-sama menyewanya
+        with self._lock, METRICS.timer("work_queue_seconds", op=op):
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def meta(self) -> dict:
+        with self._lock:
+            return {r["key"]: r["value"] for r in self._conn.execute("SELECT key, value FROM meta")}
+
+    def seed(self, jobs, **meta) -> int:
+        """
+        Tambah task [(row_idx, nama)]; task yang sudah ada tidak diubah (init
+        ulang tidak mengulang pekerjaan). Return jumlah task baru.
+        """
+        now = time.time()
+        with self.transaction("seed") as conn:
+            before = conn.execute("SELECT count(*) FROM tasks").fetchone()[0]
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (row_idx, nama, updated_at) VALUES (?, ?, ?)",
+                [(int(idx), nama, now) for idx, nama in jobs],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(k, str(v)) for k, v in meta.items()],
+            )
+            return conn.execute("SELECT count(*) FROM tasks").fetchone()[0] - before
+
+    def lease(self, worker: str, lease_seconds: float = WORK_LEASE_SECONDS):
+        """
+        Sewa satu task: pending, atau leased yang lease-nya sudah kedaluwarsa.
+        Return (row_idx, nama, token) atau None jika tidak ada yang bisa diambil.
+        """
+        import uuid
+
+        now = time.time()
+        with self.transaction("lease") as conn:
+            # Worker crash berulang di task yang sama -> jangan disewakan lagi
+            conn.execute(
+                """
+                UPDATE tasks SET status = 'failed', error = 'lease kedaluwarsa', updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                """
+                SELECT row_idx, nama, status FROM tasks
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY row_idx LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == "leased":
+                METRICS.inc("work_queue_tasks_total", status="reclaimed")
+            token = uuid.uuid4().hex
+            conn.execute(
+                """
+                UPDATE tasks SET status = 'leased', worker = ?, lease_token = ?,
+                       lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                WHERE row_idx = ?
+                """,
+                (worker, token, now + lease_seconds, now, row["row_idx"]),
+            )
+        METRICS.inc("work_queue_tasks_total", status="leased")
+        return row["row_idx"], row["nama"], token
+
+    def renew(self, row_idx: int, token: str, lease_seconds: float = WORK_LEASE_SECONDS) -> bool:
+        # Heartbeat; False jika lease sudah hilang (kedaluwarsa & diambil worker lain)
+        with self.transaction("renew") as conn:
+            return conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE row_idx = ? AND lease_token = ? AND status = 'leased'",
+                (time.time() + lease_seconds, row_idx, token),
+            ).rowcount == 1
+
+    def complete(self, row_idx: int, token: str, families) -> bool:
+        """
+        Simpan hasil (families, boleh kosong). Idempoten: hasil pertama yang
+        masuk menang, termasuk dari worker yang lease-nya sudah kedaluwarsa;
+        return False jika task sudah selesai sebelumnya.
+        """
+        with self.transaction("complete") as conn:
+            done = conn.execute(
+                """
+                UPDATE tasks SET status = 'done', families = ?, error = NULL,
+                       lease_token = ?, lease_expires = NULL, updated_at = ?
+                WHERE row_idx = ? AND status != 'done'
+                """,
+                (json.dumps(families or [], ensure_ascii=False), token, time.time(), row_idx),
+            ).rowcount == 1
+        METRICS.inc("work_queue_tasks_total", status="done" if done else "duplicate")
+        return done
+
+    def fail(self, row_idx: int, token: str, error: str) -> str:
+        # Kembalikan ke pending (coba lagi) atau failed jika percobaan habis
+        with self.transaction("fail") as conn:
+            conn.execute(
+                """
+                UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       error = ?, lease_token = NULL, lease_expires = NULL, updated_at = ?
+                WHERE row_idx = ? AND lease_token = ? AND status = 'leased'
+                """,
+                (self.max_attempts, str(error)[:2000], time.time(), row_idx, token),
+            )
+            row = conn.execute("SELECT status FROM tasks WHERE row_idx = ?", (row_idx,)).fetchone()
+        status = row["status"] if row else "missing"
+        METRICS.inc("work_queue_tasks_total", status=f"error_{status}")
+        return status
+
+    def counts(self) -> dict:
+        with self._lock:
+            counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+            for r in self._conn.execute("SELECT status, count(*) AS n FROM tasks GROUP BY status"):
+                counts[r["status"]] = r["n"]
+        return counts
+
+    def results(self) -> dict:
+        # row_idx -> families untuk task yang sudah selesai
+        with self._lock:
+            return {
+                r["row_idx"]: json.loads(r["families"])
+                for r in self._conn.execute("SELECT row_idx, families FROM tasks WHERE status = 'done'")
+            }
+
+
+def _check_queue_csv(work_queue, csv_path: str) -> str:
+    # row_idx di antrean hanya bermakna untuk CSV yang dipakai saat init
+    stored = work_queue.meta().get("csv_path")
+    if csv_path and stored and os.path.abspath(csv_path) != stored:
+        raise RuntimeError(
+            f"Antrean {work_queue.path} dibuat dari {stored}, bukan {os.path.abspath(csv_path)}; "
+            "pakai --csv yang sama atau antrean baru (--queue)."
+        )
+    csv_path = csv_path or stored
+    if not csv_path:
+        raise RuntimeError(f"Antrean {work_queue.path} tidak menyimpan path CSV; isi --csv.")
+    return csv_path
+
+
+def init_work_queue(csv_path: str, queue_path: str = WORK_QUEUE_PATH, max_rows: int = 1000) -> dict:
+    jobs = [job for df in iter_extract_chunks(csv_path, max_rows=max_rows) for job in extract_jobs(df, len(df))]
+    with closing(WorkQueue(queue_path)) as work_queue:
+        _check_queue_csv(work_queue, csv_path)
+        added = work_queue.seed(jobs, csv_path=os.path.abspath(csv_path), max_rows=max_rows)
+        return {"added": added, **work_queue.counts()}
+
+
+def run_queue_worker(
+    queue_path: str = WORK_QUEUE_PATH,
+    worker_id: str = None,
+    concurrency: int = 1,
+    delay: float = 1.0,
+    lease_seconds: float = WORK_LEASE_SECONDS,
+    max_tasks: int = None,
+) -> dict:
+    """
+    Satu worker: `concurrency` thread yang masing-masing menyewa task,
+    menjalankan Agent 1 + 2 (extract_families_for_person), lalu commit hasil.
+    Error Agent 1 -> fail() (di-retry sampai WORK_MAX_ATTEMPTS), hasil kosong -> complete().
+    Lease diperpanjang tiap lease_seconds/3 selama task diproses. Berhenti
+    saat tidak ada lagi task pending/leased (atau setelah max_tasks task).
+    Return statistik.
+    """
+    import socket
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stats = {"done": 0, "duplicate": 0, "errors": 0}
+    stats_lock = threading.Lock()
+    budget = [max_tasks]
+
+    def take_budget():
+        with stats_lock:
+            if budget[0] is None:
+                return True
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+            return True
+
+    def heartbeat(work_queue, row_idx, token, stop):
+        while not stop.wait(lease_seconds / 3):
+            if not work_queue.renew(row_idx, token, lease_seconds):
+                return
+
+    def loop(work_queue, thread_no):
+        name = f"{worker_id}#{thread_no}"
+        while take_budget():
+            task = work_queue.lease(name, lease_seconds)
+            while task is None:
+                # Masih ada task yang disewa worker lain: tunggu, siapa tahu
+                # lease-nya kedaluwarsa (worker itu crash) lalu bisa diambil
+                if not work_queue.counts()["leased"]:
+                    return
+                time.sleep(min(5.0, lease_seconds / 3))
+                task = work_queue.lease(name, lease_seconds)
+            row_idx, nama, token = task
+            stop = threading.Event()
+            beat = threading.Thread(target=heartbeat, args=(work_queue, row_idx, token, stop), daemon=True)
+            beat.start()
+            try:
+                families = extract_families_for_person(row_idx, nama, delay=delay, raise_errors=True)
+            except Exception as e:
+                print(f"  ❌ Task {row_idx} ({nama}) gagal: {e}")
+                work_queue.fail(row_idx, token, repr(e))
+                with stats_lock:
+                    stats["errors"] += 1
+                continue
+            finally:
+                stop.set()
+                beat.join()
+            key = "done" if work_queue.complete(row_idx, token, families) else "duplicate"
+            with stats_lock:
+                stats[key] += 1
+
+    with closing(WorkQueue(queue_path)) as work_queue:
+        threads = [
+            threading.Thread(target=loop, args=(work_queue, i), name=f"queue-worker-{i}")
+            for i in range(max(1, concurrency))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats["queue"] = work_queue.counts()
+    return stats
+
+
+def merge_work_queue(queue_path: str = WORK_QUEUE_PATH, csv_path: str = None,
+                     out_csv: str = CSV_ENRICHED_PATH, allow_partial: bool = False) -> dict:
+    """
+    Tulis CSV enriched dari hasil antrean (sama seperti akhir
+    process_csv_with_agents_1_2). Tanpa allow_partial, gagal jika masih ada
+    task pending/leased. csv_path default = CSV yang dipakai saat init; CSV
+    lain ditolak.
+    """
+    with closing(WorkQueue(queue_path)) as work_queue:
+        counts = work_queue.counts()
+        if not allow_partial and (counts["pending"] or counts["leased"]):
+            raise RuntimeError(
+                f"Antrean belum selesai ({counts['pending']} pending, {counts['leased']} leased); "
+                "jalankan worker lagi atau pakai --partial."
+            )
+        csv_path = _check_queue_csv(work_queue, csv_path)
+        results = work_queue.results()
+
+    for i, df in enumerate(iter_extract_chunks(csv_path)):
+        for idx in df.index:
+            apply_families_to_row(df, idx, results.get(idx))
+        write_csv_chunk(df, out_csv, first=i == 0)
+    print(f"\n💾 File hasil CSV disimpan ke: {out_csv}")
+    return {"merged": len(results), **counts}
+
+
+# ==================================================
+# 24. SNAPSHOT GRAF BINER (NUMPY .npy, MEMORY-MAP) UNTUK WARM START
+# ==================================================
+# Graf ringkas (Person/Party + relasi kekerabatan & MEMBER_OF) disimpan
+# sebagai folder berisi array NumPy: tabel string yang di-intern (satu blob
+# UTF-8 + offset), node sebagai id integer (label, nama, pagerank) dan edge
+# list (src, dst, tipe, label relasi). Dimuat dengan np.load(mmap_mode="r"),
+# jadi sentralitas & index kekerabatan Agent 5 bisa mulai tanpa menarik
+# ulang graf dari Neo4j atau mem-parse ulang string CSV. manifest.json
+# menyimpan format & versi; snapshot versi lain ditolak, bukan dibaca salah.
+
+GRAPH_SNAPSHOT_PATH = os.environ.get("GRAPH_SNAPSHOT_PATH", "graph_snapshot")
+GRAPH_SNAPSHOT_FORMAT = "keluarga-graph-snapshot"
+GRAPH_SNAPSHOT_VERSION = 1
+GRAPH_SNAPSHOT_ARRAYS = [
+    "strings_utf8", "strings_offsets", "node_label", "node_name", "node_pagerank",
+    "edge_src", "edge_dst", "edge_type", "edge_label",
+]
+
+
+def is_graph_snapshot(path) -> bool:
+    return bool(path) and os.path.isfile(os.path.join(str(path), "manifest.json"))
+
+
+class GraphSnapshot:
+    """
+    Graf ringkas read-only. strings = id -> teks; node i = (strings[node_label[i]],
+    strings[node_name[i]]) dengan node_pagerank[i] (NaN = belum ada); edge j =
+    node edge_src[j] -[strings[edge_type[j]]]-> node edge_dst[j], label relasi
+    strings[edge_label[j]] (-1 = kosong). edge_types = tipe relasi -> id string.
+    """
+
+    def __init__(self, strings, arrays: dict, meta: dict = None):
+        self.strings = strings
+        self.meta = meta or {}
+        self.edge_types = self.meta.get("edge_types", {})
+        for name in GRAPH_SNAPSHOT_ARRAYS[2:]:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def from_edges(cls, edges, pagerank=None, source: str = ""):
+        """
+        edges = [(tipe, label_a, nama_a, label_b, nama_b, label relasi)];
+        pagerank = {(label, nama): skor} (mis. dari read_centrality_graph).
+        """
+        import numpy as np
+
+        strings, nodes, edge_types = {}, {}, {}
+        src, dst, types, labels = [], [], [], []
+        for rel_type, a_label, a_name, b_label, b_name, label in edges:
+            src.append(nodes.setdefault((a_label, a_name), len(nodes)))
+            dst.append(nodes.setdefault((b_label, b_name), len(nodes)))
+            if rel_type not in edge_types:
+                edge_types[rel_type] = strings.setdefault(rel_type, len(strings))
+            types.append(edge_types[rel_type])
+            labels.append(-1 if label is None else strings.setdefault(str(label), len(strings)))
+        pagerank = pagerank or {}
+        arrays = {
+            "node_label": np.array([strings.setdefault(l, len(strings)) for l, _ in nodes], dtype=np.int32),
+            "node_name": np.array([strings.setdefault(n, len(strings)) for _, n in nodes], dtype=np.int32),
+            "node_pagerank": np.array(
+                [float(pagerank.get(node, np.nan)) for node in nodes], dtype=np.float64
+            ),
+            "edge_src": np.array(src, dtype=np.int32),
+            "edge_dst": np.array(dst, dtype=np.int32),
+            "edge_type": np.array(types, dtype=np.int32),
+            "edge_label": np.array(labels, dtype=np.int32),
+        }
+        return cls(list(strings), arrays, {"source": source, "edge_types": edge_types})
+
+    @classmethod
+    def from_graph(cls, graph):
+        # Relasi kekerabatan (dengan tipe & label) + MEMBER_OF dari bacaan sentralitas
+        edges, previous = read_centrality_graph(graph)
+        rows = [
+            (rel_type, "Person", a, "Person", c, label)
+            for rel_type, a, c, _, label in read_kinship_relations(graph, KINSHIP_REL_TYPES)
+        ]
+        rows += [("MEMBER_OF", *edge, None) for edge in edges if edge[2] == "Party"]
+        return cls.from_edges(rows, previous, source="graph")
+
+    @classmethod
+    def from_records(cls, records, source: str = ""):
+        # Relasi yang sama dengan yang ditulis write_kg_records
+        rows = []
+        for r in records:
+            if r["partai"]:
+                rows.append(("MEMBER_OF", "Person", r["nama"], "Party", r["partai"], None))
+            for s in r["spouses"]:
+                rows.append(("SPOUSE_OF", "Person", r["nama"], "Person", s["name"], s["rel_label"]))
+            for f in r["families"]:
+                rows.append(("FAMILY_OF", "Person", r["nama"], "Person", f["name"], f["note"]))
+        return cls.from_edges(rows, source=source)
+
+    @classmethod
+    def from_enriched(cls, csv_path: str, max_rows: int = None):
+        records = []
+        for df in iter_enriched_chunks(csv_path, columns=["Nama", "Partai", "Pasangan", "Keluarga"],
+                                       max_rows=max_rows):
+            for _, row in df.iterrows():
+                record = kg_record_from_row(row)
+                if record is not None:
+                    records.append(record)
+        return cls.from_records(records, source=csv_path)
+
+    def __len__(self):
+        return len(self.node_name)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_src)
+
+    def save(self, path: str = GRAPH_SNAPSHOT_PATH) -> dict:
+        """
+        Tulis ke folder `path` (ditulis ke folder sementara lalu ditukar, jadi
+        pembaca tidak pernah melihat snapshot setengah jadi). Return manifest.
+        """
+        import shutil
+
+        import numpy as np
+
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) + 1 for b in encoded], out=offsets[1:])
+        arrays = {
+            # Blob UTF-8 semua string (dipisah \0) + offset byte awal tiap string
+            "strings_utf8": np.frombuffer(b"\0".join(encoded), dtype=np.uint8),
+            "strings_offsets": offsets,
+            **{name: getattr(self, name) for name in GRAPH_SNAPSHOT_ARRAYS[2:]},
+        }
+        manifest = {
+            "format": GRAPH_SNAPSHOT_FORMAT,
+            "version": GRAPH_SNAPSHOT_VERSION,
+            "created_at": int(time.time() * 1000),
+            "source": self.meta.get("source", ""),
+            "strings": len(self.strings),
+            "nodes": len(self),
+            "edges": self.edge_count,
+            "edge_types": self.edge_types,
+            "arrays": {name: {"dtype": str(a.dtype), "shape": list(a.shape)} for name, a in arrays.items()},
+        }
+
+        path = os.path.normpath(path)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with METRICS.timer("stage_seconds", stage="snapshot_save"):
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(array))
+            with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            old = f"{path}.old-{os.getpid()}"
+            if os.path.exists(path):
+                os.replace(path, old)
+            os.replace(tmp, path)
+            shutil.rmtree(old, ignore_errors=True)
+        self.meta = manifest
+        return manifest
+
+    @classmethod
+    def load(cls, path: str = GRAPH_SNAPSHOT_PATH, mmap: bool = True):
+        import numpy as np
+
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != GRAPH_SNAPSHOT_FORMAT or manifest.get("version") != GRAPH_SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Snapshot {path} berformat {manifest.get('format')} v{manifest.get('version')}; "
+                f"yang didukung {GRAPH_SNAPSHOT_FORMAT} v{GRAPH_SNAPSHOT_VERSION}. Ekspor ulang snapshot."
+            )
+        with METRICS.timer("stage_seconds", stage="snapshot_load"):
+            arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                for name in GRAPH_SNAPSHOT_ARRAYS
+            }
+            # Tabel string di-decode penuh ke list Python (sekali, saat load);
+            # yang tetap memory-map hanya array id. Batas tiap string dari
+            # strings_offsets (byte), jadi "\0" di dalam nama tidak menggeser id.
+            data = arrays["strings_utf8"].tobytes()
+            bounds = arrays["strings_offsets"].tolist()
+            if len(bounds) != manifest["strings"] + 1:
+                raise ValueError(f"Snapshot {path} rusak: strings_offsets tidak cocok dengan manifest")
+            strings = [data[start:end - 1].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+        return cls(strings, arrays, manifest)
+
+    def _type_mask(self, rel_types):
+        import numpy as np
+
+        return np.isin(self.edge_type, [self.edge_types[t] for t in rel_types if t in self.edge_types])
+
+    def kinship_relations(self) -> list:
+        # Bentuk sama dengan read_kinship_relations(): [(tipe, awal, akhir, via, label)]
+        # .tolist() dulu: indexing per elemen array NumPy jauh lebih lambat dari list
+        strings, names = self.strings, self.node_name.tolist()
+        mask = self._type_mask(KINSHIP_REL_TYPES)
+        return [
+            (strings[t], strings[names[a]], strings[names[c]], None, strings[l] if l >= 0 else None)
+            for t, a, c, l in zip(
+                self.edge_type[mask].tolist(), self.edge_src[mask].tolist(),
+                self.edge_dst[mask].tolist(), self.edge_label[mask].tolist(),
+            )
+        ]
+
+    def previous_pagerank(self) -> dict:
+        # {(label, nama): pagerank} seperti `previous` di read_centrality_graph()
+        import numpy as np
+
+        strings = self.strings
+        has = ~np.isnan(self.node_pagerank)
+        return {
+            (strings[label], strings[name]): score
+            for label, name, score in zip(
+                self.node_label[has].tolist(), self.node_name[has].tolist(), self.node_pagerank[has].tolist()
+            )
+        }
+
+    def adjacency(self):
+        """
+        Padanan build_adjacency() atas relasi CENTRALITY_REL_TYPES, langsung
+        dari array (tanpa tuple per relasi). Return (nodes, A).
+        """
+        import numpy as np
+        import scipy.sparse as sp
+
+        mask = self._type_mask(CENTRALITY_REL_TYPES)
+        src, dst = np.asarray(self.edge_src[mask]), np.asarray(self.edge_dst[mask])
+        used = np.unique(np.concatenate([src, dst]))
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        keep = src != dst
+        a, b = remap[src[keep]], remap[dst[keep]]
+        n = len(used)
+        A = sp.csr_matrix(
+            (np.ones(2 * len(a)), (np.concatenate([a, b]), np.concatenate([b, a]))), shape=(n, n)
+        )
+        A.sum_duplicates()
+        A.data[:] = 1.0
+        strings = self.strings
+        nodes = [
+            (strings[label], strings[name])
+            for label, name in zip(self.node_label[used].tolist(), self.node_name[used].tolist())
+        ]
+        return nodes, A
+
+
+def export_graph_snapshot(path: str = GRAPH_SNAPSHOT_PATH, source: str = "graph", max_rows: int = None) -> dict:
+    """
+    source = "graph" (get_driver()) atau path CSV/.parquet enriched.
+    Return manifest snapshot yang ditulis.
+    """
+    with METRICS.timer("stage_seconds", stage="snapshot_build"):
+        if source == "graph":
+            snapshot = GraphSnapshot.from_graph(get_driver())
+        else:
+            snapshot = GraphSnapshot.from_enriched(source, max_rows=max_rows)
+    return snapshot.save(path)
+
+
+# ==================================================
+# 25. CLI: SUBCOMMAND extract / build-kg / analyze / qa / pipeline / convert / export-import / centrality / derive-kinship / kinship-path / project / bio-index / queue / prefetch / snapshot
+# ==================================================
+
+def default_kg_csv_path() -> str:
+    # Kalau sudah ada enriched, pakai itu; kalau belum, fallback ke raw
+    return CSV_ENRICHED_PATH if os.path.exists(CSV_ENRICHED_PATH) else CSV_RAW_PATH
+
+
+def cmd_extract(args):
+    process_csv_with_agents_1_2(
+        args.csv,
+        max_rows=args.max_rows,
+        concurrency=args.concurrency,
+        out_csv=args.out,
+        delay=args.delay,
+    )
+    return 0
+
+
+def cmd_build_kg(args):
+    # Bangun KG relasi Nama–Dapil–Partai–Jabatan–Pendidikan–Pasangan–Keluarga
+    csv_path = args.csv or default_kg_csv_path()
+    print(f"📄 Menggunakan file CSV: {csv_path}")
+    if args.via_agent:
+        run_relation_kg_agent(csv_path, max_rows=args.max_rows, sync=args.sync)
+    else:
+        print(build_kg_from_enriched_csv(
+            csv_path, max_rows=args.max_rows, batch_size=args.batch_size, sync=args.sync
+        ))
+    return 0
+
+
+def cmd_analyze(args):
+    # Hanya baca CSV yang sudah enriched, tidak scraping ulang, tidak token ekstraksi per orang
+    if not os.path.exists(args.csv):
+        print(f"⚠️ File {args.csv} tidak ditemukan. Pastikan sudah menjalankan extract sebelumnya.")
+        return 1
+    if args.summary_only:
+        print(get_strategic_marriage_summary(args.csv, max_rows=args.max_rows))
+    else:
+        run_strategic_marriage_agent(args.csv)
+    return 0
+
+
+def cmd_qa(args):
+    # Mode QA: tanya jawab ke Neo4j dengan bahasa Indonesia
+    questions = list(args.questions)
+    if args.questions_file:
+        with open(args.questions_file, encoding="utf-8") as f:
+            questions.extend(line.strip() for line in f if line.strip())
+
+    if questions:
+        for q in questions:
+            run_agent5_qa(q)
+        return 0
+
+    print(
+        "\nMode Agent 5 (QA Neo4j).\n"
+        "Ketik pertanyaan dalam bahasa Indonesia tentang graf DPR.\n"
+        "Contoh: 'siapa anggota DPR dari Lampung I yang punya pasangan dari partai berbeda?'\n"
+        "Ketik 'exit' untuk keluar.\n"
+    )
+    while True:
+        q = input("Pertanyaan: ").strip()
+        if not q:
+            continue
+        if q.lower() in ("exit", "quit", "keluar", "q"):
+            print("Keluar dari mode Agent 5.")
+            break
+        run_agent5_qa(q)
+    return 0
+
+
+def cmd_pipeline(args):
+    # extract -> build-kg -> analyze sebagai pipeline streaming, satu driver yang sama
+    summary = run_streaming_pipeline(
+        args.csv,
+        out_csv=args.out,
+        max_rows=args.max_rows,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        delay=args.delay,
+    )
+    summary_json = json.dumps(summary, ensure_ascii=False)
+    if args.summary_only:
+        print(summary_json)
+    else:
+        run_strategic_marriage_agent(args.out, summary_json=summary_json)
+    return 0
+
+
+def cmd_convert(args):
+    # CSV enriched <-> Parquet (kolom relasi bertipe list<struct>)
+    n = convert_enriched_dataset(args.src, args.dst)
+    print(f"💾 {n} baris dikonversi: {args.src} -> {args.dst}")
+    return 0
+
+
+def cmd_export_import(args):
+    # File CSV untuk neo4j-admin database import (cold start database baru)
+    csv_path = args.csv or default_kg_csv_path()
+    summary = export_bulk_import(
+        csv_path, args.out_dir, family_json_paths=args.families, max_rows=args.max_rows
+    )
+    for label, n in summary["nodes"].items():
+        print(f"  🟢 {label}: {n} node")
+    for rel_type, n in summary["relationships"].items():
+        print(f"  🔗 {rel_type}: {n} relasi")
+    print(f"\n💾 File import ditulis ke {args.out_dir}. Jalankan (database harus berhenti):\n")
+    print(summary["command"])
+    return 0
+
+
+def cmd_centrality(args):
+    # Materialisasi PageRank/degree/betweenness; --interval N = refresh tiap N detik
+    driver = get_driver()
+    while True:
+        info = refresh_centrality(driver, samples=args.samples, batch_size=args.batch_size,
+                                  snapshot=args.snapshot)
+        warm = "warm start" if info["warm_start"] else "cold start"
+        print(
+            f"📈 Sentralitas: {info['nodes']} node, {info['edges']} relasi, "
+            f"PageRank {info['pagerank_iterations']} iterasi ({warm}), {info['seconds']} detik"
+        )
+        for name, score in info["top_person"]:
+            print(f"  🟢 {name}: {score}")
+        if not args.interval:
+            return 0
+        time.sleep(args.interval)
+
+
+def cmd_derive_kinship(args):
+    # Hitung ulang semua relasi turunan (mis. setelah impor bulk atau ubah aturan)
+    stats = update_derived_kinship(get_driver())
+    print(
+        f"🧬 Relasi turunan: {stats['added']} baru, {stats['changed']} berubah, "
+        f"{stats['deleted']} dihapus"
+    )
+    return 0
+
+
+def cmd_kinship_path(args):
+    result = kinship_path(args.person_a, args.person_b, max_depth=args.max_depth, source=args.csv)
+    if not result["found"]:
+        print(f"❌ {result.get('error') or 'Tidak ada jalur kekerabatan'}: "
+              f"{result['from']} -> {result['to']} (maks. {args.max_depth} langkah)")
+        return 1
+    print(f"🧬 {result['from']} -> {result['to']} ({result['hops']} langkah): {result['chain']}")
+    for i, relation in enumerate(result["relations"]):
+        print(f"  {result['path'][i + 1]} = {relation} dari {result['path'][i]}")
+    return 0
+
+
+def cmd_project(args):
+    summary = run_projection(
+        args.csv or default_kg_csv_path(),
+        kinds=args.kind,
+        top_k=args.top_k,
+        max_group=args.max_group,
+        export_dir=args.export_dir,
+        write=not args.no_write,
+        max_rows=args.max_rows,
+    )
+    for kind, info in summary.items():
+        line = f"🔗 {info['relationship']}: {info['pairs']} pasangan"
+        if "written" in info:
+            line += f", {info['written']} ditulis, {info['deleted']} dihapus"
+        if "file" in info:
+            line += f" -> {info['file']}"
+        print(line)
+    return 0
+
+
+def cmd_bio_index(args):
+    # Sinkronkan index dengan cache biografi; --search untuk mencoba kueri
+    index = BiographyIndex(args.index)
+    try:
+        stats = index.update_from_cache(args.cache_dir)
+        print(
+            f"📚 Index biografi: {len(index)} dokumen ({stats['added']} baru, {stats['changed']} berubah, "
+            f"{stats['deleted']} dihapus, {stats['chunks']} chunk di-index)"
+        )
+        if args.search:
+            started = time.perf_counter()
+            hits = index.search(args.search, person=args.person, limit=args.limit)
+            print(f"🔎 {len(hits)} hasil dalam {(time.perf_counter() - started) * 1000:.1f} ms")
+            for hit in hits:
+                print(f"  [{hit['score']:.2f}] {hit['name']} ({hit['section']}): {textwrap.shorten(hit['text'], 160)}")
+    finally:
+        index.close()
+    return 0
+
+
+def cmd_queue(args):
+    # init -> work (di tiap mesin/container) -> merge; status kapan saja
+    if args.action == "init":
+        try:
+            info = init_work_queue(args.csv or CSV_RAW_PATH, args.queue, max_rows=args.max_rows)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📥 Antrean {args.queue}: {info['added']} task baru, {info['pending']} pending, {info['done']} selesai")
+    elif args.action == "work":
+        stats = run_queue_worker(
+            args.queue, worker_id=args.worker_id, concurrency=args.concurrency, delay=args.delay,
+            lease_seconds=args.lease, max_tasks=args.max_tasks,
+        )
+        print(f"👷 Worker selesai: {stats['done']} task, {stats['duplicate']} duplikat, "
+              f"{stats['errors']} error; antrean: {stats['queue']}")
+    elif args.action == "status":
+        with closing(WorkQueue(args.queue)) as work_queue:
+            print(f"📋 Antrean {args.queue}: {work_queue.counts()}")
     else:
+        try:
+            info = merge_work_queue(args.queue, args.csv, args.out, allow_partial=args.partial)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"🧩 {info['merged']} hasil digabung ({info['failed']} task gagal)")
+    return 0
+
+
+def cmd_prefetch(args):
+    # Isi cache biografi dulu (download paralel + parsing di pool proses), sebelum extract / bio-index
+    if not BIOGRAPHY_CACHE_DIR:
+        print("❌ prefetch butuh cache biografi: set --biography-cache DIR (atau env BIOGRAPHY_CACHE_DIR)")
+        return 1
+    df = read_extract_csv(args.csv)
+    if args.max_rows:
+        df = df.head(args.max_rows)
+    names = [n for n in df["Nama"].tolist() if str(n).strip()]
+    started = time.perf_counter()
+    done = errors = 0
+    for url, text, error in fetch_wikipedia_texts(
+        (build_wikipedia_url_from_name(str(n).strip()) for n in names), concurrency=args.concurrency
+    ):
+        if error is not None:
+            errors += 1
+            print(f"  ⚠️ {url}: {error}")
+        elif text.strip():
+            done += 1
+    seconds = time.perf_counter() - started
+    print(f"🌐 Prefetch: {done} biografi, {errors} error dari {len(names)} nama "
+          f"({len(names) / max(seconds, 1e-9):.1f} halaman/detik, {HTML_PARSE_WORKERS} proses parser)")
+    return 0 if not errors else 1
+
+
+def cmd_snapshot(args):
+    # export: graf/CSV -> folder .npy; info: muat (memory-map) & tampilkan isinya
+    if args.action == "export":
+        started = time.perf_counter()
+        manifest = export_graph_snapshot(args.path, source=args.csv or "graph", max_rows=args.max_rows)
+        print(
+            f"📦 Snapshot {args.path}: {manifest['nodes']} node, {manifest['edges']} relasi, "
+            f"{manifest['strings']} string ({time.perf_counter() - started:.2f} detik)"
+        )
+        return 0
+
+    started = time.perf_counter()
+    snapshot = GraphSnapshot.load(args.path)
+    loaded = time.perf_counter()
+    index = KinshipIndex.from_relations(snapshot.kinship_relations())
+    print(
+        f"📦 Snapshot {args.path} (v{snapshot.meta['version']}, sumber: {snapshot.meta['source'] or '-'}): "
+        f"{len(snapshot)} node, {snapshot.edge_count} relasi"
+    )
+    print(f"  ⏱️ muat {(loaded - started) * 1000:.1f} ms, index kekerabatan "
+          f"{(time.perf_counter() - loaded) * 1000:.1f} ms ({len(index)} orang)")
+    return 0
+
+
+def build_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="Keluarga_v2.py",
+        description="Ekstraksi & analisis jaringan kekerabatan anggota DPR (multi-agent + Neo4j).",
+    )
+    parser.add_argument("--pool-size", type=int, default=NEO4J_MAX_POOL_SIZE,
+                        help="ukuran maksimum connection pool Neo4j")
+    parser.add_argument("--acquisition-timeout", type=float, default=NEO4J_ACQUISITION_TIMEOUT,
+                        help="timeout (detik) menunggu koneksi dari pool")
+    parser.add_argument("--backend", choices=["neo4j", "sqlite"], default=GRAPH_BACKEND,
+                        help="backend graf: Neo4j (server) atau SQLite (file lokal, tanpa server)")
+    parser.add_argument("--sqlite-path", default=SQLITE_GRAPH_PATH,
+                        help="file SQLite untuk --backend sqlite")
+    parser.add_argument("--chunk-size", type=int, default=CSV_CHUNK_ROWS,
+                        help="baca/proses/tulis CSV per N baris (memori konstan); 0 = sekaligus")
+    parser.add_argument("--parse-workers", type=int, default=HTML_PARSE_WORKERS,
+                        help="jumlah proses parser HTML Wikipedia; 0 = parsing di thread pengambil")
+    parser.add_argument("--biography-cache", default=BIOGRAPHY_CACHE_DIR,
+                        help="folder cache biografi Wikipedia (JSON per URL); kosong = tanpa cache")
+    parser.add_argument("--biography-cache-max-age", type=float, default=BIOGRAPHY_CACHE_MAX_AGE,
+                        help="umur maksimum entri cache biografi (detik); 0 = tidak kedaluwarsa")
+    parser.add_argument("--metrics-textfile",
+                        help="tulis metrik run ke file teks Prometheus (node_exporter textfile)")
+    parser.add_argument("--report-json", help="tulis laporan run (latensi, token, cache) ke JSON")
+    parser.add_argument("--profile-dir",
+                        help="aktifkan profiling cProfile + tracemalloc per tahap, simpan hasil di folder ini")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    def add_extract_options(p, default_out=CSV_ENRICHED_PATH, default_csv=CSV_RAW_PATH):
+        p.add_argument("--csv", default=default_csv, help="CSV anggota DPR (input)")
+        p.add_argument("--out", default=default_out, help="CSV enriched (output)")
+        p.add_argument("--concurrency", type=int, default=1,
+                       help="jumlah orang yang diproses paralel oleh Agent 1 + 2")
+        p.add_argument("--delay", type=float, default=1.0,
+                       help="jeda (detik) per orang setelah ekstraksi berhasil")
+
+    p_extract = sub.add_parser("extract", help="Agent 1 + 2: scrape Wikipedia + tulis Neo4j + update CSV")
+    add_extract_options(p_extract)
+    p_extract.add_argument("--max-rows", type=int, default=1000)
+    p_extract.set_defaults(func=cmd_extract)
+
+    p_build = sub.add_parser("build-kg", help="Agent 4: bangun relasi Nama–Dapil–Partai–... ke Neo4j dari CSV")
+    p_build.add_argument("--csv", default=None,
+                         help="CSV atau .parquet; default: enriched jika ada, jika tidak raw")
+    p_build.add_argument("--max-rows", type=int, default=1000)
+    p_build.add_argument("--batch-size", type=int, default=KG_BATCH_SIZE,
+                         help="jumlah baris per transaksi Neo4j")
+    p_build.add_argument("--via-agent", action="store_true",
+                         help="jalankan lewat Agent 4 (LLM) alih-alih langsung")
+    p_build.add_argument("--sync", action="store_true",
+                         help="hanya tulis orang yang baru/berubah/terhapus (hash per orang + manifest)")
+    p_build.set_defaults(func=cmd_build_kg)
+
+    p_analyze = sub.add_parser("analyze", help="Agent 3: analisis Strategic Marriage dari CSV enriched")
+    p_analyze.add_argument("--csv", default=CSV_ENRICHED_PATH, help="CSV atau .parquet enriched")
+    p_analyze.add_argument("--max-rows", type=int, default=1000)
+    p_analyze.add_argument("--summary-only", action="store_true",
+                           help="cetak ringkasan JSON saja, tanpa LLM")
+    p_analyze.set_defaults(func=cmd_analyze)
+
+    p_qa = sub.add_parser("qa", help="Agent 5: tanya jawab ke Neo4j (bahasa Indonesia -> Cypher)")
+    p_qa.add_argument("questions", nargs="*", help="pertanyaan; kosong = mode interaktif")
+    p_qa.add_argument("--questions-file", help="file berisi satu pertanyaan per baris")
+    p_qa.set_defaults(func=cmd_qa)
+
+    p_pipeline = sub.add_parser(
+        "pipeline", help="extract -> build-kg -> analyze sebagai pipeline streaming"
+    )
+    add_extract_options(p_pipeline)
+    p_pipeline.add_argument("--max-rows", type=int, default=1000)
+    p_pipeline.add_argument("--batch-size", type=int, default=KG_BATCH_SIZE)
+    p_pipeline.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE,
+                            help="kapasitas antrean antar-tahap (backpressure)")
+    p_pipeline.add_argument("--summary-only", action="store_true")
+    p_pipeline.set_defaults(func=cmd_pipeline)
+
+    p_convert = sub.add_parser(
+        "convert", help="konversi dataset enriched CSV <-> Parquet (arah dari ekstensi file)"
+    )
+    p_convert.add_argument("src", help="file sumber (.csv atau .parquet)")
+    p_convert.add_argument("dst", help="file tujuan (.parquet atau .csv)")
+    p_convert.set_defaults(func=cmd_convert)
+
+    p_export = sub.add_parser(
+        "export-import", help="tulis CSV node/relasi untuk `neo4j-admin database import`"
+    )
+    p_export.add_argument("--csv", default=None,
+                          help="CSV atau .parquet; default: enriched jika ada, jika tidak raw")
+    p_export.add_argument("--families", nargs="*", default=[],
+                          help="file .json/.jsonl hasil Agent 1 (person, source_url, families)")
+    p_export.add_argument("--out-dir", default="neo4j_import")
+    p_export.add_argument("--max-rows", type=int, default=None)
+    p_export.set_defaults(func=cmd_export_import)
+
+    p_centrality = sub.add_parser(
+        "centrality", help="hitung & simpan PageRank/degree/betweenness sebagai properti node"
+    )
+    p_centrality.add_argument("--samples", type=int, default=CENTRALITY_BETWEENNESS_SAMPLES,
+                              help="jumlah sumber sampel betweenness (0 = eksak, semua node)")
+    p_centrality.add_argument("--batch-size", type=int, default=KG_BATCH_SIZE)
+    p_centrality.add_argument("--interval", type=float, default=0,
+                              help="ulangi tiap N detik (refresh terjadwal); 0 = sekali jalan")
+    p_centrality.add_argument("--snapshot", default=None,
+                              help="baca graf dari folder snapshot (lihat `snapshot export`) alih-alih dari database")
+    p_centrality.set_defaults(func=cmd_centrality)
+
+    p_derive = sub.add_parser(
+        "derive-kinship", help="hitung ulang semua relasi turunan (GRANDPARENT_OF, PARENT_IN_LAW_OF, SIBLING_IN_LAW_OF)"
+    )
+    p_derive.set_defaults(func=cmd_derive_kinship)
+
+    p_path = sub.add_parser("kinship-path", help="jalur kekerabatan terpendek antara dua orang")
+    p_path.add_argument("person_a")
+    p_path.add_argument("person_b")
+    p_path.add_argument("--csv", default=None,
+                        help="bangun index dari CSV/.parquet enriched atau folder snapshot alih-alih dari graf")
+    p_path.add_argument("--max-depth", type=int, default=KINSHIP_PATH_MAX_DEPTH)
+    p_path.set_defaults(func=cmd_kinship_path)
+
+    p_project = sub.add_parser(
+        "project", help="proyeksi co-alumni / co-jabatan (relasi orang–orang berbobot) dari matriks sparse"
+    )
+    p_project.add_argument("--csv", default=None,
+                           help="CSV atau .parquet; default: enriched jika ada, jika tidak raw")
+    p_project.add_argument("--kind", nargs="+", choices=list(PROJECTION_KINDS),
+                           default=list(PROJECTION_KINDS))
+    p_project.add_argument("--top-k", type=int, default=PROJECTION_TOP_K,
+                           help="jumlah tetangga terkuat yang disimpan per orang")
+    p_project.add_argument("--max-group", type=int, default=PROJECTION_MAX_GROUP,
+                           help="lewati institusi dengan anggota lebih dari ini (mis. 'DPR RI')")
+    p_project.add_argument("--export-dir", help="tulis edge list co_<jenis>.csv ke folder ini")
+    p_project.add_argument("--no-write", action="store_true", help="jangan tulis ke graf (ekspor saja)")
+    p_project.add_argument("--max-rows", type=int, default=None)
+    p_project.set_defaults(func=cmd_project)
+
+    p_bio = sub.add_parser("bio-index", help="bangun/perbarui index BM25 biografi dari cache Wikipedia")
+    p_bio.add_argument("--cache-dir", default=None,
+                       help="folder cache biografi (JSON per URL); default: --biography-cache")
+    p_bio.add_argument("--index", default=BIOGRAPHY_INDEX_PATH, help="file SQLite index")
+    p_bio.add_argument("--search", help="kueri uji setelah index diperbarui")
+    p_bio.add_argument("--person", help="batasi --search ke biografi orang ini")
+    p_bio.add_argument("--limit", type=int, default=BIOGRAPHY_SEARCH_LIMIT)
+    p_bio.set_defaults(func=cmd_bio_index)
+
+    p_queue = sub.add_parser(
+        "queue", help="ekstraksi Agent 1 + 2 lewat antrean kerja bersama (lease per orang) untuk N worker"
+    )
+    p_queue.add_argument("action", choices=["init", "work", "status", "merge"])
+    p_queue.add_argument("--queue", default=WORK_QUEUE_PATH, help="file SQLite antrean")
+    # --csv default None: merge memakai CSV yang tersimpan saat init
+    add_extract_options(p_queue, default_csv=None)
+    p_queue.add_argument("--max-rows", type=int, default=1000, help="init: jumlah baris CSV")
+    p_queue.add_argument("--worker-id", help="work: nama worker (default host:pid)")
+    p_queue.add_argument("--lease", type=float, default=WORK_LEASE_SECONDS,
+                         help="work: durasi lease (detik), diperpanjang selama task diproses")
+    p_queue.add_argument("--max-tasks", type=int, default=None, help="work: berhenti setelah N task")
+    p_queue.add_argument("--partial", action="store_true", help="merge: izinkan antrean belum selesai")
+    p_queue.set_defaults(func=cmd_queue)
+
+    p_prefetch = sub.add_parser(
+        "prefetch", help="download & parse biografi Wikipedia ke cache (thread download + pool proses parser)"
+    )
+    p_prefetch.add_argument("--csv", default=CSV_RAW_PATH, help="CSV anggota DPR (kolom Nama)")
+    p_prefetch.add_argument("--max-rows", type=int, default=None)
+    p_prefetch.add_argument("--concurrency", type=int, default=8, help="jumlah thread download")
+    p_prefetch.set_defaults(func=cmd_prefetch)
+
+    p_snapshot = sub.add_parser(
+        "snapshot", help="ekspor/baca snapshot biner graf (.npy, memory-map) untuk warm start analitik & QA"
+    )
+    p_snapshot.add_argument("action", choices=["export", "info"])
+    p_snapshot.add_argument("--path", default=GRAPH_SNAPSHOT_PATH, help="folder snapshot")
+    p_snapshot.add_argument("--csv", default=None,
+                            help="ekspor dari CSV/.parquet enriched alih-alih dari graf")
+    p_snapshot.add_argument("--max-rows", type=int, default=None)
+    p_snapshot.set_defaults(func=cmd_snapshot)
+
+    return parser
+
+
+def run_interactive_menu():
+    """
+    Menu lama berbasis input(), dipakai jika script dijalankan tanpa argumen.
+    """
+    mode = input(
+        "Pilih mode:\n"
+        "  1 = Jalankan Agent 1 + 2 (scrape Wikipedia + tulis Neo4j + update CSV)\n"
+        "  3 = Jalankan Agent 3 saja (analisis Strategic Marriage dari anggota_dpr_enriched.csv)\n"
+        "  4 = Jalankan Agent 4 (bangun relasi Nama–Dapil–Partai–Jabatan–Pendidikan–Pasangan–Keluarga ke Neo4j dari CSV)\n"
+        "  5 = Jalankan Agent 5 (tanya jawab ke Neo4j pakai bahasa Indonesia -> Cypher)\n"
+        "Masukkan pilihan (1/3/4/5): "
+    ).strip()
+
+    commands = {"1": ["extract"], "3": ["analyze"], "4": ["build-kg", "--via-agent", "--sync"], "5": ["qa"]}
+    if mode not in commands:
         print("Pilihan tidak dikenal. Jalankan lagi dan pilih 1, 3, 4, atau 5.")
+        return 1
+    return main(commands[mode])
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        return run_interactive_menu()
+
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    # Satu driver / connection pool untuk semua tahap; dibuka hanya jika
+    # ada tahap yang butuh Neo4j, dan selalu ditutup di akhir.
+    if args.profile_dir:
+        PROFILER.enable(args.profile_dir)
+
+    configure_backend(args.backend, args.sqlite_path)
+    configure_chunking(args.chunk_size)
+    configure_parse_pool(args.parse_workers)
+    configure_biography_cache(args.biography_cache, args.biography_cache_max_age)
+    configure_driver(
+        max_connection_pool_size=args.pool_size,
+        connection_acquisition_timeout=args.acquisition_timeout,
+    )
+    try:
+        with METRICS.timer("stage_seconds", stage=args.command):
+            return args.func(args)
+    finally:
+        close_driver()
+        close_parse_pool()
+        METRICS.print_summary()
+        PROFILER.print_summary()
+        PROFILER.write_files()
+        if args.metrics_textfile:
+            METRICS.write_prometheus_textfile(args.metrics_textfile)
+            print(f"📊 Metrik Prometheus ditulis ke: {args.metrics_textfile}")
+        if args.report_json:
+            METRICS.write_report_json(
+                args.report_json, command=args.command, argv=argv, profile=PROFILER.report()
+            )
+            print(f"📊 Laporan run ditulis ke: {args.report_json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark latensi jalur kekerabatan (KinshipIndex, BFS dua arah in-memory)
+pada dataset sintetis, target p99 < 1 ms untuk 100k orang.
+
+Contoh:
+    python benchmarks/bench_kinship_path.py
+    python benchmarks/bench_kinship_path.py --rows 100000 --queries 20000 --dynasty-size 8
+
+Pasangan kueri: separuh "terhubung" (random walk 1..--max-walk langkah dari
+orang acak, seperti pertanyaan tentang satu dinasti), separuh acak (umumnya
+tidak terhubung, BFS berhenti saat salah satu komponen habis / --max-depth).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import Keluarga_v2 as K  # noqa: E402
+from synthetic_dataset import SyntheticConfig, SyntheticDataset  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def query_pairs(index, count, max_walk, seed):
+    rng = random.Random(seed)
+    n = len(index)
+    pairs = []
+    while len(pairs) < count:
+        a = rng.randrange(n)
+        if len(pairs) % 2:
+            pairs.append((a, rng.randrange(n)))
+            continue
+        b = a
+        for _ in range(rng.randint(1, max_walk)):
+            if not index.adj[b]:
+                break
+            b = rng.choice(index.adj[b])[0]
+        pairs.append((a, b))
+    return [(index.names[a], index.names[b]) for a, b in pairs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--max-walk", type=int, default=6)
+    parser.add_argument("--max-depth", type=int, default=K.KINSHIP_PATH_MAX_DEPTH)
+    parser.add_argument("--dynasty-rate", type=float, default=0.25)
+    parser.add_argument("--dynasty-size", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(SyntheticConfig(
+        rows=args.rows, seed=args.seed,
+        dynasty_rate=args.dynasty_rate, dynasty_size=args.dynasty_size,
+    ))
+    started = time.perf_counter()
+    records = [r for r in (K.kg_record_from_row(row) for row in dataset.rows()) if r]
+    index = K.KinshipIndex.from_records(records)
+    build_s = time.perf_counter() - started
+    edges = sum(len(a) for a in index.adj) // 2
+    print(f"🧬 Index: {len(index)} orang, {edges} relasi ({build_s:.1f} detik termasuk generate)")
+
+    pairs = query_pairs(index, args.queries, args.max_walk, args.seed)
+    latencies, found = [], 0
+    for a, b in pairs:
+        t0 = time.perf_counter()
+        result = index.path(a, b, max_depth=args.max_depth)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        found += result["found"]
+
+    p99 = percentile(latencies, 99)
+    print(f"  kueri: {len(pairs)} ({found} terhubung)")
+    print(f"  p50 {statistics.median(latencies):.1f} µs | p95 {percentile(latencies, 95):.1f} µs | "
+          f"p99 {p99:.1f} µs | max {max(latencies):.1f} µs")
+    print("  ✅ p99 < 1 ms" if p99 < 1000 else "  ❌ p99 >= 1 ms")
+    return 0 if p99 < 1000 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
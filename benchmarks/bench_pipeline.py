@@ -0,0 +1,283 @@
+"""
+Benchmark end-to-end Keluarga_v2 tanpa layanan live:
+Wikipedia -> WikipediaStubServer, DeepSeek -> FakeChatServer,
+Neo4j -> CountingDriver (atau Neo4j lokal via --neo4j-uri, tetap dihitung;
+atau backend SQLite via --sqlite untuk mengukur logika writer tanpa jaringan).
+
+Contoh:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --rows 200 --llm-latency 0.2 --concurrency 8
+    python benchmarks/bench_pipeline.py --only build_kg strategic_summary --repeat 10
+    python benchmarks/bench_pipeline.py --neo4j-uri bolt://localhost:7687
+    python benchmarks/bench_pipeline.py --only build_kg --sqlite :memory:
+
+Tiap run ditambahkan ke benchmarks/results/history.jsonl (throughput, p50/p95,
+round-trip) dan dibandingkan dengan run sebelumnya yang parameternya sama.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import Keluarga_v2 as K  # noqa: E402
+from stubs import CountingDriver, FakeChatServer, WikipediaStubServer  # noqa: E402
+
+BENCHMARKS = ["extract", "build_kg", "strategic_summary", "qa"]
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "results", "history.jsonl")
+QA_QUESTIONS = [
+    "siapa anggota DPR dari Lampung I yang punya pasangan dari partai berbeda?",
+    "siapa saja anggota keluarga Ratu Atut Chosiyah di DPR?",
+    "partai apa yang paling dominan di dapil Banten I?",
+]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(name, latencies, items, elapsed, driver=None, **extra):
+    result = {
+        "benchmark": name,
+        "items": items,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_per_second": round(items / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+    }
+    if hasattr(driver, "round_trips"):
+        result["round_trips"] = driver.round_trips
+        result["statements"] = driver.statements
+    result.update(extra)
+    return result
+
+
+def reset_counts(driver):
+    # SqliteGraph tidak menghitung round-trip
+    if hasattr(driver, "reset"):
+        driver.reset()
+
+
+def bench_extract(args, raw_csv, driver):
+    """
+    process_csv_with_agents_1_2: latensi per orang (Agent 1 + Agent 2).
+    """
+    latencies = []
+    original = K.extract_families_for_person
+
+    def timed(idx, nama, delay=1.0):
+        started = time.perf_counter()
+        try:
+            return original(idx, nama, delay=delay)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    K.extract_families_for_person = timed
+    reset_counts(driver)
+    out_csv = os.path.join(args.workdir, "bench_enriched.csv")
+    started = time.perf_counter()
+    try:
+        K.process_csv_with_agents_1_2(
+            raw_csv, max_rows=args.rows, concurrency=args.concurrency, out_csv=out_csv, delay=0
+        )
+    finally:
+        K.extract_families_for_person = original
+    elapsed = time.perf_counter() - started
+    return summarize("extract", latencies, len(latencies), elapsed, driver, concurrency=args.concurrency)
+
+
+def bench_build_kg(args, enriched_csv, driver):
+    """
+    build_kg_from_enriched_csv: latensi per run penuh, throughput baris/detik.
+    """
+    latencies = []
+    reset_counts(driver)
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        K.build_kg_from_enriched_csv(enriched_csv, max_rows=args.rows, batch_size=args.batch_size)
+        latencies.append(time.perf_counter() - started)
+    elapsed = sum(latencies)
+    result = summarize("build_kg", latencies, args.rows * args.repeat, elapsed, driver,
+                       batch_size=args.batch_size)
+    # round-trip per run (bukan total semua repeat) lebih mudah dibandingkan
+    if "round_trips" in result:
+        result["round_trips"] //= args.repeat
+        result["statements"] //= args.repeat
+    return result
+
+
+def bench_strategic_summary(args, enriched_csv, driver):
+    """
+    get_strategic_marriage_summary: CPU murni (tanpa jaringan).
+    """
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        K.get_strategic_marriage_summary(enriched_csv, max_rows=args.rows)
+        latencies.append(time.perf_counter() - started)
+    return summarize("strategic_summary", latencies, args.rows * args.repeat, sum(latencies))
+
+
+def bench_qa(args, enriched_csv, driver):
+    """
+    run_agent5_qa: latensi per pertanyaan (LLM stub + Cypher).
+    """
+    latencies = []
+    reset_counts(driver)
+    questions = [QA_QUESTIONS[i % len(QA_QUESTIONS)] for i in range(args.repeat)]
+    for q in questions:
+        started = time.perf_counter()
+        K.run_agent5_qa(q)
+        latencies.append(time.perf_counter() - started)
+    return summarize("qa", latencies, len(questions), sum(latencies), driver)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_previous(history_path, params):
+    if not os.path.exists(history_path):
+        return None
+    previous = None
+    with open(history_path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get("params") == params:
+                previous = entry
+    return previous
+
+
+def print_results(results, previous):
+    prev_by_name = {r["benchmark"]: r for r in (previous or {}).get("results", [])}
+    print("\n===== HASIL BENCHMARK =====")
+    print(f"{'benchmark':<18} {'items':>7} {'items/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'round-trip':>11}  vs sebelumnya")
+    for r in results:
+        delta = ""
+        prev = prev_by_name.get(r["benchmark"])
+        if prev and prev.get("throughput_per_second"):
+            change = r["throughput_per_second"] / prev["throughput_per_second"] - 1
+            delta = f"{change:+.1%} throughput ({previous.get('commit') or '?'})"
+        print(
+            f"{r['benchmark']:<18} {r['items']:>7} {r['throughput_per_second']:>10.2f} "
+            f"{r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} {str(r.get('round_trips', '-')):>11}  {delta}"
+        )
+    print("===========================\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--raw-csv", default=os.path.join(REPO_ROOT, K.CSV_RAW_PATH))
+    parser.add_argument("--enriched-csv", default=os.path.join(REPO_ROOT, K.CSV_ENRICHED_PATH))
+    parser.add_argument("--rows", type=int, default=100, help="jumlah baris yang diproses")
+    parser.add_argument("--repeat", type=int, default=5, help="pengulangan untuk build_kg / analitik / qa")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=K.KG_BATCH_SIZE)
+    parser.add_argument("--pages-dir", help="folder halaman Wikipedia tersimpan (<Judul>.html)")
+    parser.add_argument("--wiki-latency", type=float, default=0.02, help="latensi stub Wikipedia (detik)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="latensi stub LLM per langkah (detik)")
+    parser.add_argument("--llm-jitter", type=float, default=0.02)
+    parser.add_argument("--neo4j-rtt", type=float, default=0.0005, help="RTT simulasi driver palsu (detik)")
+    parser.add_argument("--neo4j-uri", help="pakai Neo4j asli (mis. container lokal) alih-alih driver palsu")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="pakai backend SQLite (file atau :memory:) alih-alih driver palsu")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--no-history", action="store_true")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    rows = pd.read_csv(args.enriched_csv).head(args.rows).to_dict("records")
+    if args.sqlite:
+        driver = K.SqliteGraph(args.sqlite)
+    elif args.neo4j_uri:
+        K.NEO4J_URI = args.neo4j_uri
+        driver = CountingDriver(inner=K.open_neo4j_driver())
+    else:
+        driver = CountingDriver(rtt=args.neo4j_rtt, records=[
+            {"name": r["Nama"], "partai": r["Partai"], "dapil": r["Dapil"]} for r in rows[:10]
+        ])
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            WikipediaStubServer(args.pages_dir, rows=rows, latency=args.wiki_latency) as wiki, \
+            FakeChatServer(latency=args.llm_latency, jitter=args.llm_jitter) as llm_server:
+        args.workdir = workdir
+        K.WIKIPEDIA_BASE_URL = wiki.url
+        K.DEEPSEEK_BASE_URL = llm_server.url
+        K.DEEPSEEK_API_KEY = "sk-bench"
+        # Tiap run mengukur download + parse, bukan cache biografi di disk
+        K.BIOGRAPHY_CACHE_DIR = ""
+        for factory in (K.get_llm, K.get_family_agent, K.get_kg_agent,
+                        K.get_strategic_agent, K.get_kg_rel_agent, K.get_qa_agent):
+            factory.cache_clear()
+        K.set_driver(driver)
+
+        runners = {
+            "extract": lambda: bench_extract(args, args.raw_csv, driver),
+            "build_kg": lambda: bench_build_kg(args, args.enriched_csv, driver),
+            "strategic_summary": lambda: bench_strategic_summary(args, args.enriched_csv, driver),
+            "qa": lambda: bench_qa(args, args.enriched_csv, driver),
+        }
+        results = []
+        for name in BENCHMARKS:
+            if name in args.only:
+                print(f"▶️ {name} ...")
+                results.append(runners[name]())
+        stub_requests = {"wikipedia": wiki.requests, "llm": llm_server.requests}
+
+    K.close_driver()
+
+    params = {
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "concurrency": args.concurrency,
+        "batch_size": args.batch_size,
+        "wiki_latency": args.wiki_latency,
+        "llm_latency": args.llm_latency,
+        "neo4j": (
+            f"sqlite({args.sqlite})" if args.sqlite
+            else "real" if args.neo4j_uri else f"fake(rtt={args.neo4j_rtt})"
+        ),
+        "pages": "saved" if args.pages_dir else "synthetic",
+    }
+    previous = None if args.no_history else load_previous(args.history, params)
+    print_results(results, previous)
+
+    if not args.no_history:
+        os.makedirs(os.path.dirname(args.history), exist_ok=True)
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "params": params,
+            "stub_requests": stub_requests,
+            "results": results,
+            "metrics": K.METRICS.report(),
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"🗂️ Hasil ditambahkan ke {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark throughput scraping Wikipedia: thread download + pool proses parser
+HTML (HTML_PARSE_WORKERS), dibandingkan dengan parsing di thread pengambil.
+
+Contoh:
+    python benchmarks/bench_scrape.py
+    python benchmarks/bench_scrape.py --rows 2000 --latency 0.05 --concurrency 16 --parse-workers 0 2 4 8
+
+Halaman disajikan WikipediaStubServer (halaman sintetis, --paragraphs per
+halaman) yang jalan di proses terpisah, supaya server tidak ikut berebut GIL
+dengan yang diukur. Cache biografi dimatikan. Teks hasil tiap konfigurasi
+dibandingkan dengan konfigurasi pertama (harus identik).
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import Keluarga_v2 as K  # noqa: E402
+from stubs import WikipediaStubServer  # noqa: E402
+from synthetic_dataset import SyntheticConfig, SyntheticDataset  # noqa: E402
+
+
+def serve_wikipedia(rows, latency, paragraphs, url_queue):
+    with WikipediaStubServer(rows=rows, latency=latency, paragraphs=paragraphs) as wiki:
+        url_queue.put(wiki.url)
+        threading.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="latensi jaringan per halaman (detik)")
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16, help="jumlah thread download")
+    parser.add_argument("--parse-workers", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = list(SyntheticDataset(SyntheticConfig(rows=args.rows, seed=args.seed)).rows())
+    url_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve_wikipedia, args=(rows, args.latency, args.paragraphs, url_queue), daemon=True
+    )
+    server.start()
+    K.WIKIPEDIA_BASE_URL = url_queue.get(timeout=30)
+    K.BIOGRAPHY_CACHE_DIR = ""
+    urls = [K.build_wikipedia_url_from_name(str(r["Nama"]).strip()) for r in rows]
+    print(f"🌐 {len(urls)} halaman, latensi {args.latency}s, {args.concurrency} thread download, "
+          f"{os.cpu_count()} CPU")
+
+    baseline = None
+    try:
+        for workers in args.parse_workers:
+            K.configure_parse_pool(workers)
+            started = time.perf_counter()
+            results = list(K.fetch_wikipedia_texts(urls, concurrency=args.concurrency))
+            seconds = time.perf_counter() - started
+            errors = sum(1 for _, _, error in results if error is not None)
+            texts = [text for _, text, _ in results]
+            if baseline is None:
+                baseline = texts
+            same = "identik" if texts == baseline else "❌ BERBEDA"
+            print(f"  parse-workers={workers}: {len(urls) / seconds:.1f} halaman/detik "
+                  f"({seconds:.2f} detik, {errors} error, teks {same})")
+    finally:
+        K.close_parse_pool()
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark waktu import `Keluarga_v2` memakai `python -X importtime`.
+
+Contoh:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 7 --compare-ref 1bb9692
+
+Dengan --compare-ref, versi Keluarga_v2.py dari commit tersebut ikut diukur
+(diambil lewat `git show`) sehingga selisih waktu startup terlihat langsung.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_NAME = "Keluarga_v2"
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse output `-X importtime` -> list (level, self_us, cumulative_us, module).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((level, int(parts[0]), int(parts[1]), name.strip()))
+    return rows
+
+
+def measure_once(module_dir: str):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = module_dir + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE_NAME}"],
+        cwd=module_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import {MODULE_NAME} gagal:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    idx = next((i for i, r in enumerate(rows) if r[3] == MODULE_NAME), None)
+    if idx is None:
+        raise RuntimeError(f"Modul {MODULE_NAME} tidak ada di output importtime.")
+
+    # importtime mencetak anak sebelum induknya: ambil import langsung milik
+    # Keluarga_v2 dengan berjalan mundur dari barisnya.
+    level = rows[idx][0]
+    children = []
+    for row in reversed(rows[:idx]):
+        if row[0] <= level:
+            break
+        if row[0] == level + 1:
+            children.append(row)
+    return rows[idx][2], children
+
+
+def measure(module_dir: str, repeat: int, top: int):
+    totals = []
+    children = []
+    for _ in range(repeat):
+        total, children = measure_once(module_dir)
+        totals.append(total)
+
+    heaviest = sorted(children, key=lambda r: -r[2])[:top]
+    return statistics.median(totals), heaviest
+
+
+def print_report(label: str, median_us: float, heaviest):
+    print(f"\n=== {label} ===")
+    print(f"  median cumulative import {MODULE_NAME}: {median_us / 1000:.1f} ms")
+    for _, _, cum, name in heaviest:
+        print(f"    {cum / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument(
+        "--compare-ref",
+        help="git ref pembanding (mis. commit sebelum lazy import)",
+    )
+    args = parser.parse_args()
+
+    current_us, heaviest = measure(REPO_ROOT, args.repeat, args.top)
+    print_report("working tree", current_us, heaviest)
+
+    if args.compare_ref:
+        source = subprocess.run(
+            ["git", "show", f"{args.compare_ref}:{MODULE_NAME}.py"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, f"{MODULE_NAME}.py"), "w", encoding="utf-8") as f:
+                f.write(source)
+            ref_us, ref_heaviest = measure(tmp, args.repeat, args.top)
+        print_report(args.compare_ref, ref_us, ref_heaviest)
+        print(f"\n⏱️ Startup {ref_us / max(current_us, 1):.1f}x lebih cepat "
+              f"({ref_us / 1000:.1f} ms -> {current_us / 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
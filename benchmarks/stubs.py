@@ -0,0 +1,469 @@
+"""
+Pengganti lokal untuk layanan eksternal, dipakai oleh benchmark:
+
+- WikipediaStubServer : HTTP server yang menyajikan halaman Wikipedia tersimpan
+  (folder berisi <Judul_Halaman>.html) atau halaman sintetis dari CSV.
+- FakeChatServer      : endpoint chat OpenAI-compatible (/chat/completions) dengan
+  latensi bisa diatur dan tool call kalengan untuk kelima agent.
+- CountingDriver      : driver Neo4j palsu yang menghitung round-trip (atau
+  membungkus driver asli, mis. Neo4j lokal di container, untuk dihitung juga).
+"""
+
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubServer:
+    """
+    Basis server HTTP yang jalan di thread background pada port acak.
+    """
+
+    handler_class = None
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ==================================================
+# WIKIPEDIA
+# ==================================================
+
+def synthetic_wikipedia_page(row: dict, paragraphs: int = 40) -> str:
+    """
+    Halaman mirip artikel id.wikipedia (infobox + paragraf) dari satu baris CSV.
+    """
+    def value(col):
+        v = row.get(col)
+        return "" if v is None or v != v else str(v)  # v != v -> NaN
+
+    infobox_rows = [
+        ("Daerah pemilihan", value("Dapil")),
+        ("Partai politik", value("Partai")),
+        ("Jabatan", value("Jabatan")),
+        ("Pendidikan", value("Pendidikan")),
+    ]
+    for entry in [e.strip() for e in value("Pasangan").split(";") if e.strip()]:
+        infobox_rows.append(("Pasangan", entry.split("(", 1)[0].strip()))
+    for entry in [e.strip() for e in value("Keluarga").split(";") if e.strip()]:
+        name, _, rel = entry.partition("(")
+        label = rel.rstrip(")").split(",")[0].strip().capitalize() or "Kerabat"
+        infobox_rows.append((label, name.strip()))
+
+    nama = html.escape(value("Nama"))
+    rows_html = "".join(
+        f"<tr><th>{html.escape(h)}</th><td>{html.escape(v)}</td></tr>"
+        for h, v in infobox_rows
+        if v
+    )
+    filler = (
+        f"{nama} adalah politikus Indonesia yang menjabat sebagai anggota "
+        "Dewan Perwakilan Rakyat. Ia aktif dalam berbagai organisasi "
+        "kemasyarakatan dan kepartaian sebelum terpilih. "
+    ) * 4
+    paras = "".join(f"<p>{filler}</p><div class=\"nav\"><a href=\"#\">[{i}]</a></div>"
+                    for i in range(paragraphs))
+    return (
+        f"<!DOCTYPE html><html><head><title>{nama} - Wikipedia</title></head><body>"
+        f"<h1>{nama}</h1><div id=\"mw-content-text\"><table class=\"infobox\">"
+        f"{rows_html}</table>{paras}</div></body></html>"
+    )
+
+
+class _WikipediaHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.count_request()
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        path = urllib.parse.urlparse(self.path).path
+        if not path.startswith("/wiki/"):
+            self.send_error(404)
+            return
+        title = urllib.parse.unquote(path[len("/wiki/"):])
+        page = stub.page_for(title)
+        if page is None:
+            self.send_error(404)
+            return
+
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class WikipediaStubServer(_StubServer):
+    """
+    pages_dir : folder berisi <Judul_Halaman>.html (hasil `save_wikipedia_pages`)
+    rows      : list dict baris CSV -> halaman sintetis untuk judul yang tidak tersimpan
+    """
+
+    handler_class = _WikipediaHandler
+
+    def __init__(self, pages_dir: str = None, rows=None, latency: float = 0.0,
+                 paragraphs: int = 40, **kwargs):
+        super().__init__(**kwargs)
+        self.pages_dir = pages_dir
+        self.latency = latency
+        self.paragraphs = paragraphs
+        self.rows = {}
+        for row in rows or []:
+            nama = str(row.get("Nama", "")).strip()
+            if nama:
+                self.rows[nama.replace(" ", "_")] = row
+
+    def page_for(self, title: str):
+        if self.pages_dir:
+            path = os.path.join(self.pages_dir, f"{title}.html")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        row = self.rows.get(title)
+        if row is not None:
+            return synthetic_wikipedia_page(row, self.paragraphs)
+        return None
+
+
+def save_wikipedia_pages(names, out_dir: str, base_url: str = "https://id.wikipedia.org"):
+    """
+    Simpan halaman Wikipedia asli sekali saja, untuk disajikan ulang oleh stub.
+    """
+    import requests
+
+    os.makedirs(out_dir, exist_ok=True)
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; RafyBot/1.0; +https://example.com/bot)"}
+    saved = 0
+    for name in names:
+        title = name.replace(" ", "_")
+        resp = requests.get(f"{base_url}/wiki/{urllib.parse.quote(title)}", headers=headers, timeout=20)
+        if resp.status_code != 200:
+            continue
+        with open(os.path.join(out_dir, f"{title}.html"), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        saved += 1
+        time.sleep(0.5)
+    return saved
+
+
+# ==================================================
+# LLM (OPENAI-COMPATIBLE)
+# ==================================================
+
+_RELATION_HEADERS = {
+    "pasangan": "istri",
+    "suami": "suami",
+    "istri": "istri",
+    "anak": "anak",
+    "orang tua": "orang tua",
+    "ayah": "ayah",
+    "ibu": "ibu",
+    "saudara": "saudara",
+    "kerabat": "saudara",
+    "menantu": "menantu",
+    "mertua": "mertua",
+    "cucu": "cucu",
+}
+
+
+def _families_from_biography(tool_output: str):
+    """
+    Jawaban kalengan Agent 1: relasi keluarga dari baris infobox "Header: nilai".
+    """
+    source_url = ""
+    families = []
+    for line in tool_output.splitlines():
+        if line.startswith("SOURCE_URL::"):
+            source_url = line[len("SOURCE_URL::"):].strip()
+            continue
+        header, sep, value = line.partition(":")
+        relation = _RELATION_HEADERS.get(header.strip().lower())
+        if not sep or relation is None:
+            continue
+        for name in re.split(r"\s*[;,]\s*", value.strip()):
+            if name:
+                families.append({"relation": relation, "name": name, "note": ""})
+    return source_url, families
+
+
+def _first_json_object(text: str):
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+
+
+def _message_text(message) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "\n".join(c.get("text", "") for c in content if isinstance(c, dict))
+    return str(content)
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.count_request()
+        length = int(self.headers.get("Content-Length", "0"))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        latency = stub.latency + random.uniform(0, stub.jitter)
+        if latency:
+            time.sleep(latency)
+
+        message, finish_reason = stub.reply(request)
+        prompt_chars = sum(len(_message_text(m)) for m in request.get("messages", []))
+        system_chars = sum(
+            len(_message_text(m)) for m in request.get("messages", []) if m.get("role") == "system"
+        )
+        completion_chars = len(message.get("content") or "") + len(json.dumps(message.get("tool_calls", [])))
+        body = json.dumps({
+            "id": f"chatcmpl-stub-{stub.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "deepseek-chat"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion_chars // 4,
+                "total_tokens": (prompt_chars + completion_chars) // 4,
+                # Simulasi prefix cache provider: system prompt dianggap selalu kena cache
+                "prompt_tokens_details": {"cached_tokens": system_chars // 4},
+            },
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeChatServer(_StubServer):
+    """
+    Endpoint /chat/completions palsu. Langkah pertama tiap agent selalu berupa
+    tool call ke tool pertama (argumen diambil dari prompt user), langkah kedua
+    jawaban akhir kalengan berdasarkan hasil tool.
+    """
+
+    handler_class = _ChatHandler
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, qa_cypher: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.jitter = jitter
+        self.qa_cypher = qa_cypher or (
+            "MATCH (p:Person)-[:SPOUSE_OF]->(s:Person) "
+            "RETURN p.name AS name, p.partai AS partai, p.dapil AS dapil LIMIT 10"
+        )
+        self._call_ids = 0
+
+    def _tool_args(self, tool_name: str, user_text: str) -> dict:
+        if tool_name == "get_wikipedia_biography":
+            m = re.search(r'name="([^"]+)"', user_text)
+            return {"name": m.group(1) if m else user_text.strip()}
+        if tool_name == "store_family_in_neo4j":
+            data = _first_json_object(user_text)
+            return {
+                "person": data.get("person", ""),
+                "families": data.get("families", []),
+                "source_url": data.get("source_url"),
+            }
+        if tool_name in ("get_strategic_marriage_summary", "build_kg_from_enriched_csv"):
+            m = re.search(r'csv_path = "([^"]+)"', user_text) or re.search(
+                r"CSV berikut:\s*(\S+)", user_text
+            )
+            args = {"csv_path": m.group(1) if m else ""}
+            m_rows = re.search(r"max_rows = (\d+)", user_text)
+            if m_rows:
+                args["max_rows"] = int(m_rows.group(1))
+            return args
+        if tool_name == "run_cypher_query":
+            return {"cypher": self.qa_cypher}
+        return {}
+
+    def reply(self, request: dict):
+        messages = request.get("messages", [])
+        tools = request.get("tools") or []
+        user_text = next((_message_text(m) for m in messages if m.get("role") == "user"), "")
+        tool_outputs = [_message_text(m) for m in messages if m.get("role") == "tool"]
+
+        if tools and not tool_outputs:
+            tool_name = tools[0]["function"]["name"]
+            with self._lock:
+                self._call_ids += 1
+                call_id = f"call_{self._call_ids}"
+            return {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_name,
+                        "arguments": json.dumps(self._tool_args(tool_name, user_text), ensure_ascii=False),
+                    },
+                }],
+            }, "tool_calls"
+
+        tool_name = tools[0]["function"]["name"] if tools else ""
+        last_tool = tool_outputs[-1] if tool_outputs else ""
+        if tool_name == "get_wikipedia_biography":
+            source_url, families = _families_from_biography(last_tool)
+            name = self._tool_args(tool_name, user_text)["name"]
+            content = json.dumps(
+                {"person": name, "source_url": source_url, "families": families}, ensure_ascii=False
+            )
+        elif tool_name == "store_family_in_neo4j":
+            content = json.dumps(_first_json_object(user_text), ensure_ascii=False)
+        else:
+            content = f"Ringkasan otomatis (stub) dari {len(last_tool)} karakter hasil tool."
+        return {"role": "assistant", "content": content}, "stop"
+
+
+# ==================================================
+# NEO4J
+# ==================================================
+
+class _FakeResult:
+    def __init__(self, records=None):
+        self._records = records or []
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def consume(self):
+        return None
+
+
+class _CountingRunner:
+    def __init__(self, driver, inner=None):
+        self._driver = driver
+        self._inner = inner
+
+    def run(self, query, parameters=None, **kwargs):
+        self._driver.round_trip(query)
+        if self._inner is not None:
+            return self._inner.run(query, parameters, **kwargs)
+        return _FakeResult(self._driver.records_for(query))
+
+
+class _CountingSession(_CountingRunner):
+    def __enter__(self):
+        if self._inner is not None:
+            self._inner.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self._inner is not None:
+            return self._inner.__exit__(*exc)
+        return False
+
+    def close(self):
+        if self._inner is not None:
+            self._inner.close()
+
+    def execute_write(self, work, *args, **kwargs):
+        return self._execute(work, "execute_write", *args, **kwargs)
+
+    def execute_read(self, work, *args, **kwargs):
+        return self._execute(work, "execute_read", *args, **kwargs)
+
+    def _execute(self, work, method, *args, **kwargs):
+        if self._inner is not None:
+            def wrapped(tx, *a, **kw):
+                return work(_CountingRunner(self._driver, tx), *a, **kw)
+            result = getattr(self._inner, method)(wrapped, *args, **kwargs)
+        else:
+            result = work(_CountingRunner(self._driver), *args, **kwargs)
+        self._driver.round_trip("COMMIT")
+        return result
+
+
+class CountingDriver:
+    """
+    Driver Neo4j palsu yang menghitung round-trip (statement + commit) dan
+    mensimulasikan RTT jaringan. Dengan `inner` (driver asli, mis. ke Neo4j di
+    container lokal), semua query diteruskan dan tetap dihitung.
+    """
+
+    def __init__(self, inner=None, rtt: float = 0.0, records=None):
+        self.inner = inner
+        self.rtt = rtt
+        self.records = records or []
+        self.round_trips = 0
+        self.statements = 0
+        self._lock = threading.Lock()
+
+    def round_trip(self, query):
+        with self._lock:
+            self.round_trips += 1
+            if query != "COMMIT":
+                self.statements += 1
+        if self.inner is None and self.rtt:
+            time.sleep(self.rtt)
+
+    def records_for(self, query):
+        # Hanya query baca yang kolom RETURN-nya cocok dengan records (query QA)
+        if not self.records or not query.lstrip().upper().startswith("MATCH"):
+            return []
+        return list(self.records) if all(f"AS {k}" in query for k in self.records[0]) else []
+
+    def reset(self):
+        with self._lock:
+            self.round_trips = 0
+            self.statements = 0
+
+    def session(self, **kwargs):
+        inner = self.inner.session(**kwargs) if self.inner is not None else None
+        return _CountingSession(self, inner)
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
@@ -0,0 +1,373 @@
+"""
+Generator dataset kekerabatan sintetis untuk uji skala (1k – 1M baris).
+
+Format keluaran sama persis dengan anggota_dpr(_enriched).csv:
+    Nama,Dapil,Partai,Jabatan,Pendidikan,Pasangan,Keluarga
+dengan Pasangan/Keluarga berformat "Nama (relasi)" / "Nama (relasi, catatan)"
+dipisah "; ", dan Jabatan/Pendidikan dipisah "; " (termasuk duplikat seperti
+data asli).
+
+Contoh:
+    python benchmarks/synthetic_dataset.py --rows 100000 --out /tmp/dpr_100k.csv
+    python benchmarks/synthetic_dataset.py --rows 1000000 --marriage-density 0.8 \\
+        --cross-party-rate 0.3 --dynasty-rate 0.4 --dynasty-size 6 --out /tmp/dpr_1m.csv
+
+Semua atribut baris ke-i dihitung deterministik dari (seed, i), jadi generator
+bersifat streaming (memori konstan) dan pasangan bisa menunjuk baris lain yang
+belum ditulis.
+
+Relasi saling konsisten: tiap anggota dinasti punya peran tetap (kepala, anak,
+cucu) sehingga entri timbal baliknya berlabel kebalikan (ayah <-> anak, kakek
+<-> cucu, paman <-> keponakan, ...), satu dinasti berada di satu Dapil, dan
+pasangan sesama anggota saling mencantumkan (istri <-> suami). Jumlah Dapil
+bisa diatur (default 84, seperti pemilu DPR 2019/2024).
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+
+COLUMNS = ["Nama", "Dapil", "Partai", "Jabatan", "Pendidikan", "Pasangan", "Keluarga"]
+
+FIRST_NAMES = [
+    "Ahmad", "Muhammad", "Siti", "Dewi", "Budi", "Agus", "Sri", "Rina", "Hendra", "Yusuf",
+    "Putri", "Andi", "Rizky", "Nur", "Fitri", "Dian", "Bambang", "Eko", "Indah", "Taufik",
+    "Hidayat", "Ratna", "Arief", "Wahyu", "Lestari", "Fajar", "Intan", "Joko", "Kartika", "Lukman",
+    "Maya", "Nanda", "Oktavia", "Prasetyo", "Rahmat", "Sari", "Teguh", "Utami", "Vina", "Wulan",
+    "Yanti", "Zainal", "Ayu", "Bayu", "Citra", "Dimas", "Erlangga", "Fikri", "Gita", "Hana",
+]
+MIDDLE_NAMES = [
+    "", "Nur", "Dwi", "Tri", "Adi", "Rahma", "Cahya", "Puspita", "Surya", "Wira",
+    "Kusuma", "Bagus", "Ratu", "Mulia", "Jaya", "Eka", "Aditya", "Bima", "Sekar", "Tirta",
+]
+SYLLABLES = ["ba", "da", "ka", "la", "ma", "na", "ra", "sa", "ta", "wa", "ri", "no", "to", "yo", "ni", "su"]
+SURNAMES = [
+    "Santoso", "Wijaya", "Hasan", "Siregar", "Nasution", "Harahap", "Lubis", "Simanjuntak",
+    "Sitompul", "Pohan", "Tanjung", "Rais", "Sochib", "Chosiyah", "Soekarnoputri", "Yudhoyono",
+    "Baswedan", "Kalla", "Limpo", "Mappanyukki", "Pangestu", "Hutapea", "Manurung", "Saragih",
+    "Wibowo", "Susanto", "Hidayat", "Rahman", "Kurniawan", "Setiawan", "Gunawan", "Halim",
+    "Pratama", "Saputra", "Hakim", "Fauzi", "Anwar", "Zulkarnain", "Syahputra", "Tambunan",
+]
+PARTIES = ["PDI-P", "Golkar", "Gerindra", "NasDem", "PKB", "PKS", "PAN", "Demokrat", "PPP", "Hanura"]
+PROVINCES = [
+    "Aceh", "Sumatera Utara", "Sumatera Barat", "Riau", "Jambi", "Sumatera Selatan", "Bengkulu",
+    "Lampung", "Banten", "DKI Jakarta", "Jawa Barat", "Jawa Tengah", "DI Yogyakarta", "Jawa Timur",
+    "Bali", "Nusa Tenggara Barat", "Nusa Tenggara Timur", "Kalimantan Barat", "Kalimantan Timur",
+    "Sulawesi Selatan", "Sulawesi Utara", "Maluku", "Papua",
+]
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI"]
+POSITIONS = [
+    "DPR RI",
+    "Anggota Dewan Perwakilan Rakyat Republik Indonesia",
+    "Ketua Komisi",
+    "Wakil Ketua Komisi",
+    "Ketua Fraksi",
+    "Anggota DPRD Provinsi",
+    "Anggota DPRD Kabupaten",
+    "Bupati",
+    "Wakil Bupati",
+    "Wali Kota",
+    "Gubernur",
+    "Wakil Gubernur",
+    "Sekretaris Jenderal Partai",
+    "Bendahara Umum Partai",
+    "Ketua Dewan Pimpinan Daerah",
+    "Menteri",
+]
+EDUCATIONS = [
+    "Universitas Indonesia", "UI", "Universitas Gadjah Mada", "UGM", "Institut Teknologi Bandung",
+    "ITB", "Universitas Padjadjaran", "Universitas Airlangga", "Universitas Diponegoro",
+    "Universitas Brawijaya", "Universitas Hasanuddin", "Universitas Sumatera Utara",
+    "Universitas Trisakti", "Universitas Jayabaya", "STIE Pengembangan Bisnis dan Manajemen",
+    "Universitas Ibn Khaldun", "Institut Pertanian Bogor", "IPB",
+]
+# Hanya untuk kerabat di luar dataset (tanpa baris balasan)
+KIN_RELATIONS = ["anak", "ayah", "ibu", "saudara", "saudara kandung", "cucu", "menantu", "mertua"]
+KIN_NOTES = ["", "", "", "Bupati", "Anggota DPRD", "Gubernur", "pengusaha"]
+
+# Peran dalam blok dinasti menurut offset: 0 = kepala, 1..3 = anak kepala,
+# 4.. = cucu (orang tuanya anak ke-1 + (offset - 4) % 3)
+DYNASTY_CHILDREN = 3
+
+_TAG_DYNASTY, _TAG_SURNAME, _TAG_PARTY, _TAG_DAPIL, _TAG_ROW, _TAG_SPOUSE, _TAG_GENDER, _TAG_NOTE = range(8)
+
+
+class SyntheticConfig:
+    def __init__(
+        self,
+        rows: int = 1000,
+        seed: int = 42,
+        marriage_density: float = 0.7,
+        member_spouse_rate: float = 0.15,
+        cross_party_rate: float = 0.2,
+        dynasty_rate: float = 0.25,
+        dynasty_size: int = 5,
+        position_dup_rate: float = 0.1,
+        dapil_count: int = 84,
+    ):
+        self.rows = rows
+        self.seed = seed
+        self.marriage_density = marriage_density  # fraksi baris yang punya pasangan
+        self.member_spouse_rate = member_spouse_rate  # fraksi pasangan yang juga anggota (baris lain)
+        self.cross_party_rate = cross_party_rate  # peluang pasangan-anggota beda partai
+        self.dynasty_rate = dynasty_rate  # peluang satu blok indeks menjadi dinasti
+        self.dynasty_size = max(2, dynasty_size)  # ukuran maksimum blok dinasti
+        self.position_dup_rate = position_dup_rate  # peluang daftar Jabatan terduplikasi
+        self.dapil_count = max(1, dapil_count)  # jumlah Dapil berbeda
+
+
+class SyntheticDataset:
+    """
+    Atribut tiap baris dihitung dari (seed, i) -> akses acak O(1), tanpa state.
+    """
+
+    def __init__(self, config: SyntheticConfig):
+        self.c = config
+
+    def _rng(self, tag: int, i: int):
+        # Seed integer (bukan hash() string yang diacak per proses) -> hasil sama tiap run
+        return random.Random((self.c.seed * 16 + tag) * 0x9E3779B1 + i)
+
+    # --- Dinasti: indeks dibagi blok berukuran dynasty_size ---
+    def dynasty_of(self, i: int):
+        block = i // self.c.dynasty_size
+        rng = self._rng(_TAG_DYNASTY, block)
+        if rng.random() >= self.c.dynasty_rate:
+            return None
+        members = rng.randint(2, self.c.dynasty_size)
+        start = block * self.c.dynasty_size
+        if i - start >= members:
+            return None
+        return {
+            "block": block,
+            "start": start,
+            "end": min(start + members, self.c.rows),
+            "surname": SURNAMES[rng.randrange(len(SURNAMES))] + _syllables(block, 0),
+            "party": PARTIES[rng.randrange(len(PARTIES))],
+            "dapil": rng.randrange(self.c.dapil_count),
+        }
+
+    @staticmethod
+    def _generation(offset: int) -> int:
+        return 0 if offset == 0 else 1 if offset <= DYNASTY_CHILDREN else 2
+
+    @staticmethod
+    def _parent_offset(offset: int):
+        if offset == 0:
+            return None
+        if offset <= DYNASTY_CHILDREN:
+            return 0
+        return 1 + (offset - DYNASTY_CHILDREN - 1) % DYNASTY_CHILDREN
+
+    def kin_label(self, dynasty, i: int, j: int) -> str:
+        """
+        Label j dilihat dari i ("Nama j (label)" di kolom Keluarga baris i),
+        dari peran tetap keduanya -> entri balasannya selalu kebalikannya.
+        """
+        a, b = i - dynasty["start"], j - dynasty["start"]
+        ga, gb = self._generation(a), self._generation(b)
+        male = self.gender_of(j) == "L"
+        if self._parent_offset(a) == b:
+            return "ayah" if male else "ibu"
+        if self._parent_offset(b) == a:
+            return "anak"
+        if ga == gb and self._parent_offset(a) == self._parent_offset(b):
+            return "saudara kandung"
+        if ga == gb:
+            return "sepupu"
+        if (ga, gb) == (2, 0):
+            return "kakek" if male else "nenek"
+        if (ga, gb) == (0, 2):
+            return "cucu"
+        if (ga, gb) == (2, 1):
+            return "paman" if male else "bibi"
+        return "keponakan"
+
+    # --- Pasangan sesama anggota: baris i <-> i + rows // 2 ---
+    def _member_pair(self, i: int):
+        """
+        (pasangan, beda partai?) jika baris i menikah dengan anggota lain,
+        else None. Dihitung dari indeks terkecil pasangan -> sama di kedua baris.
+        """
+        half = self.c.rows // 2
+        if half == 0 or i >= 2 * half:
+            return None
+        j = i + half if i < half else i - half
+        rng = self._rng(_TAG_SPOUSE, min(i, j))
+        if rng.random() >= self.c.marriage_density * self.c.member_spouse_rate:
+            return None
+        return j, rng.random() < self.c.cross_party_rate
+
+    def gender_of(self, i: int) -> str:
+        pair = self._member_pair(i)
+        if pair and pair[0] < i:
+            return "P" if self._base_gender(pair[0]) == "L" else "L"
+        return self._base_gender(i)
+
+    def _base_gender(self, i: int) -> str:
+        return "L" if self._rng(_TAG_GENDER, i).random() < 0.7 else "P"
+
+    def note_of(self, i: int) -> str:
+        # Catatan tentang orang ini (jabatan lain dsb.), sama di semua baris yang menyebutnya
+        return self._rng(_TAG_NOTE, i).choice(KIN_NOTES)
+
+    def name_of(self, i: int) -> str:
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        middle = MIDDLE_NAMES[(i // len(FIRST_NAMES)) % len(MIDDLE_NAMES)]
+        extra = _syllables(i // (len(FIRST_NAMES) * len(MIDDLE_NAMES)), 1).capitalize()
+        dynasty = self.dynasty_of(i)
+        if dynasty:
+            surname = dynasty["surname"]
+        else:
+            surname = SURNAMES[self._rng(_TAG_SURNAME, i).randrange(len(SURNAMES))]
+        return " ".join(part for part in (first, middle, extra, surname) if part)
+
+    def _base_party(self, i: int) -> str:
+        dynasty = self.dynasty_of(i)
+        rng = self._rng(_TAG_PARTY, i)
+        if dynasty and rng.random() < 0.85:
+            return dynasty["party"]
+        return PARTIES[rng.randrange(len(PARTIES))]
+
+    def party_of(self, i: int) -> str:
+        # Pasangan-anggota kedua (di luar dinasti) mengikuti cross_party_rate
+        party = self._base_party(i)
+        pair = self._member_pair(i)
+        if not pair or pair[0] > i or self.dynasty_of(i):
+            return party
+        j, cross = pair
+        partner = self._base_party(j)
+        if not cross:
+            return partner
+        if party != partner:
+            return party
+        k = PARTIES.index(partner)
+        return PARTIES[(k + 1 + self._rng(_TAG_PARTY, i).randrange(len(PARTIES) - 1)) % len(PARTIES)]
+
+    @staticmethod
+    def dapil_name(k: int) -> str:
+        # 0 -> "Aceh I", 1 -> "Sumatera Utara I", ..., 23 -> "Aceh II", ...
+        number = k // len(PROVINCES)
+        suffix = ROMAN[number] if number < len(ROMAN) else str(number + 1)
+        return f"{PROVINCES[k % len(PROVINCES)]} {suffix}"
+
+    def dapil_of(self, i: int) -> str:
+        # Satu Dapil per dinasti
+        dynasty = self.dynasty_of(i)
+        k = dynasty["dapil"] if dynasty else self._rng(_TAG_DAPIL, i).randrange(self.c.dapil_count)
+        return self.dapil_name(k)
+
+    def _spouse(self, i: int, rng):
+        pair = self._member_pair(i)
+        if pair:
+            j = pair[0]
+            return f"{self.name_of(j)} ({'suami' if self.gender_of(j) == 'L' else 'istri'})"
+        # Pasangan di luar dataset (tidak punya baris balasan)
+        if rng.random() >= self.c.marriage_density * (1 - self.c.member_spouse_rate):
+            return None
+        label = "istri" if self.gender_of(i) == "L" else "suami"
+        external = f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}{_syllables(i, 2)}"
+        return f"{external} ({label})"
+
+    def _relatives(self, i: int, rng):
+        dynasty = self.dynasty_of(i)
+        entries = []
+        if dynasty:
+            others = [j for j in range(dynasty["start"], dynasty["end"]) if j != i]
+            for j in rng.sample(others, k=min(len(others), rng.randint(1, 3))):
+                note = self.note_of(j)
+                rel = self.kin_label(dynasty, i, j)
+                entries.append(f"{self.name_of(j)} ({rel}, {note})" if note else f"{self.name_of(j)} ({rel})")
+        elif rng.random() < 0.1:
+            entries.append(f"{rng.choice(FIRST_NAMES)} {self.name_of(i).split()[-1]} ({rng.choice(KIN_RELATIONS)})")
+        return entries
+
+    def row(self, i: int) -> dict:
+        rng = self._rng(_TAG_ROW, i)
+        positions = rng.sample(POSITIONS, k=rng.randint(1, 4))
+        if "DPR RI" not in positions:
+            positions.append("DPR RI")
+        if rng.random() < self.c.position_dup_rate:
+            positions = positions + positions  # pola duplikat seperti baris Ahmad Muzani
+        educations = rng.sample(EDUCATIONS, k=rng.randint(1, 2))
+        spouse = self._spouse(i, rng)
+        return {
+            "Nama": self.name_of(i),
+            "Dapil": self.dapil_of(i),
+            "Partai": self.party_of(i),
+            "Jabatan": "; ".join(positions),
+            "Pendidikan": "; ".join(educations),
+            "Pasangan": spouse or "",
+            "Keluarga": "; ".join(self._relatives(i, rng)),
+        }
+
+    def rows(self):
+        for i in range(self.c.rows):
+            yield self.row(i)
+
+
+def _syllables(n: int, min_len: int) -> str:
+    """
+    Bilangan -> rangkaian suku kata unik (basis len(SYLLABLES)), untuk nama unik.
+    """
+    out = []
+    while n > 0 or len(out) < min_len:
+        n, r = divmod(n, len(SYLLABLES))
+        out.append(SYLLABLES[r])
+        if n == 0 and len(out) >= min_len:
+            break
+    return "".join(out)
+
+
+def write_csv(path: str, config: SyntheticConfig, encoding: str = "utf-8-sig") -> int:
+    """
+    Tulis dataset ke CSV secara streaming. Return jumlah baris.
+    """
+    dataset = SyntheticDataset(config)
+    count = 0
+    with open(path, "w", encoding=encoding, newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in dataset.rows():
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--marriage-density", type=float, default=0.7)
+    parser.add_argument("--member-spouse-rate", type=float, default=0.15)
+    parser.add_argument("--cross-party-rate", type=float, default=0.2)
+    parser.add_argument("--dynasty-rate", type=float, default=0.25)
+    parser.add_argument("--dynasty-size", type=int, default=5)
+    parser.add_argument("--position-dup-rate", type=float, default=0.1)
+    parser.add_argument("--dapil-count", type=int, default=84, help="jumlah Dapil berbeda")
+    parser.add_argument("--no-bom", action="store_true", help="tulis UTF-8 tanpa BOM (seperti anggota_dpr.csv)")
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        rows=args.rows,
+        seed=args.seed,
+        marriage_density=args.marriage_density,
+        member_spouse_rate=args.member_spouse_rate,
+        cross_party_rate=args.cross_party_rate,
+        dynasty_rate=args.dynasty_rate,
+        dynasty_size=args.dynasty_size,
+        position_dup_rate=args.position_dup_rate,
+        dapil_count=args.dapil_count,
+    )
+    started = time.perf_counter()
+    count = write_csv(args.out, config, encoding="utf-8" if args.no_bom else "utf-8-sig")
+    size_mb = os.path.getsize(args.out) / 1e6
+    print(f"💾 {count} baris sintetis ditulis ke {args.out} ({size_mb:.1f} MB, "
+          f"{time.perf_counter() - started:.1f} detik)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Fixture bersama untuk tes. Semua tes jalan tanpa layanan luar: graf memakai
+SqliteGraph(":memory:"), dataset ditulis ke tmp_path.
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import Keluarga_v2 as K  # noqa: E402
+
+ENRICHED_HEADER = ["Nama", "Dapil", "Partai", "Jabatan", "Pendidikan", "Pasangan", "Keluarga"]
+
+
+@pytest.fixture
+def graph():
+    # Graf SQLite di memori dipasang sebagai driver bersama, dilepas setelah tes
+    g = K.SqliteGraph(":memory:")
+    K.set_driver(g)
+    try:
+        yield g
+    finally:
+        K.set_driver(None)
+        g.close()
+
+
+@pytest.fixture
+def write_enriched(tmp_path):
+    # rows: [dict kolom -> nilai]; kolom yang tidak diisi jadi sel kosong
+    import csv
+
+    def write(rows, name="enriched.csv"):
+        path = tmp_path / name
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=ENRICHED_HEADER)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({col: row.get(col, "") for col in ENRICHED_HEADER})
+        return str(path)
+
+    return write
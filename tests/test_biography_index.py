@@ -0,0 +1,109 @@
+import json
+import os
+
+import pytest
+
+import Keluarga_v2 as K
+
+TEXT = (
+    "INFORMASI PRIBADI (INFOBOX)\nLahir: Bandung, 1970\nTEKS ARTIKEL\n"
+    "Ia menempuh pendidikan di Institut Teknologi Bandung.\nIa kemudian menjadi anggota DPR."
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = str(tmp_path / "biography_cache")
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_DIR", path)
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_MAX_AGE", 0.0)
+    return path
+
+
+@pytest.fixture
+def shared_index(tmp_path, monkeypatch, cache_dir):
+    monkeypatch.setattr(K, "BIOGRAPHY_INDEX_PATH", str(tmp_path / "index.sqlite"))
+    monkeypatch.setattr(K, "_biography_index", None)
+    monkeypatch.setattr(K, "_biography_index_synced", None)
+    yield
+    if K._biography_index is not None:
+        K._biography_index.close()
+
+
+def test_cache_is_off_by_default(monkeypatch, tmp_path):
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_DIR", "")
+    monkeypatch.chdir(tmp_path)
+    K.write_cached_biography("https://id.wikipedia.org/wiki/A", TEXT)
+    assert K.read_cached_biography("https://id.wikipedia.org/wiki/A") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_entry_is_a_miss(cache_dir, monkeypatch):
+    url = "https://id.wikipedia.org/wiki/A"
+    K.write_cached_biography(url, TEXT)
+    assert K.read_cached_biography(url) == TEXT
+
+    path = K.biography_cache_path(url)
+    with open(path, encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["fetched_at"] -= 2 * 3600 * 1000
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_MAX_AGE", 3600.0)
+    assert K.read_cached_biography(url) is None
+
+
+def test_index_update_is_incremental(cache_dir, tmp_path):
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Budi_Santoso", TEXT)
+    index = K.BiographyIndex(str(tmp_path / "index.sqlite"))
+    try:
+        assert index.update_from_cache()["added"] == 1
+        assert index.update_from_cache()["unchanged"] == 1
+
+        os.remove(K.biography_cache_path("https://id.wikipedia.org/wiki/Budi_Santoso"))
+        assert index.update_from_cache()["deleted"] == 1 and len(index) == 0
+    finally:
+        index.close()
+
+
+def test_search_ranks_matching_paragraph(cache_dir, tmp_path):
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Budi_Santoso", TEXT)
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Siti_Aminah", "TEKS ARTIKEL\nIa lahir di Medan.")
+    index = K.BiographyIndex(str(tmp_path / "index.sqlite"))
+    try:
+        index.update_from_cache()
+        hits = index.search("pendidikan teknologi")
+        assert hits[0]["name"] == "Budi Santoso" and "Institut Teknologi Bandung" in hits[0]["text"]
+        assert [h["name"] for h in index.search("lahir", person="Siti Aminah")] == ["Siti Aminah"]
+    finally:
+        index.close()
+
+
+def test_shared_index_resyncs_when_cache_changes(shared_index):
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Budi_Santoso", TEXT)
+    index = K.get_biography_index()
+    assert len(index) == 1
+
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Siti_Aminah", "TEKS ARTIKEL\nIa lahir di Medan.")
+    hits = json.loads(K.search_biographies("Medan"))["hits"]
+    assert K.get_biography_index() is index and len(index) == 2
+    assert hits[0]["name"] == "Siti Aminah"
+
+
+def test_no_cache_leaves_index_alone(cache_dir, tmp_path, monkeypatch):
+    K.write_cached_biography("https://id.wikipedia.org/wiki/Budi_Santoso", TEXT)
+    index = K.BiographyIndex(str(tmp_path / "index.sqlite"))
+    try:
+        index.update_from_cache()
+        monkeypatch.setattr(K, "BIOGRAPHY_CACHE_DIR", "")
+        assert index.update_from_cache()["deleted"] == 0 and len(index) == 1
+    finally:
+        index.close()
+
+
+def test_search_on_empty_index_explains_why(shared_index, monkeypatch):
+    result = json.loads(K.search_biographies("pendidikan"))
+    assert result["hits"] == [] and "belum ada biografi" in result["error"]
+
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_DIR", "")
+    result = json.loads(K.search_biographies("pendidikan"))
+    assert result["hits"] == [] and "cache biografi tidak aktif" in result["error"]
@@ -0,0 +1,97 @@
+import csv
+import json
+import os
+
+import pytest
+
+import Keluarga_v2 as K
+
+ROWS = [
+    {"Nama": "Ahmad", "Dapil": "Banten I", "Partai": "Gerindra", "Jabatan": "Ketua Komisi",
+     "Pendidikan": "Universitas Indonesia", "Pasangan": "Siti (istri)"},
+    {"Nama": "Siti", "Dapil": "Banten I", "Partai": "Gerindra", "Keluarga": "Budi (ayah)"},
+    # Nama yang sama dipakai label lain: ID harus tetap unik
+    {"Nama": "Banten II", "Dapil": "Banten II", "Partai": "Golkar",
+     "Jabatan": "Golkar", "Pendidikan": "Universitas Indonesia"},
+]
+FAMILY = {"person": "Ahmad", "source_url": "https://id.wikipedia.org/wiki/Ahmad",
+          "families": [{"relation": "anak", "name": "Rudi", "note": "putra sulung"}]}
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    return rows[0], rows[1:]
+
+
+@pytest.fixture
+def export(tmp_path, write_enriched):
+    family_path = tmp_path / "families.jsonl"
+    family_path.write_text(json.dumps(FAMILY) + "\n", encoding="utf-8")
+    out_dir = tmp_path / "bulk"
+    summary = K.export_bulk_import(write_enriched(ROWS), str(out_dir), [str(family_path)])
+    return summary, str(out_dir)
+
+
+def node_ids(out_dir):
+    # {id: (label, nama)} dari semua file node
+    ids = {}
+    for label in K.BULK_NODE_LABELS:
+        header, rows = read_rows(os.path.join(out_dir, f"nodes_{label.lower()}.csv"))
+        for row in rows:
+            assert row[0] not in ids
+            ids[row[0]] = (row[-1], row[1])
+    return ids
+
+
+def test_headers_use_neo4j_admin_syntax(export):
+    summary, out_dir = export
+    header, rows = read_rows(os.path.join(out_dir, "nodes_person.csv"))
+    assert header[:2] == [":ID(Person)", "name"] and header[-1] == ":LABEL"
+    assert "created_at:long" in header and "kg_hash" in header
+    assert {row[-1] for row in rows} == {"Person"}
+
+    header, _ = read_rows(os.path.join(out_dir, "rels_represents.csv"))
+    assert header == [":START_ID(Person)", ":END_ID(Dapil)", ":TYPE"]
+    header, rows = read_rows(os.path.join(out_dir, "rels_spouse_of.csv"))
+    assert header[:2] == [":START_ID(Person)", ":END_ID(Person)"] and header[-1] == ":TYPE"
+    assert "created_at:long" in header and "relation_label" in header
+    assert {row[-1] for row in rows} == {"SPOUSE_OF"}
+
+    assert "--nodes=" + os.path.join(out_dir, "nodes_person.csv") in summary["command"]
+    assert "--relationships=" + os.path.join(out_dir, "rels_spouse_of.csv") in summary["command"]
+
+
+def test_ids_are_unique_across_labels_and_stable(export, tmp_path, write_enriched):
+    summary, out_dir = export
+    ids = node_ids(out_dir)
+    assert ("Person", "Banten II") in ids.values() and ("Dapil", "Banten II") in ids.values()
+    assert ("Party", "Golkar") in ids.values() and ("Position", "Golkar") in ids.values()
+    assert len(ids) == sum(summary["nodes"].values())
+    # Ekspor ulang dari data yang sama -> ID sama
+    assert K.bulk_node_id("Person", "Ahmad") == K.bulk_node_id("Person", "Ahmad")
+    assert K.bulk_node_id("Person", "Golkar") != K.bulk_node_id("Party", "Golkar")
+
+
+def test_relations_match_build_kg(graph, monkeypatch, export, write_enriched):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    summary, out_dir = export
+    ids = node_ids(out_dir)
+
+    exported = set()
+    for name in os.listdir(out_dir):
+        if not name.startswith("rels_"):
+            continue
+        header, rows = read_rows(os.path.join(out_dir, name))
+        for row in rows:
+            exported.add((row[-1], *ids[row[0]], *ids[row[1]]))
+
+    K.write_family_to_neo4j(graph, FAMILY["person"], FAMILY["families"], FAMILY["source_url"])
+    K.build_kg_from_enriched_csv(write_enriched(ROWS))
+    built = set()
+    for rel_type in summary["relationships"]:
+        built |= {(rel_type, *edge) for edge in graph.read_edges([rel_type])}
+
+    assert exported == built
+    assert ("PARENT_OF", "Person", "Ahmad", "Person", "Rudi") in exported
+    assert ("FAMILY_OF", "Person", "Siti", "Person", "Budi") in exported
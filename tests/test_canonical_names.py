@@ -0,0 +1,55 @@
+import random
+import threading
+
+import Keluarga_v2 as K
+
+
+def education_names():
+    return K.CanonicalNames(aliases=K.EDUCATION_ALIASES, strip_patterns=[K._DEGREE_PREFIX, K._YEAR_SUFFIX])
+
+
+def test_aliases_and_degree_noise_fold_to_dictionary_name():
+    names = education_names()
+    assert names.canonical_list(["UGM", "S-1 Universitas Gajah Mada (2004)", "universitas gadjah  mada"]) == [
+        "Universitas Gadjah Mada"
+    ]
+
+
+def test_display_name_does_not_depend_on_order():
+    variants = ["ketua komisi", "KETUA KOMISI", "Ketua komisi", "Ketua Komisi"]
+    chosen = set()
+    for seed in range(10):
+        names = K.CanonicalNames()
+        shuffled = variants[:]
+        random.Random(seed).shuffle(shuffled)
+        for variant in shuffled:
+            names.canonical(variant)
+        chosen.add(names.canonical("ketua komisi"))
+    assert chosen == {"Ketua Komisi"}
+
+
+def test_display_name_does_not_depend_on_threads():
+    variants = [f"{'UNIVERSITAS' if i % 3 == 0 else 'universitas'} Terbuka" for i in range(300)] + [
+        "Universitas Terbuka"
+    ]
+    sequential = K.CanonicalNames()
+    sequential.canonical_list(variants)
+    for _ in range(5):
+        names = K.CanonicalNames()
+        threads = [threading.Thread(target=names.canonical_list, args=(variants[i::4],)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert names.canonical("universitas terbuka") == sequential.canonical("universitas terbuka")
+
+
+def test_register_canonical_names_fixes_display_before_first_row(write_enriched, monkeypatch):
+    monkeypatch.setattr(K, "POSITION_NAMES", K.CanonicalNames())
+    path = write_enriched([
+        {"Nama": "A", "Jabatan": "anggota badan anggaran"},
+        {"Nama": "B", "Jabatan": "Anggota Badan Anggaran"},
+    ])
+    K.register_canonical_names(path)
+    record = K.kg_record_from_row({"Nama": "A", "Jabatan": "anggota badan anggaran"})
+    assert record["positions"] == ["Anggota Badan Anggaran"]
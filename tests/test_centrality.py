@@ -0,0 +1,131 @@
+import itertools
+from collections import deque
+
+import pytest
+
+import Keluarga_v2 as K
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+# Dua keluarga yang dihubungkan satu pernikahan + dua partai
+EDGES = [
+    ("Person", "Ayah A", "Person", "Anak A1"),
+    ("Person", "Ayah A", "Person", "Anak A2"),
+    ("Person", "Anak A1", "Person", "Anak A2"),
+    ("Person", "Anak A2", "Person", "Istri B"),
+    ("Person", "Istri B", "Person", "Ibu B"),
+    ("Person", "Ibu B", "Person", "Adik B"),
+    ("Person", "Ayah A", "Party", "Golkar"),
+    ("Person", "Anak A1", "Party", "Golkar"),
+    ("Person", "Ibu B", "Party", "PDI-P"),
+    ("Person", "Ayah A", "Person", "Anak A1"),  # relasi ganda digabung
+]
+
+
+def neighbours(edges):
+    adj = {}
+    for a_label, a, b_label, b in edges:
+        adj.setdefault((a_label, a), set()).add((b_label, b))
+        adj.setdefault((b_label, b), set()).add((a_label, a))
+    return adj
+
+
+def brute_pagerank(adj, damping=K.PAGERANK_DAMPING):
+    # Sistem linear (I - d·M) x = (1-d)/n, M[v, u] = 1/deg(u) untuk u–v (tanpa node dangling)
+    nodes = sorted(adj)
+    pos = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    M = np.zeros((n, n))
+    for u in nodes:
+        for v in adj[u]:
+            M[pos[v], pos[u]] = 1.0 / len(adj[u])
+    x = np.linalg.solve(np.eye(n) - damping * M, np.full(n, (1 - damping) / n))
+    return {node: x[pos[node]] * n for node in nodes}
+
+
+def brute_betweenness(adj):
+    # Hitung semua jalur terpendek lewat BFS per sumber (jarak + jumlah jalur)
+    def bfs(s):
+        dist, sigma, queue = {s: 0}, {s: 1}, deque([s])
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                if v not in dist:
+                    dist[v], sigma[v] = dist[u] + 1, 0
+                    queue.append(v)
+                if dist[v] == dist[u] + 1:
+                    sigma[v] += sigma[u]
+        return dist, sigma
+
+    info = {s: bfs(s) for s in adj}
+    bc = dict.fromkeys(adj, 0.0)
+    for s, t in itertools.combinations(adj, 2):
+        dist_s, sigma_s = info[s]
+        if t not in dist_s:
+            continue
+        for v in adj:
+            dist_v, sigma_v = info[v]
+            if v not in (s, t) and v in dist_s and t in dist_v and dist_s[v] + dist_v[t] == dist_s[t]:
+                bc[v] += sigma_s[v] * sigma_v[t] / sigma_s[t]
+    n = len(adj)
+    return {v: b / ((n - 1) * (n - 2) / 2) for v, b in bc.items()}
+
+
+def by_node(rows):
+    return {(label, r["name"]): r for label, label_rows in rows.items() for r in label_rows}
+
+
+def test_scores_match_brute_force():
+    rows, info = K.compute_centrality(EDGES, samples=0)
+    scores = by_node(rows)
+    adj = neighbours(EDGES)
+    assert info["nodes"] == len(adj) and info["edges"] == 9 and not info["warm_start"]
+
+    pagerank, betweenness = brute_pagerank(adj), brute_betweenness(adj)
+    for node, r in scores.items():
+        assert r["degree"] == len(adj[node])
+        assert r["pagerank"] == pytest.approx(pagerank[node], rel=1e-6)
+        assert r["betweenness"] == pytest.approx(betweenness[node], abs=1e-9)
+
+
+def test_betweenness_of_a_path_by_hand():
+    rows, _ = K.compute_centrality(
+        [("Person", "A", "Person", "B"), ("Person", "B", "Person", "C"), ("Person", "C", "Person", "D")],
+        samples=0,
+    )
+    scores = {r["name"]: r["betweenness"] for r in rows["Person"]}
+    # B ada di jalur A–C dan A–D (2 dari 3 pasangan tanpa B) -> 2/3; ujung jalur 0
+    assert scores == pytest.approx({"A": 0.0, "B": 2 / 3, "C": 2 / 3, "D": 0.0})
+
+
+def test_warm_start_converges_to_the_same_vector():
+    cold, cold_info = K.compute_centrality(EDGES, samples=0)
+    previous = {node: r["pagerank"] for node, r in by_node(cold).items()}
+    warm, warm_info = K.compute_centrality(EDGES, previous=previous, samples=0)
+
+    assert warm_info["warm_start"]
+    assert warm_info["pagerank_iterations"] < cold_info["pagerank_iterations"]
+    for node, r in by_node(warm).items():
+        assert r["pagerank"] == pytest.approx(previous[node], rel=1e-8)
+
+
+def test_refresh_writes_scores_and_clears_stale_nodes(graph, monkeypatch):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    K.write_family_to_neo4j(graph, "Ayah A", [{"name": "Anak A1", "relation": "anak"},
+                                              {"name": "Anak A2", "relation": "anak"}])
+    K.write_family_to_neo4j(graph, "Lajang", [{"name": "Teman", "relation": "sepupu"}])
+
+    info = K.refresh_centrality(graph, samples=0)
+    assert not info["warm_start"] and info["nodes"] == 5
+    stored = graph.read_node_property("pagerank", ["Person"])
+    assert set(stored) == {("Person", n) for n in ["Ayah A", "Anak A1", "Anak A2", "Lajang", "Teman"]}
+    assert graph.read_node_property("degree", ["Person"])[("Person", "Ayah A")] == 2
+
+    # Relasi Lajang–Teman hilang -> skornya dikosongkan pada refresh berikutnya
+    graph.query("DELETE FROM edges WHERE src = (SELECT id FROM nodes WHERE name = 'Lajang')")
+    info = K.refresh_centrality(graph, samples=0)
+    assert info["warm_start"] and info["nodes"] == 3
+    assert set(graph.read_node_property("pagerank", ["Person"])) == {
+        ("Person", n) for n in ["Ayah A", "Anak A1", "Anak A2"]
+    }
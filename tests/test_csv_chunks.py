@@ -0,0 +1,43 @@
+import pytest
+
+import Keluarga_v2 as K
+
+# Dapil angka + sel kosong: tanpa dtype=str pandas menebaknya float ("1.0")
+ROWS = [
+    {"Nama": "Ratu Atut", "Dapil": "1", "Partai": "Golkar", "Pasangan": "Hikmat Tomet (suami)"},
+    {"Nama": "Hikmat Tomet", "Dapil": "1", "Partai": "Golkar", "Pasangan": "Ratu Atut (istri)"},
+    {"Nama": "Andika Hazrumy", "Dapil": "", "Partai": "PDI-P"},
+    {"Nama": "Adde Rosi", "Dapil": "3", "Partai": "Gerindra",
+     "Pasangan": "Andika Hazrumy (suami); Budi Santoso (suami)"},
+    {"Nama": "Budi Santoso", "Dapil": "3", "Partai": "Golkar"},
+]
+
+FAMILIES = {
+    "Ratu Atut": [{"name": "Tubagus Chasan", "relation": "ayah"}],
+    "Andika Hazrumy": [{"name": "Adde Rosi", "relation": "istri"}],
+}
+
+
+def run_extract(monkeypatch, src, out, chunk_rows):
+    monkeypatch.setattr(K, "CSV_CHUNK_ROWS", chunk_rows)
+    K.process_csv_with_agents_1_2(src, max_rows=4, out_csv=str(out), delay=0)
+    return out.read_bytes()
+
+
+def test_extract_output_does_not_depend_on_chunking(monkeypatch, tmp_path, write_enriched):
+    monkeypatch.setattr(K, "extract_families_for_person", lambda idx, nama, delay=0: FAMILIES.get(nama, []))
+    src = write_enriched(ROWS)
+    whole = run_extract(monkeypatch, src, tmp_path / "whole.csv", 0)
+    assert b",1,Golkar," in whole and b",1.0," not in whole
+    for chunk_rows in (1, 2, 3):
+        assert run_extract(monkeypatch, src, tmp_path / f"chunk{chunk_rows}.csv", chunk_rows) == whole
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 4])
+def test_strategic_summary_does_not_depend_on_chunking(monkeypatch, write_enriched, chunk_rows):
+    src = write_enriched(ROWS)
+    monkeypatch.setattr(K, "CSV_CHUNK_ROWS", 0)
+    whole = K.get_strategic_marriage_summary(src)
+    monkeypatch.setattr(K, "CSV_CHUNK_ROWS", chunk_rows)
+    assert K.get_strategic_marriage_summary(src) == whole
+    assert '"person_dapil": "1"' in whole
@@ -0,0 +1,67 @@
+import pytest
+
+import Keluarga_v2 as K
+
+DERIVED = list(K.DERIVED_KINSHIP_RULES)
+
+
+@pytest.fixture(autouse=True)
+def manifest_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", True)
+
+
+@pytest.fixture
+def family(graph):
+    # Kakek -> Ayah -> Anak; Paman saudara Ayah (hasil Agent 2)
+    K.write_family_to_neo4j(graph, "Ayah", [
+        {"name": "Kakek", "relation": "ayah"},
+        {"name": "Anak", "relation": "anak"},
+        {"name": "Paman", "relation": "saudara"},
+    ])
+    return graph
+
+
+def derived(graph):
+    return {(t, a, c): sorted(via or []) for t, a, c, via, _ in graph.read_relations(DERIVED)}
+
+
+def assert_matches_full_recompute(graph):
+    # Hasil inkremental harus sama dengan menghitung ulang semuanya
+    assert K.update_derived_kinship(graph) == {"added": 0, "changed": 0, "deleted": 0}
+
+
+def test_base_relations_derive_grandparent(family):
+    assert derived(family) == {("GRANDPARENT_OF", "Kakek", "Anak"): ["Ayah"]}
+    assert_matches_full_recompute(family)
+
+
+def test_adding_a_spouse_derives_in_laws(family):
+    K.write_family_to_neo4j(family, "Ayah", [{"name": "Ibu", "relation": "istri"}])
+
+    assert derived(family) == {
+        ("GRANDPARENT_OF", "Kakek", "Anak"): ["Ayah"],
+        ("PARENT_IN_LAW_OF", "Kakek", "Ibu"): ["Ayah"],
+        ("SIBLING_IN_LAW_OF", "Ibu", "Paman"): ["Ayah"],
+    }
+    assert_matches_full_recompute(family)
+
+
+def test_removing_a_spouse_removes_in_laws(family, write_enriched):
+    # Pasangan dari CSV (build-kg --sync), lalu dihapus dari CSV
+    K.build_kg_from_enriched_csv(write_enriched([{"Nama": "Ayah", "Pasangan": "Ibu (istri)"}]), sync=True)
+    assert ("PARENT_IN_LAW_OF", "Kakek", "Ibu") in derived(family)
+
+    K.build_kg_from_enriched_csv(write_enriched([{"Nama": "Ayah"}], name="tanpa_istri.csv"), sync=True)
+    assert derived(family) == {("GRANDPARENT_OF", "Kakek", "Anak"): ["Ayah"]}
+    assert_matches_full_recompute(family)
+
+
+def test_two_intermediaries_are_both_kept_in_via(family):
+    # Dua jalur mertua yang berbeda perantaranya -> satu relasi, via dua orang
+    K.write_family_to_neo4j(family, "Paman", [{"name": "Kakek", "relation": "ayah"}])
+    K.write_family_to_neo4j(family, "Ayah", [{"name": "Ibu", "relation": "istri"}])
+    K.write_family_to_neo4j(family, "Paman", [{"name": "Ibu", "relation": "istri"}])
+
+    assert derived(family)[("PARENT_IN_LAW_OF", "Kakek", "Ibu")] == ["Ayah", "Paman"]
+    assert_matches_full_recompute(family)
@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+import Keluarga_v2 as K
+
+np = pytest.importorskip("numpy")
+
+EDGES = [
+    ("SPOUSE_OF", "Person", "Ahmad Muzani", "Person", "Himmah Nur Azizah", "istri"),
+    ("PARENT_OF", "Person", "Abdul Karim", "Person", "Ahmad Muzani", None),
+    ("FAMILY_OF", "Person", "Ahmad Muzani", "Person", "Nama\0Aneh Ünïcödé", "sepupu"),
+    ("MEMBER_OF", "Person", "Ahmad Muzani", "Party", "Gerindra", None),
+]
+PAGERANK = {("Person", "Ahmad Muzani"): 0.4, ("Party", "Gerindra"): 0.1}
+
+
+def assert_same_snapshot(loaded, snapshot):
+    assert loaded.strings == snapshot.strings
+    assert loaded.edge_types == snapshot.edge_types
+    for name in K.GRAPH_SNAPSHOT_ARRAYS[2:]:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(snapshot, name))
+    assert loaded.kinship_relations() == snapshot.kinship_relations()
+    assert loaded.previous_pagerank() == snapshot.previous_pagerank()
+
+
+def test_save_load_round_trip(tmp_path):
+    snapshot = K.GraphSnapshot.from_edges(EDGES, PAGERANK, source="tes")
+    path = str(tmp_path / "snap")
+    manifest = snapshot.save(path)
+
+    loaded = K.GraphSnapshot.load(path)
+    assert_same_snapshot(loaded, snapshot)
+    assert isinstance(loaded.edge_src, np.memmap)
+    assert (len(loaded), loaded.edge_count) == (len(snapshot), len(EDGES))
+    assert manifest["strings"] == len(snapshot.strings) and loaded.meta["source"] == "tes"
+    # Nama berisi \0 tidak menggeser id string lain
+    assert ("FAMILY_OF", "Ahmad Muzani", "Nama\0Aneh Ünïcödé", None, "sepupu") in loaded.kinship_relations()
+
+
+def test_empty_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "kosong")
+    K.GraphSnapshot.from_edges([]).save(path)
+    loaded = K.GraphSnapshot.load(path, mmap=False)
+    assert len(loaded) == 0 and loaded.edge_count == 0 and loaded.kinship_relations() == []
+
+
+def test_other_version_is_rejected(tmp_path):
+    path = str(tmp_path / "snap")
+    K.GraphSnapshot.from_edges(EDGES).save(path)
+    manifest_path = os.path.join(path, "manifest.json")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] = K.GRAPH_SNAPSHOT_VERSION + 1
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError):
+        K.GraphSnapshot.load(path)
+
+
+def test_snapshot_of_graph_matches_graph(graph, tmp_path, write_enriched, monkeypatch):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    csv_path = write_enriched([
+        {"Nama": "Ahmad", "Partai": "Gerindra", "Pasangan": "Siti (istri)"},
+        {"Nama": "Siti", "Partai": "Gerindra", "Keluarga": "Budi (ayah)"},
+        {"Nama": "Dewi", "Partai": "Golkar", "Keluarga": "Budi (sepupu)"},
+    ])
+    K.build_kg_from_enriched_csv(csv_path, max_rows=None)
+    path = str(tmp_path / "snap")
+    K.export_graph_snapshot(path, source="graph")
+
+    loaded = K.GraphSnapshot.load(path)
+    relations = K.read_kinship_relations(graph, K.KINSHIP_REL_TYPES)
+    assert sorted(loaded.kinship_relations()) == sorted(relations)
+    from_snapshot = K.KinshipIndex.from_snapshot(path).path("Ahmad", "Dewi")
+    assert from_snapshot == K.KinshipIndex.from_graph(graph).path("Ahmad", "Dewi")
+    assert from_snapshot["path"] == ["Ahmad", "Siti", "Budi", "Dewi"]
@@ -0,0 +1,125 @@
+import pytest
+
+import Keluarga_v2 as K
+
+ROWS = [
+    {"Nama": "Ahmad Muzani", "Dapil": "Lampung I", "Partai": "Gerindra", "Jabatan": "DPR RI",
+     "Pasangan": "Himmah Nur Azizah (istri)"},
+    {"Nama": "Sudin", "Dapil": "Lampung I", "Partai": "PDI-P", "Jabatan": "DPR RI",
+     "Pasangan": "Jo Lin Sumbardi (istri)"},
+    {"Nama": "Dewi Sartika", "Dapil": "Jawa Barat I", "Partai": "Golkar",
+     "Keluarga": "Raden Somanagara (ayah)"},
+]
+
+
+@pytest.fixture(autouse=True)
+def manifest_in_tmp(tmp_path, monkeypatch):
+    # Manifest sync (kg_sync_manifest.json) ditulis relatif ke cwd
+    monkeypatch.chdir(tmp_path)
+
+
+def sync(path, max_rows=None):
+    return K.build_kg_from_enriched_csv(path, max_rows=max_rows, sync=True)
+
+
+def persons(graph):
+    return {r["name"] for r in graph.query("SELECT name FROM nodes WHERE label = 'Person'")}
+
+
+def edges(graph, rel_type):
+    return {
+        (r["a"], r["b"])
+        for r in graph.query(
+            "SELECT s.name AS a, d.name AS b FROM edges e "
+            "JOIN nodes s ON s.id = e.src JOIN nodes d ON d.id = e.dst WHERE e.type = ?",
+            rel_type,
+        )
+    }
+
+
+def graph_state(graph):
+    return (
+        graph.query("SELECT label, name, props FROM nodes ORDER BY label, name"),
+        graph.query("SELECT type, src, dst, props FROM edges ORDER BY type, src, dst"),
+    )
+
+
+def test_first_sync_adds_everyone(graph, write_enriched):
+    message = sync(write_enriched(ROWS))
+    assert "3 baru, 0 berubah, 0 dihapus, 0 tidak berubah" in message
+    assert {"Ahmad Muzani", "Sudin", "Dewi Sartika", "Jo Lin Sumbardi"} <= persons(graph)
+    assert ("Sudin", "Jo Lin Sumbardi") in edges(graph, "SPOUSE_OF")
+
+
+def test_rerun_is_a_no_op(graph, write_enriched):
+    path = write_enriched(ROWS)
+    sync(path)
+    before = [[dict(r) for r in rows] for rows in graph_state(graph)]
+
+    message = sync(path)
+    assert "0 baru, 0 berubah, 0 dihapus, 3 tidak berubah" in message
+    assert [[dict(r) for r in rows] for rows in graph_state(graph)] == before
+
+
+def test_rerun_without_manifest_reads_hashes_from_graph(graph, write_enriched, tmp_path):
+    path = write_enriched(ROWS)
+    sync(path)
+    (tmp_path / "kg_sync_manifest.json").unlink()
+    assert "3 tidak berubah" in sync(path)
+
+
+def test_deleted_row_is_pruned(graph, write_enriched):
+    sync(write_enriched(ROWS))
+    message = sync(write_enriched(ROWS[:1] + ROWS[2:], name="lebih_sedikit.csv"))
+
+    assert "0 baru, 0 berubah, 1 dihapus, 2 tidak berubah" in message
+    assert "Sudin" not in persons(graph)
+    assert not {pair for pair in edges(graph, "SPOUSE_OF") if "Sudin" in pair}
+    # Partai yang hanya dipakai Sudin ikut hilang (node tanpa relasi dipangkas)
+    parties = {r["name"] for r in graph.query("SELECT name FROM nodes WHERE label = 'Party'")}
+    assert parties == {"Gerindra", "Golkar"}
+
+
+def test_changed_row_replaces_its_relations(graph, write_enriched):
+    sync(write_enriched(ROWS))
+    changed = [dict(ROWS[0], Pasangan="Istri Baru (istri)"), *ROWS[1:]]
+    message = sync(write_enriched(changed, name="berubah.csv"))
+
+    assert "0 baru, 1 berubah, 0 dihapus, 2 tidak berubah" in message
+    spouses = {b for a, b in edges(graph, "SPOUSE_OF") if a == "Ahmad Muzani"}
+    assert spouses == {"Istri Baru"}
+
+
+def test_max_rows_equal_to_file_length_is_complete(graph, write_enriched):
+    message = sync(write_enriched(ROWS), max_rows=len(ROWS))
+    assert "dominasi partai" in message
+
+
+def test_truncated_run_does_not_delete_rows_beyond_max_rows(graph, write_enriched):
+    path = write_enriched(ROWS)
+    sync(path)
+    message = sync(path, max_rows=1)
+
+    assert "0 dihapus" in message and "dominasi partai" not in message
+    assert {"Sudin", "Dewi Sartika"} <= persons(graph)
+
+
+def test_recreated_graph_ignores_stale_manifest(write_enriched, tmp_path):
+    # Manifest masih ada, tapi file graf dihapus & dibuat ulang di path yang sama
+    path = write_enriched(ROWS)
+    db = tmp_path / "graph.sqlite"
+    K.set_driver(K.SqliteGraph(str(db)))
+    try:
+        sync(path)
+        K.close_driver()
+        for suffix in ("", "-wal", "-shm"):
+            if (tmp_path / f"graph.sqlite{suffix}").exists():
+                (tmp_path / f"graph.sqlite{suffix}").unlink()
+        fresh = K.SqliteGraph(str(db))
+        K.set_driver(fresh)
+
+        assert "3 baru, 0 berubah, 0 dihapus, 0 tidak berubah" in sync(path)
+        assert {"Ahmad Muzani", "Sudin", "Dewi Sartika"} <= persons(fresh)
+        assert "3 tidak berubah" in sync(path)
+    finally:
+        K.close_driver()
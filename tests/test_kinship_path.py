@@ -0,0 +1,107 @@
+import random
+from collections import deque
+
+import pytest
+
+import Keluarga_v2 as K
+
+REL_TYPES = ["SPOUSE_OF", "PARENT_OF", "SIBLING_OF", "FAMILY_OF"]
+LABELS = {"SPOUSE_OF": ["istri", "suami"], "PARENT_OF": [None], "SIBLING_OF": ["kakak", None],
+          "FAMILY_OF": ["sepupu", "paman"]}
+
+
+@pytest.fixture(scope="module")
+def relations():
+    rng = random.Random(11)
+    people = [f"Orang {i}" for i in range(300)]
+    rels = []
+    for _ in range(330):
+        a, c = rng.sample(people, 2)
+        rel_type = rng.choice(REL_TYPES)
+        rels.append((rel_type, a, c, None, rng.choice(LABELS[rel_type])))
+    return rels
+
+
+def bfs_hops(relations, source, target):
+    adj = {}
+    for _, a, c, *_ in relations:
+        adj.setdefault(a, set()).add(c)
+        adj.setdefault(c, set()).add(a)
+    hops, queue = {source: 0}, deque([source])
+    while queue:
+        node = queue.popleft()
+        for nxt in adj.get(node, ()):
+            if nxt not in hops:
+                hops[nxt] = hops[node] + 1
+                queue.append(nxt)
+    return hops.get(target)
+
+
+def test_path_matches_brute_force_bfs(relations):
+    index = K.KinshipIndex.from_relations(relations)
+    steps = {}
+    for rel_type, a, c, _, label in relations:
+        forward, backward = K.kinship_edge_labels(rel_type, label)
+        steps.setdefault((a, c), set()).add(forward)
+        steps.setdefault((c, a), set()).add(backward)
+
+    rng = random.Random(3)
+    found = 0
+    for _ in range(300):
+        a, b = rng.sample(index.names, 2)
+        expected = bfs_hops(relations, a, b)
+        result = index.path(a, b, max_depth=100)
+        if expected is None:
+            assert not result["found"]
+            continue
+        found += 1
+        assert result["found"] and result["hops"] == expected
+        assert result["path"][0] == a and result["path"][-1] == b
+        for x, y, label in zip(result["path"], result["path"][1:], result["relations"]):
+            # Label langkah = y adalah <label> dari x, sesuai salah satu relasi x–y
+            assert label in steps[(x, y)]
+    assert found > 50
+
+
+def test_max_depth_cuts_longer_paths():
+    index = K.KinshipIndex.from_relations([
+        ("PARENT_OF", "A", "B", None, None),
+        ("PARENT_OF", "B", "C", None, None),
+        ("PARENT_OF", "C", "D", None, None),
+    ])
+    assert index.path("A", "D", max_depth=3)["hops"] == 3
+    assert not index.path("A", "D", max_depth=2)["found"]
+
+
+def test_chain_labels_and_lookup():
+    index = K.KinshipIndex.from_relations([
+        ("SPOUSE_OF", "Ahmad", "Siti", None, "istri"),
+        ("PARENT_OF", "Budi", "Siti", None, "ayah"),
+    ])
+    result = index.path("  ahmad ", "Budi")
+    assert result["from"] == "Ahmad" and result["chain"] == "istri → ayah"
+    assert index.path("Ahmad", "Ahmad")["hops"] == 0
+    assert "error" in index.path("Ahmad", "Tidak Ada")
+
+
+def test_kinship_path_from_enriched_csv(write_enriched):
+    path = write_enriched([
+        {"Nama": "Ahmad", "Pasangan": "Siti (istri)"},
+        {"Nama": "Siti", "Keluarga": "Budi (ayah)"},
+    ])
+    try:
+        result = K.kinship_path("Ahmad", "Budi", source=path)
+    finally:
+        K.get_kinship_index.cache_clear()
+    assert result["found"] and result["path"] == ["Ahmad", "Siti", "Budi"]
+
+
+def test_graph_index_is_rebuilt_after_writes(graph, monkeypatch):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    K.get_kinship_index.cache_clear()
+    K.write_family_to_neo4j(graph, "Ani", [{"name": "Budi", "relation": "suami"}])
+    assert K.kinship_path("Ani", "Budi", source="graph")["found"]
+    assert not K.kinship_path("Ani", "Cici", source="graph")["found"]
+
+    K.write_family_to_neo4j(graph, "Budi", [{"name": "Cici", "relation": "anak"}])
+    assert K.kinship_path("Ani", "Cici", source="graph")["hops"] == 2
@@ -0,0 +1,81 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import Keluarga_v2 as K
+
+
+@pytest.fixture
+def metrics():
+    metrics = K.RunMetrics(buckets=(0.1, 1, 10))
+    for value in (0.0625, 0.5, 0.5, 4.0):
+        metrics.observe("stage_seconds", value, stage="parse")
+    metrics.inc("kg_sync_persons_total", 3, status="added")
+    metrics.inc("kg_sync_persons_total", 2, status="added")
+    metrics.inc("kg_sync_persons_total", status="deleted")
+    return metrics
+
+
+def test_prometheus_textfile_format(metrics, tmp_path):
+    path = tmp_path / "keluarga.prom"
+    metrics.write_prometheus_textfile(str(path))
+    assert os.listdir(tmp_path) == ["keluarga.prom"]
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    hist = "keluarga_stage_seconds"
+    assert lines[:2] == [f"# HELP {hist} {K.METRIC_HELP['stage_seconds']}", f"# TYPE {hist} histogram"]
+    assert lines[2:8] == [
+        f'{hist}_bucket{{stage="parse",le="0.1"}} 1',
+        f'{hist}_bucket{{stage="parse",le="1"}} 3',
+        f'{hist}_bucket{{stage="parse",le="10"}} 4',
+        f'{hist}_bucket{{stage="parse",le="+Inf"}} 4',
+        f'{hist}_sum{{stage="parse"}} 5.0625',
+        f'{hist}_count{{stage="parse"}} 4',
+    ]
+
+    counter = "keluarga_kg_sync_persons_total"
+    assert lines.count(f"# TYPE {counter} counter") == 1
+    assert f'{counter}{{status="added"}} 5' in lines
+    assert f'{counter}{{status="deleted"}} 1' in lines
+
+
+def test_prometheus_label_escaping():
+    metrics = K.RunMetrics()
+    metrics.record_cache('wiki "v2"\\raw\nbaru', hit=True)
+    metrics.inc("custom_total")
+    text = metrics.to_prometheus()
+    assert 'keluarga_cache_requests_total{cache="wiki \\"v2\\"\\\\raw\\nbaru",result="hit"} 1' in text
+    # Metrik tanpa label & tanpa HELP terdaftar: nama dipakai sebagai HELP
+    assert "# HELP keluarga_custom_total custom_total" in text
+    assert "\nkeluarga_custom_total 1\n" in text
+
+
+def test_report_json_quantiles_and_summaries(metrics, tmp_path):
+    metrics.record_cache("wikipedia_html", hit=True)
+    metrics.record_cache("wikipedia_html", hit=True)
+    metrics.record_cache("wikipedia_html", hit=False)
+    usage = {"input_tokens": 800, "output_tokens": 50, "input_token_details": {"cache_read": 200}}
+    metrics.record_llm_usage("extract", [
+        SimpleNamespace(usage_metadata=usage), SimpleNamespace(usage_metadata=usage), SimpleNamespace(),
+    ])
+
+    path = tmp_path / "report.json"
+    metrics.write_report_json(str(path), command="extract")
+    report = json.loads(path.read_text(encoding="utf-8"))
+
+    assert report["command"] == "extract"
+    [hist] = report["histograms"]
+    assert hist == {
+        "name": "stage_seconds", "labels": {"stage": "parse"}, "count": 4,
+        "sum_seconds": 5.0625, "mean_seconds": 1.265625,
+        # p50 diinterpolasi di bucket (0.1, 1]; p95 dibatasi nilai maksimum
+        "p50_seconds": 0.55, "p95_seconds": 4.0, "max_seconds": 4.0,
+    }
+    assert {"name": "kg_sync_persons_total", "labels": {"status": "added"}, "value": 5} in report["counters"]
+    assert report["caches"] == {"wikipedia_html": {"hit": 2, "miss": 1, "hit_ratio": 0.6667}}
+    assert report["llm_usage"] == {"extract": {
+        "prompt_tokens": 1600, "completion_tokens": 100, "prompt_cache_hit_tokens": 400,
+        "prompt_cache_hit_ratio": 0.25,
+    }}
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+import Keluarga_v2 as K
+
+pytest.importorskip("pyarrow")
+
+ROWS = [
+    {
+        "Nama": "Ahmad Muzani", "Dapil": "Lampung I", "Partai": "Gerindra",
+        "Jabatan": "Ketua MPR; DPR RI", "Pendidikan": "Universitas Indonesia",
+        "Pasangan": "Himmah Nur Azizah (istri)", "Keluarga": "Abdul Karim (ayah, wafat 2001); Siti (ibu)",
+    },
+    {"Nama": "Sudin", "Dapil": "Lampung I", "Partai": "PDI-P", "Jabatan": "DPR RI",
+     "Pasangan": "Jo Lin Sumbardi (istri)"},
+    {"Nama": "Tanpa Relasi", "Dapil": "Jawa Barat I", "Partai": "Golkar"},
+]
+
+
+def test_csv_parquet_csv_round_trip(tmp_path, write_enriched):
+    src = write_enriched(ROWS)
+    parquet = str(tmp_path / "enriched.parquet")
+    back = str(tmp_path / "back.csv")
+
+    assert K.convert_enriched_dataset(src, parquet) == len(ROWS)
+    assert K.convert_enriched_dataset(parquet, back) == len(ROWS)
+    pd.testing.assert_frame_equal(pd.read_csv(back, dtype=str), pd.read_csv(src, dtype=str))
+
+
+def test_parquet_columns_are_structured(tmp_path, write_enriched):
+    parquet = str(tmp_path / "enriched.parquet")
+    K.csv_to_parquet(write_enriched(ROWS), parquet)
+
+    df = K.read_enriched_table(parquet)
+    assert list(df.loc[0, "Jabatan"]) == ["Ketua MPR", "DPR RI"]
+    assert [dict(r) for r in df.loc[0, "Keluarga"]] == [
+        {"name": "Abdul Karim", "relation": "ayah", "note": "wafat 2001"},
+        {"name": "Siti", "relation": "ibu", "note": ""},
+    ]
+    assert pd.isna(df.loc[2, "Jabatan"]) and len(df.loc[2, "Pasangan"]) == 0
+
+
+def test_parquet_gives_same_kg_records_as_csv(tmp_path, write_enriched):
+    src = write_enriched(ROWS)
+    parquet = str(tmp_path / "enriched.parquet")
+    K.csv_to_parquet(src, parquet)
+
+    def records(path):
+        df = K.read_enriched_table(path, columns=K.STRATEGIC_COLUMNS)
+        return [K.kg_record_from_row(row) for _, row in df.iterrows()]
+
+    assert records(parquet) == records(src)
+
+
+def test_convert_rejects_same_format():
+    with pytest.raises(ValueError):
+        K.convert_enriched_dataset("a.csv", "b.csv")
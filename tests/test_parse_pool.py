@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import Keluarga_v2 as K
+
+pytest.importorskip("bs4")
+
+PAGES = {
+    f"https://id.wikipedia.org/wiki/Tokoh_{i}": f"""
+    <html><body>
+      <table class="infobox">
+        <tr><th>Nama</th><td>Tokoh {i}</td></tr>
+        <tr><th>Partai</th><td>Partai <b>{i % 3}</b></td></tr>
+      </table>
+      <div id="mw-content-text">
+        <p>Tokoh {i} adalah anggota DPR.</p><p></p><p>Anak dari Ayah {i}.</p>
+      </div>
+    </body></html>
+    """
+    for i in range(6)
+}
+
+
+@pytest.fixture
+def parse_pool(monkeypatch):
+    monkeypatch.setattr(K, "BIOGRAPHY_CACHE_DIR", "")
+    monkeypatch.setattr(K, "download_wikipedia_html", PAGES.__getitem__)
+    K.configure_parse_pool(2)
+    try:
+        yield K.get_parse_pool()
+    finally:
+        K.configure_parse_pool(0)
+
+
+def test_pooled_parse_matches_in_thread_parse(parse_pool):
+    assert parse_pool is not None and K.HTML_PARSE_WORKERS == 2
+    assert parse_pool.submit(os.getpid).result() != os.getpid()
+    expected = {url: K.parse_wikipedia_html(html) for url, html in PAGES.items()}
+    assert "Partai: Partai 1" in expected["https://id.wikipedia.org/wiki/Tokoh_1"]
+
+    assert {url: K.parse_wikipedia_html_pooled(html) for url, html in PAGES.items()} == expected
+    results = list(K.fetch_wikipedia_texts(PAGES, concurrency=3))
+    assert [url for url, _, _ in results] == list(PAGES)
+    assert [error for _, _, error in results] == [None] * len(PAGES)
+    assert {url: text for url, text, _ in results} == expected
+
+
+def test_close_parse_pool_shuts_the_pool_down(parse_pool):
+    parse_pool.submit(K.parse_wikipedia_html, "<p>x</p>").result()
+    K.close_parse_pool()
+    with pytest.raises(RuntimeError):
+        parse_pool.submit(K.parse_wikipedia_html, "<p>x</p>")
+
+    # Pool baru dibuka lagi saat dibutuhkan; 0 worker = parsing di thread pemanggil
+    reopened = K.get_parse_pool()
+    assert reopened is not None and reopened is not parse_pool
+    K.configure_parse_pool(0)
+    assert K.get_parse_pool() is None
+    html = PAGES["https://id.wikipedia.org/wiki/Tokoh_0"]
+    assert K.parse_wikipedia_html_pooled(html) == K.parse_wikipedia_html(html)
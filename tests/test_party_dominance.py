@@ -0,0 +1,84 @@
+import Keluarga_v2 as K
+
+ROWS = [
+    {"Nama": "Ani", "Dapil": "Banten I", "Partai": "Golkar", "Pasangan": "Budi (suami)"},
+    {"Nama": "Budi", "Dapil": "Banten I", "Partai": "Golkar"},
+    # Cici & Euis hanya terhubung lewat Dedi (bukan anggota DPR)
+    {"Nama": "Cici", "Dapil": "Banten I", "Partai": "PDIP", "Keluarga": "Dedi (ayah)"},
+    {"Nama": "Euis", "Dapil": "Banten I", "Partai": "Gerindra", "Keluarga": "Dedi (ayah)"},
+    {"Nama": "Fajar", "Dapil": "Banten II", "Partai": "PDIP"},
+]
+
+
+def kg_records(path):
+    K.register_canonical_names(path)
+    df = K.read_enriched_table(path, columns=K.STRATEGIC_COLUMNS)
+    return [K.kg_record_from_row(row) for _, row in df.iterrows()]
+
+
+def dapil_props(graph, prop):
+    return {name: value for (_, name), value in graph.read_node_property(prop, ["Dapil"]).items()}
+
+
+def test_seat_shares_and_hhi(write_enriched):
+    rows = K.dapil_dominance_rows(kg_records(write_enriched(ROWS)))
+    banten = rows["Banten I"]
+    assert banten["seats"] == 4
+    assert banten["parties"] == ["Golkar", "Gerindra", "PDIP"]
+    assert banten["party_seats"] == [2, 1, 1]
+    assert banten["party_shares"] == [0.5, 0.25, 0.25]
+    assert (banten["top_party"], banten["top_party_share"]) == ("Golkar", 0.5)
+    assert banten["party_hhi"] == 0.375
+
+    single = rows["Banten II"]
+    assert (single["seats"], single["top_party"], single["party_hhi"]) == (1, "PDIP", 1.0)
+    assert (single["family_seats"], single["family_clusters"], single["top_family"]) == (0, 0, None)
+
+
+def test_family_clusters_join_through_non_members(write_enriched):
+    records = kg_records(write_enriched(ROWS))
+    assert K.family_clusters(records) == {
+        "Ani": "Ani", "Budi": "Ani", "Cici": "Cici", "Euis": "Cici", "Fajar": "Fajar",
+    }
+    banten = K.dapil_dominance_rows(records)["Banten I"]
+    assert (banten["family_seats"], banten["family_clusters"]) == (4, 2)
+    assert (banten["top_family"], banten["top_family_seats"], banten["top_family_share"]) == ("Ani", 2, 0.5)
+    assert banten["family_hhi"] == 0.5
+
+
+def test_aggregator_fed_per_chunk_matches_full_list(write_enriched):
+    records = kg_records(write_enriched(ROWS))
+    # Cici & Euis di chunk berbeda: klaster tetap tersambung lewat Dedi
+    aggregator = K.DapilDominanceAggregator().add(records[:3]).add(records[3:])
+    assert aggregator.clusters() == K.family_clusters(records)
+    assert K.dapil_dominance_rows(aggregator) == K.dapil_dominance_rows(records)
+
+
+def test_only_changed_dapils_are_written(graph, monkeypatch, write_enriched):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    path = write_enriched(ROWS)
+    K.build_kg_from_enriched_csv(path)
+    assert dapil_props(graph, "top_party") == {"Banten I": "Golkar", "Banten II": "PDIP"}
+
+    assert K.update_party_dominance(graph, kg_records(path)) == {"dapil": 2, "updated": 0}
+
+    # Euis pindah partai: hanya Banten I yang ditulis ulang
+    rows = [dict(r, Partai="Golkar") if r["Nama"] == "Euis" else r for r in ROWS]
+    before = dapil_props(graph, "dominance_hash")
+    info = K.update_party_dominance(graph, kg_records(write_enriched(rows, "changed.csv")))
+    assert info == {"dapil": 2, "updated": 1}
+    after = dapil_props(graph, "dominance_hash")
+    assert after["Banten II"] == before["Banten II"] and after["Banten I"] != before["Banten I"]
+    assert dapil_props(graph, "top_party_share")["Banten I"] == 0.75
+
+
+def test_dapil_without_members_is_cleared(graph, monkeypatch, write_enriched):
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    K.build_kg_from_enriched_csv(write_enriched(ROWS))
+
+    rows = [r for r in ROWS if r["Dapil"] != "Banten II"]
+    info = K.update_party_dominance(graph, kg_records(write_enriched(rows, "shrunk.csv")))
+    assert info == {"dapil": 1, "updated": 1}
+    for prop in K.DAPIL_DOMINANCE_PROPS:
+        assert "Banten II" not in dapil_props(graph, prop)
+    assert dapil_props(graph, "seats") == {"Banten I": 4}
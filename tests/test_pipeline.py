@@ -0,0 +1,104 @@
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+import Keluarga_v2 as K
+
+NAMES = [f"Anggota {i}" for i in range(12)]
+
+
+@pytest.fixture
+def members(write_enriched):
+    return write_enriched([
+        {"Nama": n, "Partai": "Golkar" if i % 2 else "PDI-P", "Dapil": "Banten I" if i < 4 else "Banten II"}
+        for i, n in enumerate(NAMES)
+    ])
+
+
+@pytest.fixture(autouse=True)
+def fake_agent(monkeypatch):
+    def family_agent(nama):
+        if nama == "Anggota 3":
+            raise TimeoutError("LLM timeout")
+        return {"source_url": "stub", "families": [{"name": f"Istri {nama}", "relation": "istri"}]}
+
+    monkeypatch.setattr(K, "run_family_agent", family_agent)
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+
+
+def run(csv_path, out_csv, **kw):
+    # Pipeline yang menggantung = tes gagal, bukan tes yang ikut menggantung
+    result = {}
+
+    def target():
+        try:
+            result["summary"] = K.run_streaming_pipeline(
+                csv_path, out_csv, max_rows=len(NAMES), concurrency=3, delay=0, queue_size=2, **kw
+            )
+        except BaseException as e:  # noqa: BLE001 - diteruskan ke tes
+            result["error"] = e
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+    assert not worker.is_alive(), "pipeline menggantung"
+    if "error" in result:
+        raise result["error"]
+    return result["summary"]
+
+
+@pytest.mark.parametrize("chunk_rows", [0, 5])
+def test_pipeline_writes_graph_and_csv(graph, members, tmp_path, monkeypatch, chunk_rows):
+    monkeypatch.setattr(K, "CSV_CHUNK_ROWS", chunk_rows)
+    out_csv = str(tmp_path / "hasil.csv")
+    summary = run(members, out_csv)
+
+    assert summary["total_persons"] == len(NAMES)
+    df = pd.read_csv(out_csv)
+    assert df["Nama"].tolist() == NAMES
+    assert pd.isna(df.loc[3, "Pasangan"]) and df.loc[0, "Pasangan"] == "Istri Anggota 0 (istri)"
+    spouses = graph.query("SELECT count(*) AS n FROM edges WHERE type = 'SPOUSE_OF'")[0]["n"]
+    assert spouses == len(NAMES) - 1
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_stage_stops_pipeline(graph, members, tmp_path, monkeypatch):
+    def dies(self, row):
+        raise SystemExit("analitik mati")
+
+    monkeypatch.setattr(K.StrategicMarriageAggregator, "add_row", dies)
+    with pytest.raises(RuntimeError):
+        run(members, str(tmp_path / "hasil.csv"))
+
+
+def test_pipeline_updates_party_dominance(graph, members, tmp_path):
+    run(members, str(tmp_path / "hasil.csv"))
+    props = {
+        row["name"]: json.loads(row["props"])
+        for row in graph.query("SELECT name, props FROM nodes WHERE label = 'Dapil'")
+    }
+    assert props["Banten I"]["seats"] == 4 and props["Banten II"]["seats"] == 8
+    assert props["Banten II"]["top_party_share"] == 0.5
+
+
+def test_chunk_boundary_does_not_block_job_feed(graph, members, tmp_path, monkeypatch):
+    # Anggota 0 (chunk pertama) baru selesai setelah Anggota 4 (chunk ketiga) mulai
+    monkeypatch.setattr(K, "CSV_CHUNK_ROWS", 2)
+    later_started = threading.Event()
+
+    def family_agent(nama):
+        if nama == "Anggota 4":
+            later_started.set()
+        elif nama == "Anggota 0":
+            assert later_started.wait(10), "job chunk berikutnya tertahan di batas chunk"
+        return {"source_url": "stub", "families": [{"name": f"Istri {nama}", "relation": "istri"}]}
+
+    monkeypatch.setattr(K, "run_family_agent", family_agent)
+    out_csv = str(tmp_path / "hasil.csv")
+    run(members, out_csv)
+
+    df = pd.read_csv(out_csv)
+    assert df["Nama"].tolist() == NAMES
+    assert df["Pasangan"].tolist() == [f"Istri {n} (istri)" for n in NAMES]
@@ -0,0 +1,49 @@
+import threading
+import tracemalloc
+
+import pytest
+
+import Keluarga_v2 as K
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = K.StageProfiler()
+    profiler.enable(str(tmp_path))
+    yield profiler
+    tracemalloc.stop()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = K.StageProfiler()
+    with profiler.stage("parse"):
+        pass
+    assert profiler.report() == {}
+
+
+def test_overlapping_stages_are_counted_as_skipped(profiler, tmp_path):
+    start = threading.Barrier(4)
+
+    def work():
+        start.wait()
+        for _ in range(10):
+            with profiler.stage("parse"):
+                sum(i * i for i in range(5000))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            pass
+
+    report = profiler.report()
+    assert report["parse"]["calls"] + report["parse"]["skipped"] == 40
+    assert report["parse"]["calls"] >= 10
+    assert (report["inner"]["calls"], report["inner"]["skipped"]) == (0, 1)
+    assert report["inner"]["top_functions"] == []
+    profiler.write_files()
+    header = (tmp_path / "parse.alloc.txt").read_text(encoding="utf-8").splitlines()[0]
+    assert f"skipped={report['parse']['skipped']}" in header
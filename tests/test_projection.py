@@ -0,0 +1,90 @@
+import csv
+import math
+
+import pytest
+
+import Keluarga_v2 as K
+
+pytest.importorskip("scipy")
+
+UI, ITB, UGM = "Universitas Indonesia", "Institut Teknologi Bandung", "Universitas Gadjah Mada"
+ROWS = [
+    {"Nama": "Ani", "Pendidikan": f"{UI}; {ITB}", "Jabatan": "Ketua Komisi; DPR RI"},
+    {"Nama": "Budi", "Pendidikan": f"{UI}; {ITB}", "Jabatan": "Ketua Komisi; DPR RI"},
+    {"Nama": "Cici", "Pendidikan": UI, "Jabatan": "DPR RI"},
+    {"Nama": "Dodi", "Pendidikan": UGM},
+    {"Nama": "Euis", "Pendidikan": UGM},
+    {"Nama": "Fajar"},
+]
+N = len(ROWS)
+
+
+def idf(size):
+    return math.log(N / size) + 1.0
+
+
+def pairs(rows):
+    return {(r["a"], r["c"]): r for r in rows}
+
+
+@pytest.fixture
+def records(write_enriched):
+    path = write_enriched(ROWS)
+    K.register_canonical_names(path)
+    df = K.read_enriched_table(path, columns=K.STRATEGIC_COLUMNS)
+    return [K.kg_record_from_row(row) for _, row in df.iterrows()]
+
+
+def test_co_alumni_weights(records):
+    result = pairs(K.build_projection(records, "alumni"))
+    assert set(result) == {("Ani", "Budi"), ("Ani", "Cici"), ("Budi", "Cici"), ("Dodi", "Euis")}
+    assert result[("Ani", "Budi")]["weight"] == round(idf(3) + idf(2), 4)
+    assert result[("Ani", "Budi")]["shared"] == sorted([UI, ITB])
+    assert result[("Ani", "Cici")]["weight"] == round(idf(3), 4)
+    assert result[("Dodi", "Euis")] == {"a": "Dodi", "c": "Euis", "weight": round(idf(2), 4),
+                                        "shared_count": 1, "shared": [UGM]}
+
+
+def test_co_position_weights(records):
+    result = pairs(K.build_projection(records, "position"))
+    assert set(result) == {("Ani", "Budi"), ("Ani", "Cici"), ("Budi", "Cici")}
+    assert result[("Ani", "Budi")]["weight"] == round(idf(2) + idf(3), 4)
+    assert result[("Ani", "Budi")]["shared_count"] == 2
+    assert result[("Budi", "Cici")]["shared"] == ["DPR RI"]
+
+
+def test_top_k_keeps_each_persons_best_neighbours(records):
+    result = pairs(K.build_projection(records, "alumni", top_k=1))
+    # Ani & Budi saling terbaik; Cici (seri Ani/Budi) menyimpan tepat satu
+    assert {("Ani", "Budi"), ("Dodi", "Euis")} <= set(result)
+    assert len([p for p in result if "Cici" in p]) == 1
+    assert len(result) == 3
+
+
+def test_max_group_skips_large_institutions(records):
+    result = pairs(K.build_projection(records, "alumni", max_group=2))
+    assert set(result) == {("Ani", "Budi"), ("Dodi", "Euis")}
+    assert result[("Ani", "Budi")]["shared"] == [ITB]
+    assert result[("Ani", "Budi")]["weight"] == round(idf(2), 4)
+
+
+def test_run_projection_writes_graph_and_csv(graph, write_enriched, tmp_path, monkeypatch):
+    # Relasi proyeksi hanya menghubungkan Person yang sudah ada (ditulis build-kg)
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    path = write_enriched(ROWS)
+    K.build_kg_from_enriched_csv(path)
+    summary = K.run_projection(path, kinds=("alumni",), export_dir=str(tmp_path / "out"))
+    assert summary["alumni"]["pairs"] == 4 and summary["alumni"]["written"] == 4
+
+    with open(tmp_path / "out" / "co_alumni.csv", encoding="utf-8") as f:
+        exported = list(csv.DictReader(f))
+    assert {(r["source"], r["target"]) for r in exported} == {
+        (a, c) for _, a, c, _, _ in K.read_kinship_relations(graph, ["CO_ALUMNI"])
+    }
+
+    # Proyeksi ulang yang lebih ketat menghapus relasi lama yang tidak lagi ada
+    summary = K.run_projection(path, kinds=("alumni",), max_group=2)
+    assert summary["alumni"]["deleted"] == 2
+    assert {(a, c) for _, a, c, _, _ in K.read_kinship_relations(graph, ["CO_ALUMNI"])} == {
+        ("Ani", "Budi"), ("Dodi", "Euis")
+    }
@@ -0,0 +1,106 @@
+import json
+import random
+from collections import deque
+
+import pytest
+
+import Keluarga_v2 as K
+
+RELATIONS = ["istri", "anak", "ayah", "saudara", "mertua", "sepupu"]
+
+
+@pytest.fixture
+def family_graph(graph, monkeypatch):
+    # Graf acak yang padat (banyak siklus): jalur tanpa siklus tumbuh eksponensial
+    monkeypatch.setattr(K, "DERIVED_KINSHIP_ENABLED", False)
+    rng = random.Random(7)
+    people = [f"Orang {i}" for i in range(80)]
+    for person in people:
+        families = [
+            {"name": rng.choice(people), "relation": rng.choice(RELATIONS)}
+            for _ in range(rng.randint(1, 4))
+        ]
+        K.write_family_to_neo4j(graph, person, [f for f in families if f["name"] != person])
+    return graph
+
+
+def brute_force_depths(relations, source, max_depth):
+    adj = {}
+    for _, a, c, *_ in relations:
+        adj.setdefault(a, set()).add(c)
+        adj.setdefault(c, set()).add(a)
+    depths, queue = {source: 0}, deque([source])
+    while queue:
+        node = queue.popleft()
+        if depths[node] == max_depth:
+            continue
+        for nxt in adj.get(node, ()):
+            if nxt not in depths:
+                depths[nxt] = depths[node] + 1
+                queue.append(nxt)
+    depths.pop(source)
+    return depths
+
+
+class RecordingDriver:
+    # Driver Neo4j palsu: simpan (query, parameter) tiap statement
+    def __init__(self):
+        self.statements = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.statements.append((" ".join(query.split()), params))
+        return []
+
+    def execute_write(self, work):
+        return work(self)
+
+
+def test_graph_backend_wraps_raw_driver(graph):
+    assert K.graph_backend(graph) is graph
+    raw = RecordingDriver()
+    backend = K.graph_backend(raw)
+    assert isinstance(backend, K.Neo4jGraph) and backend.driver is raw
+    assert backend.supports_cypher and not graph.supports_cypher
+
+
+def test_neo4j_backend_set_node_properties_uses_props_map():
+    raw = RecordingDriver()
+    K.Neo4jGraph(raw).set_node_properties("Dapil", [{"name": "Jabar I", "seats": 3, "top_party": None}])
+    (query, params), = raw.statements
+    assert "MATCH (n:Dapil {name: row.name}) SET n += row.props" in query
+    assert params["rows"] == [{"name": "Jabar I", "props": {"seats": 3, "top_party": None}}]
+
+
+def test_run_cypher_query_reports_unsupported_backend(graph):
+    result = json.loads(K.run_cypher_query("MATCH (n) RETURN n"))
+    assert result["rows"] == [] and "sqlite" in result["error"]
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 4, 8])
+def test_kinship_paths_match_brute_force_bfs(family_graph, max_depth):
+    relations = family_graph.read_relations(K.KINSHIP_REL_TYPES)
+    directed = {(t, a, c) for t, a, c, *_ in relations}
+
+    for source in ["Orang 0", "Orang 13", "Orang 42"]:
+        results = family_graph.kinship_paths(source, max_depth=max_depth)
+        assert results
+        assert {r["name"]: r["depth"] for r in results} == brute_force_depths(relations, source, max_depth)
+        for r in results:
+            assert r["path"][0] == source and r["path"][-1] == r["name"]
+            assert len(r["path"]) == len(r["relations"]) + 1 == r["depth"] + 1
+            for a, b, rel in zip(r["path"], r["path"][1:], r["relations"]):
+                rel_type, arrow = rel[:-1], rel[-1]
+                assert (rel_type, a, b) in directed if arrow == ">" else (rel_type, b, a) in directed
+
+
+def test_kinship_paths_unknown_person(family_graph):
+    assert family_graph.kinship_paths("Tidak Ada") == []
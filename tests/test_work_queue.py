@@ -0,0 +1,99 @@
+import time
+
+import pandas as pd
+import pytest
+
+import Keluarga_v2 as K
+
+
+@pytest.fixture
+def work_queue():
+    wq = K.WorkQueue(":memory:", max_attempts=2)
+    wq.seed([(0, "Ahmad"), (1, "Sudin")], csv_path="/data/anggota.csv")
+    yield wq
+    wq.close()
+
+
+def test_lease_hands_out_each_task_once(work_queue):
+    first = work_queue.lease("w1", lease_seconds=60)
+    second = work_queue.lease("w2", lease_seconds=60)
+    assert {first[:2], second[:2]} == {(0, "Ahmad"), (1, "Sudin")}
+    assert work_queue.lease("w3", lease_seconds=60) is None
+    assert work_queue.counts() == {"pending": 0, "leased": 2, "done": 0, "failed": 0}
+
+
+def test_expired_lease_is_reclaimed(work_queue):
+    row_idx, _, stale = work_queue.lease("w1", lease_seconds=0.01)
+    work_queue.lease("w1", lease_seconds=60)
+    time.sleep(0.05)
+
+    reclaimed = work_queue.lease("w2", lease_seconds=60)
+    assert reclaimed[0] == row_idx and reclaimed[2] != stale
+    # Worker lama kehilangan lease: heartbeat gagal, fail() tidak berlaku
+    assert not work_queue.renew(row_idx, stale)
+    assert work_queue.fail(row_idx, stale, "telat") == "leased"
+
+
+def test_duplicate_complete_keeps_first_result(work_queue):
+    row_idx, _, stale = work_queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.05)
+    _, _, fresh = work_queue.lease("w2", lease_seconds=60)
+
+    assert work_queue.complete(row_idx, fresh, [{"name": "Siti", "relation": "istri"}])
+    assert not work_queue.complete(row_idx, stale, [])
+    assert work_queue.results() == {row_idx: [{"name": "Siti", "relation": "istri"}]}
+
+
+def test_failures_retry_then_fail(work_queue):
+    row_idx, _, token = work_queue.lease("w1")
+    assert work_queue.fail(row_idx, token, "timeout") == "pending"
+    row_idx, _, token = work_queue.lease("w1")
+    assert work_queue.fail(row_idx, token, "timeout") == "failed"
+    assert work_queue.counts()["failed"] == 1
+
+
+def test_crashed_worker_is_not_retried_forever(work_queue):
+    for _ in range(2):
+        work_queue.lease("w1", lease_seconds=0.01)
+        time.sleep(0.05)
+    # Dua lease kedaluwarsa = WORK_MAX_ATTEMPTS -> failed, task lain yang disewa
+    assert work_queue.lease("w2", lease_seconds=60)[1] == "Sudin"
+    assert work_queue.counts()["failed"] == 1
+
+
+def test_seed_again_keeps_progress(work_queue):
+    row_idx, _, token = work_queue.lease("w1")
+    work_queue.complete(row_idx, token, [])
+    assert work_queue.seed([(0, "Ahmad"), (1, "Sudin"), (2, "Dewi")]) == 1
+    assert work_queue.counts() == {"pending": 2, "leased": 0, "done": 1, "failed": 0}
+
+
+def test_worker_sends_agent_errors_to_retry(graph, tmp_path, monkeypatch, write_enriched):
+    calls = {}
+
+    def family_agent(nama):
+        calls[nama] = calls.get(nama, 0) + 1
+        if nama == "Sudin" and calls[nama] == 1:
+            raise TimeoutError("LLM timeout")
+        return {"families": [{"name": f"Istri {nama}", "relation": "istri"}]}
+
+    monkeypatch.setattr(K, "run_family_agent", family_agent)
+    monkeypatch.setattr(K, "run_kg_agent", lambda result: result)
+    csv_path = write_enriched([{"Nama": "Ahmad"}, {"Nama": "Sudin"}])
+    queue_path = str(tmp_path / "queue.sqlite")
+
+    K.init_work_queue(csv_path, queue_path)
+    stats = K.run_queue_worker(queue_path, worker_id="tes", delay=0)
+    assert stats["errors"] == 1 and stats["done"] == 2 and calls["Sudin"] == 2
+
+    out_csv = str(tmp_path / "hasil.csv")
+    K.merge_work_queue(queue_path, out_csv=out_csv)
+    assert pd.read_csv(out_csv)["Pasangan"].tolist() == ["Istri Ahmad (istri)", "Istri Sudin (istri)"]
+
+
+def test_merge_rejects_other_csv(tmp_path, write_enriched):
+    queue_path = str(tmp_path / "queue.sqlite")
+    K.init_work_queue(write_enriched([{"Nama": "Ahmad"}]), queue_path)
+    other = write_enriched([{"Nama": "Lain"}], name="lain.csv")
+    with pytest.raises(RuntimeError):
+        K.merge_work_queue(queue_path, csv_path=other, allow_partial=True)